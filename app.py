@@ -2,21 +2,42 @@
 Breast Cancer Risk Prediction — Streamlit application entry point.
 
 All heavy logic lives in the `src/` package.  This file composes the UI:
-  - Sidebar: language, theme, sample loader, 30 feature inputs, predict button
-  - Main area: header, prediction results / waiting state, model performance, glossary
+  - Sidebar: language, theme, input mode; sample loader, 30 feature inputs and
+    predict button (single case) or a CSV / NPY upload (batch)
+  - Main area: header, prediction results / batch table / a stored case
+    opened from the worklist (`?case=<id>`) / waiting state, triage worklist,
+    model performance, drift monitoring, glossary
 """
 
+import contextlib
+import hashlib
+import io
+from datetime import datetime
+
 import numpy as np
 import streamlit as st
 
+from src import memprof, profiling
 from src import (
-    predict_prob, compute_model_metrics,
-    SECTIONS, FEATURE_ORDER, SAMPLE_BENIGN, SAMPLE_MALIGNANT, GLOSSARY,
+    predict_prob, predict_partial, compute_model_metrics, ood_score,
+    measurement_uncertainty, MC_DRAWS,
+    calibrate, calibration_report, CALIBRATION_METHOD,
+    audit_log,
+    drift_monitor, current_drift, PSI_MODERATE, PSI_MAJOR,
+    SECTIONS, FEATURE_ORDER, FULL_LABELS, SAMPLE_BENIGN, SAMPLE_MALIGNANT, GLOSSARY,
     LANG, t,
-    make_radar, make_contribution, make_confusion, make_roc,
-    generate_pdf,
+    generate_pdf, CaseHistory,
     THEMES, inject_css,
 )
+from src.batch import read_cases, score_batch, write_scores
+from src.case_store import case_store
+from src.charts import (
+    make_radar, make_contribution, make_confusion, make_roc, make_reliability,
+    make_radar_compare, make_contribution_compare,
+)
+from src.cohort_report import generate_cohort_pdf
+from src.ensemble import ensemble_predict, interval_check
+from src.triage import QUERY_PARAM as TRIAGE_PARAM, worklist
 
 # ─── Page config ─────────────────────────────────────────────────────────────
 
@@ -27,11 +48,24 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+BATCH_PAGE_SIZE = 50    # rows per page of the batch results table
+
+
+profiling.start_run()
+
+
+@contextlib.contextmanager
+def _stage(name: str):
+    """Instrumentation hooks around one part of the rerun; no-ops unless enabled."""
+    with memprof.stage(name), profiling.stage(name):
+        yield
+
+
 # ═════════════════════════════════════════════════════════════════════════════
 #  SIDEBAR
 # ═════════════════════════════════════════════════════════════════════════════
 
-with st.sidebar:
+with _stage("inputs"), st.sidebar:
     # Language + theme selectors
     lc, tc = st.columns(2)
     with lc:
@@ -58,45 +92,61 @@ with st.sidebar:
     )
     st.divider()
 
-    # Sample data loader
-    st.caption(t("sample_title", lang))
-    sc1, sc2 = st.columns(2)
-    with sc1:
-        if st.button(t("sample_benign", lang), width='stretch'):
-            for key, val in zip(FEATURE_ORDER, SAMPLE_BENIGN):
-                st.session_state[key] = val
-            st.rerun()
-    with sc2:
-        if st.button(t("sample_malignant", lang), width='stretch'):
-            for key, val in zip(FEATURE_ORDER, SAMPLE_MALIGNANT):
-                st.session_state[key] = val
-            st.rerun()
+    # Input mode: one case from the form, or a file of many cases
+    input_mode = st.radio(
+        t("mode_label", lang), ["single", "batch"],
+        format_func=lambda m: t(f"mode_{m}", lang),
+        horizontal=True, key="input_mode",
+    )
+    mc_mode = st.toggle(t("mc_mode", lang), key="mc_mode", help=t("mc_help", lang))
     st.divider()
 
-    # Feature inputs (3 sections x 10 features)
     inputs: dict[str, float | None] = {}
-    for _sid, feat_list, sec_key, sec_desc_key in SECTIONS:
-        with st.expander(f"**{t(sec_key, lang)}**  ({len(feat_list)})",
-                         expanded=(_sid == "Mean")):
-            st.caption(t(sec_desc_key, lang))
-            c1, c2 = st.columns(2)
-            for idx, (key, en_lbl, vi_lbl, en_tip, vi_tip) in enumerate(feat_list):
-                lbl = en_lbl if lang == "en" else vi_lbl
-                tip = en_tip if lang == "en" else vi_tip
-                with c1 if idx % 2 == 0 else c2:
-                    inputs[key] = st.number_input(
-                        lbl, value=None, format="%.6f",
-                        help=tip, key=key, placeholder="0.000000",
-                    )
-
-    # Progress indicator
-    filled = sum(1 for v in inputs.values() if v is not None)
-    st.progress(filled / 30, text=t("progress_text", lang, n=filled))
-
-    st.divider()
-    predict_clicked = st.button(
-        t("btn_predict", lang), width='stretch', type="primary",
-    )
+    filled, partial_mode, predict_clicked, uploaded = 0, False, False, None
+    if input_mode == "batch":
+        st.caption(t("batch_help", lang))
+        uploaded = st.file_uploader(t("batch_upload", lang), type=["csv", "npy"])
+    else:
+        # Sample data loader
+        st.caption(t("sample_title", lang))
+        sc1, sc2 = st.columns(2)
+        with sc1:
+            if st.button(t("sample_benign", lang), width='stretch'):
+                for key, val in zip(FEATURE_ORDER, SAMPLE_BENIGN):
+                    st.session_state[key] = val
+                st.rerun()
+        with sc2:
+            if st.button(t("sample_malignant", lang), width='stretch'):
+                for key, val in zip(FEATURE_ORDER, SAMPLE_MALIGNANT):
+                    st.session_state[key] = val
+                st.rerun()
+        st.divider()
+
+        # Feature inputs (3 sections x 10 features)
+        for _sid, feat_list, sec_key, sec_desc_key in SECTIONS:
+            with st.expander(f"**{t(sec_key, lang)}**  ({len(feat_list)})",
+                             expanded=(_sid == "Mean")):
+                st.caption(t(sec_desc_key, lang))
+                c1, c2 = st.columns(2)
+                for idx, (key, en_lbl, vi_lbl, en_tip, vi_tip) in enumerate(feat_list):
+                    lbl = en_lbl if lang == "en" else vi_lbl
+                    tip = en_tip if lang == "en" else vi_tip
+                    with c1 if idx % 2 == 0 else c2:
+                        inputs[key] = st.number_input(
+                            lbl, value=None, format="%.6f",
+                            help=tip, key=key, placeholder="0.000000",
+                        )
+
+        # Progress indicator
+        filled = sum(1 for v in inputs.values() if v is not None)
+        st.progress(filled / 30, text=t("progress_text", lang, n=filled))
+        partial_mode = st.toggle(t("partial_mode", lang), key="partial_mode",
+                                 help=t("partial_help", lang))
+
+        st.divider()
+        predict_clicked = st.button(
+            t("btn_predict", lang), width='stretch', type="primary",
+        )
 
 # ═════════════════════════════════════════════════════════════════════════════
 #  MAIN AREA
@@ -122,106 +172,163 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-# ─── Prediction / Waiting ────────────────────────────────────────────────────
-
-metrics = compute_model_metrics()
-
-if predict_clicked:
-    # Validate all fields are filled
-    missing = []
-    for _sid, fl, _sk, _sdk in SECTIONS:
-        for key, en_lbl, vi_lbl, *_ in fl:
-            if inputs.get(key) is None:
-                missing.append(en_lbl if lang == "en" else vi_lbl)
-    if missing:
-        msg = t("error_missing", lang, n=len(missing))
-        fields = ", ".join(missing[:6])
-        detail = t("error_missing_list", lang, fields=fields)
-        if len(missing) > 6:
-            detail += t("error_and_more", lang, n=len(missing) - 6)
-        st.error(f"**{msg}** {detail}")
-    else:
-        values = [float(v) for key in FEATURE_ORDER if (v := inputs[key]) is not None]
-        p_benign = predict_prob(values)
-        mal_pct = (1 - p_benign) * 100
-        is_malignant = mal_pct >= 50
+# ─── Case view ───────────────────────────────────────────────────────────────
 
-        cls_name = t("malignant", lang) if is_malignant else t("benign", lang)
-        cls_css = "malignant" if is_malignant else "benign"
+with _stage("metrics"):
+    metrics = compute_model_metrics()
 
-        # Result panel
+
+def render_case(values: list[float], mal_pct: float, key: str,
+                partial: dict | None = None) -> str:
+    """Result panel, charts, interpretation and PDF for one scored case.
+
+    `key` namespaces the widgets so single and batch views never collide;
+    returns the chosen radar mode.
+    """
+    is_malignant = mal_pct >= 50
+    cls_name = t("malignant", lang) if is_malignant else t("benign", lang)
+    cls_css = "malignant" if is_malignant else "benign"
+
+    # Result panel
+    st.markdown(
+        f'<div class="result-panel"><div class="result-label">{t("result_title", lang)}</div>'
+        f'<div class="result-class class-{cls_css}">{"&#9888;&#65039;" if is_malignant else "&#10004;&#65039;"} {cls_name}</div>'
+        f'<div class="prob-container"><div class="prob-label-row"><span>{t("benign", lang)}</span><span>{t("malignant", lang)}</span></div>'
+        f'<div class="prob-track"><div class="prob-fill fill-{cls_css}" style="width:{mal_pct:.1f}%"></div></div></div>'
+        f'<div class="prob-value prob-value-{cls_css}">{mal_pct:.2f}%</div>'
+        f'<div class="prob-caption">{t("prob_caption", lang)}</div></div>',
+        unsafe_allow_html=True,
+    )
+
+    # Model uncertainty from the bootstrap ensemble, once its intervals check out
+    if interval_check()["ok"]:
+        ens = ensemble_predict(values)
+        st.caption(t("ensemble_interval", lang, lo=(1 - ens["p_hi"][0]) * 100,
+                     hi=(1 - ens["p_lo"][0]) * 100, med=(1 - ens["p_benign"][0]) * 100))
+    st.caption(t("calibrated_prob", lang, pct=(1 - calibrate(1 - mal_pct / 100)) * 100,
+                 method=t(f"calib_{CALIBRATION_METHOD}", lang)))
+
+    # Measurement error: mean features resampled from their standard errors
+    spread = None
+    if mc_mode:
+        mc = measurement_uncertainty(values)
+        spread = ((1 - mc["p_hi"][0]) * 100, (1 - mc["p_lo"][0]) * 100, mc["sd"][0] * 100)
+        st.info(t("mc_info", lang, n=MC_DRAWS, lo=spread[0], hi=spread[1], sd=spread[2]),
+                icon="\U0001f3af")
+
+    if partial is not None:
+        st.info(t("partial_info", lang, n=len(partial["missing"]),
+                  lo=(1 - partial["p_hi"]) * 100, hi=(1 - partial["p_lo"]) * 100),
+                icon="\u2139\ufe0f")
+
+    # Out-of-distribution warning
+    ood = ood_score(values)
+    if ood["is_ood"][0]:
+        warn = t("ood_warning", lang, dist=ood["distance"][0],
+                 limit=ood["threshold"])
+        flagged = [FULL_LABELS[lang][i] for i in np.flatnonzero(ood["flags"][0])]
+        if flagged:
+            warn += "  \n" + t("ood_features", lang, fields=", ".join(flagged))
+        st.warning(warn, icon="\u26a0\ufe0f")
+
+    st.markdown("")
+
+    # Stat boxes
+    c1, c2, c3 = st.columns(3)
+    with c1:
         st.markdown(
-            f'<div class="result-panel"><div class="result-label">{t("result_title", lang)}</div>'
-            f'<div class="result-class class-{cls_css}">{"&#9888;&#65039;" if is_malignant else "&#10004;&#65039;"} {cls_name}</div>'
-            f'<div class="prob-container"><div class="prob-label-row"><span>{t("benign", lang)}</span><span>{t("malignant", lang)}</span></div>'
-            f'<div class="prob-track"><div class="prob-fill fill-{cls_css}" style="width:{mal_pct:.1f}%"></div></div></div>'
-            f'<div class="prob-value prob-value-{cls_css}">{mal_pct:.2f}%</div>'
-            f'<div class="prob-caption">{t("prob_caption", lang)}</div></div>',
+            f'<div class="stat-box"><div class="stat-label">{t("stat_classification", lang)}</div>'
+            f'<div class="stat-value">{cls_name}</div></div>',
+            unsafe_allow_html=True,
+        )
+    with c2:
+        st.markdown(
+            f'<div class="stat-box"><div class="stat-label">{t("stat_malignancy", lang)}</div>'
+            f'<div class="stat-value">{mal_pct:.2f}%</div></div>',
+            unsafe_allow_html=True,
+        )
+    with c3:
+        st.markdown(
+            f'<div class="stat-box"><div class="stat-label">{t("stat_benign", lang)}</div>'
+            f'<div class="stat-value">{100 - mal_pct:.2f}%</div></div>',
             unsafe_allow_html=True,
         )
 
-        st.markdown("")
-
-        # Stat boxes
-        c1, c2, c3 = st.columns(3)
-        with c1:
-            st.markdown(
-                f'<div class="stat-box"><div class="stat-label">{t("stat_classification", lang)}</div>'
-                f'<div class="stat-value">{cls_name}</div></div>',
-                unsafe_allow_html=True,
-            )
-        with c2:
-            st.markdown(
-                f'<div class="stat-box"><div class="stat-label">{t("stat_malignancy", lang)}</div>'
-                f'<div class="stat-value">{mal_pct:.2f}%</div></div>',
-                unsafe_allow_html=True,
-            )
-        with c3:
-            st.markdown(
-                f'<div class="stat-box"><div class="stat-label">{t("stat_benign", lang)}</div>'
-                f'<div class="stat-value">{100 - mal_pct:.2f}%</div></div>',
-                unsafe_allow_html=True,
-            )
-
-        # Charts
+    # Charts
+    with _stage("charts"):
         st.markdown("")
         ch1, ch2 = st.columns(2)
         with ch1:
             st.subheader(t("radar_title", lang))
+            radar_mode = st.radio(
+                t("radar_title", lang), ["range", "percentile"],
+                format_func=lambda m: t("radar_mode_range" if m == "range"
+                                        else "radar_mode_pct", lang),
+                horizontal=True, label_visibility="collapsed", key=f"{key}_radar_mode",
+            )
             fig_radar = make_radar(
                 np.array(values), metrics["benign_avg"],
-                metrics["malignant_avg"], lang, th,
+                metrics["malignant_avg"], lang, th, mode=radar_mode,
             )
-            st.plotly_chart(fig_radar, width='stretch')
+            st.plotly_chart(fig_radar, width='stretch', key=f"{key}_radar")
         with ch2:
             st.subheader(t("contribution_title", lang))
             fig_contrib = make_contribution(values, lang, th)
-            st.plotly_chart(fig_contrib, width='stretch')
+            st.plotly_chart(fig_contrib, width='stretch', key=f"{key}_contrib")
 
-        # Interpretation
-        ikey = "interpret_malignant" if is_malignant else "interpret_benign"
-        skey = "next_steps_malignant" if is_malignant else "next_steps_benign"
-        steps_html = "".join(f"<li>{s}</li>" for s in LANG[skey][lang])
-        st.markdown(
-            f'<div class="interpret-card interpret-{cls_css}">'
-            f'<h4>{t("interpret_title", lang)}</h4><p>{t(ikey, lang)}</p>'
-            f'<h4>{t("next_steps_title", lang)}</h4><ul>{steps_html}</ul></div>',
-            unsafe_allow_html=True,
-        )
+    # Interpretation
+    ikey = "interpret_malignant" if is_malignant else "interpret_benign"
+    skey = "next_steps_malignant" if is_malignant else "next_steps_benign"
+    steps_html = "".join(f"<li>{s}</li>" for s in LANG[skey][lang])
+    st.markdown(
+        f'<div class="interpret-card interpret-{cls_css}">'
+        f'<h4>{t("interpret_title", lang)}</h4><p>{t(ikey, lang)}</p>'
+        f'<h4>{t("next_steps_title", lang)}</h4><ul>{steps_html}</ul></div>',
+        unsafe_allow_html=True,
+    )
 
-        # PDF download
+    # PDF download
+    with _stage("pdf"):
         st.markdown("")
-        pdf_bytes = generate_pdf(lang, inputs, cls_name, mal_pct)
+        pdf_bytes = generate_pdf(
+            lang, dict(zip(FEATURE_ORDER, values)), cls_name, mal_pct,
+            estimated=[FEATURE_ORDER[i] for i in partial["missing"]] if partial else (),
+            band=((1 - partial["p_hi"]) * 100, (1 - partial["p_lo"]) * 100) if partial else None,
+            spread=spread, metrics=metrics, radar_mode=radar_mode,
+        )
         st.download_button(
             label=f"\U0001f4c4 {t('pdf_download', lang)}",
             data=pdf_bytes,
             file_name="breast_cancer_prediction_report.pdf",
             mime="application/pdf",
-            width='stretch',
+            width='stretch', key=f"{key}_pdf",
         )
+    return radar_mode
 
-else:
-    # Animated waiting state
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def score_upload(data: bytes, name: str) -> dict:
+    """Read and score an uploaded file in one vectorised pass."""
+    X = read_cases(io.BytesIO(data), name)
+    return dict(X=X, digest=hashlib.sha256(data).hexdigest(), **score_batch(X))
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def scores_csv(digest: str, _batch: dict) -> bytes:
+    """Scored-cases CSV for an upload, built once per content hash."""
+    out = io.StringIO()
+    write_scores(out, {k: v for k, v in _batch.items() if k not in ("X", "digest")})
+    return out.getvalue().encode()
+
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def cohort_pdf(digest: str, lang: str, _X) -> bytes:
+    """Cohort summary PDF for an upload, keyed by its content hash."""
+    return generate_cohort_pdf(lang, _X)
+
+
+def waiting_state(text_key: str) -> None:
+    """Animated placeholder shown until there is something to display."""
     st.markdown(
         '<div class="waiting-state">'
         '<div class="dna-wave">'
@@ -229,16 +336,244 @@ else:
         '<div class="dna-dot"></div><div class="dna-dot"></div><div class="dna-dot"></div>'
         '<div class="dna-dot"></div></div>'
         f'<h3>{t("waiting_title", lang)}</h3>'
-        f'<p>{t("waiting_text", lang)}</p></div>',
+        f'<p>{t(text_key, lang)}</p></div>',
         unsafe_allow_html=True,
     )
 
+
+# ─── Stored case opened from the worklist (?case=<id>) ───────────────────────
+
+review_id = st.query_params.get(TRIAGE_PARAM)
+review = (case_store().get_case(int(review_id))
+          if review_id is not None and review_id.isdigit() else None)
+if review_id is not None and review is None:
+    st.warning(t("triage_missing", lang, id=review_id))
+
+if review is not None:
+    rh1, rh2 = st.columns([4, 1])
+    with rh1:
+        st.subheader(t("triage_case", lang, id=review_id))
+    with rh2:
+        if st.button(f"\u2716 {t('triage_close', lang)}", width='stretch'):
+            del st.query_params[TRIAGE_PARAM]
+            st.rerun()
+    review = review.tolist()
+    render_case(review, (1 - predict_prob(review)) * 100, key="review")
+
+# ─── Batch results ───────────────────────────────────────────────────────────
+
+elif input_mode == "batch":
+    batch = None
+    if uploaded is None:
+        waiting_state("waiting_text_batch")
+    else:
+        try:
+            with _stage("batch_score"):
+                batch = score_upload(uploaded.getvalue(), uploaded.name)
+        except ValueError as exc:
+            st.error(t("batch_error", lang, err=exc))
+
+    if batch is not None:
+        n = len(batch["X"])
+        # Log each upload once, however many reruns the table triggers
+        if st.session_state.get("batch_logged") != batch["digest"]:
+            log = audit_log()
+            for x, p in zip(batch["X"], batch["p_malignant"]):
+                log.submit(x, p, p >= 0.5, lang)
+            ids = case_store().add_cases(batch["X"], lang)
+            worklist().record(ids, batch["p_malignant"], batch["ood"])
+            drift_monitor().record(batch["X"], batch["p_malignant"])
+            st.session_state["batch_logged"] = batch["digest"]
+
+        b1, b2, b3 = st.columns(3)
+        for col, label, val in [
+            (b1, t("batch_cases", lang), f"{n:,}"),
+            (b2, t("batch_malignant", lang), f"{int(batch['malignant'].sum()):,}"),
+            (b3, t("batch_ood", lang), f"{int(batch['ood'].sum()):,}"),
+        ]:
+            with col:
+                st.markdown(
+                    f'<div class="metric-card"><div class="mc-label">{label}</div>'
+                    f'<div class="mc-value">{val}</div></div>',
+                    unsafe_allow_html=True,
+                )
+        st.markdown("")
+
+        # Sorting and paging act on index arrays; only one page becomes a table
+        sort_cols = {"p_malignant": "batch_col_risk", "ood_distance": "batch_col_ood",
+                     "row": "batch_col_row"}
+        pages = -(-n // BATCH_PAGE_SIZE)
+        s1, s2, s3 = st.columns([2, 1, 1])
+        with s1:
+            sort_by = st.selectbox(t("batch_sort", lang), list(sort_cols),
+                                   format_func=lambda c: t(sort_cols[c], lang),
+                                   key="batch_sort")
+        with s2:
+            descending = st.toggle(t("batch_desc", lang), value=True, key="batch_desc")
+        with s3:
+            page = st.number_input(t("batch_page", lang, pages=pages), 1, pages, 1,
+                                   key="batch_page")
+        order = np.argsort(np.arange(n) if sort_by == "row" else batch[sort_by],
+                           kind="stable")
+        if descending:
+            order = order[::-1]
+        rows = order[(page - 1) * BATCH_PAGE_SIZE:page * BATCH_PAGE_SIZE]
+
+        event = st.dataframe({
+            t("batch_col_row", lang): rows + 1,
+            t("batch_col_risk", lang): (batch["p_malignant"][rows] * 100).round(2),
+            t("batch_col_class", lang): [t("malignant" if m else "benign", lang)
+                                         for m in batch["malignant"][rows]],
+            t("batch_col_ood", lang): batch["ood_distance"][rows].round(2),
+        }, hide_index=True, width='stretch', on_select="rerun",
+            selection_mode="single-row",
+            key=f"batch_table_{sort_by}_{descending}_{page}")
+
+        d1, d2 = st.columns(2)
+        with d1:
+            st.download_button(
+                label=f"\u2b07\ufe0f {t('batch_download', lang)}",
+                data=scores_csv(batch["digest"], batch),
+                file_name="scored_cases.csv", mime="text/csv", width='stretch',
+            )
+        # The cohort PDF takes seconds for large uploads, so build it on request
+        with d2, _stage("cohort_pdf"):
+            report_key = (batch["digest"], lang)
+            if st.button(f"\U0001f4d1 {t('cohort_build', lang)}", width='stretch'):
+                st.session_state["cohort_report"] = report_key
+            if st.session_state.get("cohort_report") == report_key:
+                with st.spinner(t("pdf_generating", lang)):
+                    data = cohort_pdf(batch["digest"], lang, batch["X"])
+                st.download_button(
+                    label=f"\U0001f4c4 {t('cohort_download', lang)}", data=data,
+                    file_name="cohort_report.pdf", mime="application/pdf",
+                    width='stretch',
+                )
+
+        # Charts and PDF only for the selected row
+        if event.selection.rows:
+            i = int(rows[event.selection.rows[0]])
+            st.divider()
+            st.subheader(t("batch_case", lang, n=i + 1))
+            render_case(batch["X"][i].tolist(), batch["p_malignant"][i] * 100,
+                        key="batch")
+        else:
+            st.caption(t("batch_select_hint", lang))
+
+else:
+    # ─── Prediction / Waiting ────────────────────────────────────────────────
+    # The result stays on screen across reruns triggered by result-panel
+    # widgets, but only for the inputs that were predicted (and logged)
+    snapshot = (tuple(inputs[key] for key in FEATURE_ORDER), partial_mode)
+    if predict_clicked:
+        st.session_state["result_inputs"] = snapshot
+    predicted = st.session_state.get("result_inputs")
+
+    if predicted != snapshot:
+        if predicted is not None:
+            st.info(t("result_stale", lang), icon="\u270f\ufe0f")
+        waiting_state("waiting_text")
+    else:
+        # Validate all fields are filled
+        missing = []
+        for _sid, fl, _sk, _sdk in SECTIONS:
+            for key, en_lbl, vi_lbl, *_ in fl:
+                if inputs.get(key) is None:
+                    missing.append(en_lbl if lang == "en" else vi_lbl)
+        if missing and not (partial_mode and filled > 0):
+            msg = t("error_missing", lang, n=len(missing))
+            fields = ", ".join(missing[:6])
+            detail = t("error_missing_list", lang, fields=fields)
+            if len(missing) > 6:
+                detail += t("error_and_more", lang, n=len(missing) - 6)
+            st.error(f"**{msg}** {detail}")
+        else:
+            with _stage("predict"):
+                partial = None
+                if missing:
+                    # Partial mode: estimate missing fields from the observed ones
+                    partial = predict_partial([inputs[key] for key in FEATURE_ORDER])
+                    values = [float(v) for v in partial["imputed"]]
+                    p_benign = partial["p_benign"]
+                else:
+                    values = [float(v) for key in FEATURE_ORDER if (v := inputs[key]) is not None]
+                    p_benign = predict_prob(values)
+                mal_pct = (1 - p_benign) * 100
+
+                if predict_clicked:
+                    audit_log().submit(values, mal_pct / 100, mal_pct >= 50, lang,
+                                       n_imputed=len(missing))
+                    history = st.session_state.setdefault("history", CaseHistory())
+                    history.push(values, mal_pct / 100)
+                    if partial is None:   # only real measurements are stored / monitored
+                        st.session_state["case_id"] = case_store().add_case(values, lang)
+                        worklist().record([st.session_state["case_id"]], [mal_pct / 100],
+                                          ood_score(values)["is_ood"])
+                        drift_monitor().record(values, mal_pct / 100)
+
+            radar_mode = render_case(values, mal_pct, key="single", partial=partial)
+
+            # Comparison with earlier cases from this session
+            history = st.session_state.get("history")
+            if history is not None and len(history) >= 2:
+                with _stage("compare"), st.expander(f"\U0001f501 {t('compare_title', lang)}"):
+                    hist = history.entries(history.latest())
+                    row_of = {int(n): i for i, n in enumerate(hist["seq"])}
+                    case_label = lambda n: t(
+                        "compare_case", lang, n=n,
+                        time=datetime.fromtimestamp(hist["ts"][row_of[n]]).strftime("%H:%M:%S"),
+                        pct=hist["p_malignant"][row_of[n]] * 100,
+                    )
+                    chosen = st.multiselect(
+                        t("compare_select", lang), list(row_of),
+                        default=list(row_of)[:2], format_func=case_label,
+                    )
+                    if chosen:
+                        sel = [row_of[n] for n in chosen]
+                        names = [case_label(n) for n in chosen]
+                        cc1, cc2 = st.columns(2)
+                        with cc1:
+                            st.plotly_chart(make_radar_compare(
+                                hist["X"][sel], names, metrics["benign_avg"],
+                                metrics["malignant_avg"], lang, th, mode=radar_mode,
+                            ), width='stretch')
+                        with cc2:
+                            st.plotly_chart(make_contribution_compare(
+                                hist["X"][sel], names, lang, th,
+                            ), width='stretch')
+
+# ═════════════════════════════════════════════════════════════════════════════
+#  TRIAGE WORKLIST
+# ═════════════════════════════════════════════════════════════════════════════
+
+st.divider()
+with _stage("triage"), st.expander(f"\U0001f5c2\ufe0f {t('triage_title', lang)} \u2014 {t('triage_desc', lang)}"):
+    queue = worklist().combined()
+    if queue.seen == 0:
+        st.caption(t("triage_empty", lang))
+    else:
+        st.caption(t("triage_caption", lang, n=queue.seen, k=queue.k))
+        tabs = st.tabs([t("triage_malignant", lang), t("triage_uncertain", lang)])
+        for tab, name in zip(tabs, ("malignant", "uncertain")):
+            entries = queue.ranked(name)
+            with tab:
+                st.dataframe({
+                    t("triage_col_case", lang): [f"?{TRIAGE_PARAM}={e['id']}" for e in entries],
+                    t("batch_col_risk", lang): [round(e["p_malignant"] * 100, 2) for e in entries],
+                    t("triage_col_margin", lang): [round(abs(e["p_malignant"] - 0.5) * 100, 2)
+                                                   for e in entries],
+                    t("batch_ood", lang): [e["ood"] for e in entries],
+                }, hide_index=True, width='stretch', column_config={
+                    t("triage_col_case", lang): st.column_config.LinkColumn(
+                        display_text=rf"\?{TRIAGE_PARAM}=(\d+)"),
+                })
+
 # ═════════════════════════════════════════════════════════════════════════════
 #  MODEL PERFORMANCE SECTION
 # ═════════════════════════════════════════════════════════════════════════════
 
 st.divider()
-with st.expander(
+with _stage("performance"), st.expander(
     f"\U0001f4ca {t('model_perf_title', lang)} \u2014 {t('model_perf_desc', lang)}"
 ):
     m1, m2, m3, m4, m5 = st.columns(5)
@@ -269,12 +604,62 @@ with st.expander(
             width='stretch',
         )
 
+    # Calibration scored on the evaluation half of the reference data
+    calib = calibration_report()
+    rl1, rl2 = st.columns([2, 1])
+    with rl1:
+        st.subheader(t("reliability_title", lang))
+        st.plotly_chart(make_reliability(calib, lang, th), width='stretch')
+    with rl2:
+        for method, r in calib["methods"].items():
+            st.markdown(
+                f'<div class="metric-card"><div class="mc-label">Brier \u00b7 {t(f"calib_{method}", lang)}</div>'
+                f'<div class="mc-value">{r["brier"]:.4f}</div></div>',
+                unsafe_allow_html=True,
+            )
+            st.markdown("")
+        st.caption(t("calib_caption", lang, n=calib["n"]))
+
+# ═════════════════════════════════════════════════════════════════════════════
+#  DRIFT MONITORING
+# ═════════════════════════════════════════════════════════════════════════════
+
+st.divider()
+with _stage("drift"), st.expander(f"\U0001f4c8 {t('drift_title', lang)} \u2014 {t('drift_desc', lang)}"):
+    drift = current_drift()
+    if drift["n"] == 0:
+        st.caption(t("drift_empty", lang))
+    else:
+        status = lambda psi: t("drift_major" if psi >= PSI_MAJOR else
+                               "drift_moderate" if psi >= PSI_MODERATE else
+                               "drift_stable", lang)
+        d1, d2, d3 = st.columns(3)
+        for col, label, val in [
+            (d1, t("drift_cases", lang), f"{drift['n']:,}"),
+            (d2, t("drift_score_psi", lang), f"{drift['score_psi']:.3f}"),
+            (d3, t("drift_status", lang), status(drift["psi"].max())),
+        ]:
+            with col:
+                st.markdown(
+                    f'<div class="metric-card"><div class="mc-label">{label}</div>'
+                    f'<div class="mc-value">{val}</div></div>',
+                    unsafe_allow_html=True,
+                )
+        order = np.argsort(drift["psi"])[::-1]
+        st.dataframe({
+            t("drift_feature", lang): [FULL_LABELS[lang][i] for i in order],
+            "PSI": drift["psi"][order].round(3),
+            "KS": drift["ks"][order].round(3),
+            t("drift_shift", lang): drift["mean_shift"][order].round(2),
+            t("drift_status", lang): [status(drift["psi"][i]) for i in order],
+        }, hide_index=True, width='stretch')
+
 # ═════════════════════════════════════════════════════════════════════════════
 #  FEATURE GLOSSARY
 # ═════════════════════════════════════════════════════════════════════════════
 
 st.divider()
-with st.expander(
+with _stage("glossary"), st.expander(
     f"\U0001f4d6 {t('glossary_title', lang)} \u2014 {t('glossary_subtitle', lang)}"
 ):
     st.markdown(t("glossary_variants_text", lang))
@@ -295,3 +680,6 @@ st.markdown(
     f'<div class="app-footer">{t("disclaimer", lang)}</div>',
     unsafe_allow_html=True,
 )
+
+memprof.end_run()
+profiling.end_run()
@@ -0,0 +1,27 @@
+// AUTO-GENERATED by `python -m src.client_bundle` -- do not edit by hand.
+// Model version: 09a5876a018e
+(function (root) {
+  "use strict";
+
+  const MODEL_VERSION = "09a5876a018e";
+
+  // Feature order MUST match training
+  const FEATURE_NAMES = ["mean_radius", "mean_texture", "mean_perimeter", "mean_area", "mean_smoothness", "mean_compactness", "mean_concavity", "mean_concave_points", "mean_symmetry", "mean_fractal_dimension", "radius_error", "texture_error", "perimeter_error", "area_error", "smoothness_error", "compactness_error", "concavity_error", "concave_points_error", "symmetry_error", "fractal_dimension_error", "worst_radius", "worst_texture", "worst_perimeter", "worst_area", "worst_smoothness", "worst_compactness", "worst_concavity", "worst_concave_points", "worst_symmetry", "worst_fractal_dimension"];
+
+  // Standardisation folded into the weights: logit = x . COEF + INTERCEPT
+  const COEF = [-0.1525993827793509, -0.15099404936467967, -0.021298709315058277, -0.001627660729565548, -14.444067420436575, 3.4140826750051434, -7.97482946978451, -20.54560163253853, 1.127465515342981, 41.575374499033856, -3.1749111908101626, 0.10812810099551841, -0.2978975280596057, -0.014737389300449476, -58.49481273237334, 32.10023190015424, 2.3245423953944324, -21.467655584477825, 37.61703024471612, 190.79745185868626, -0.1704689180952075, -0.1698340488291318, -0.021204972076917197, -0.001400511253070862, -30.0462862355029, -0.8605413659515988, -3.449368316430045, -11.555015743454579, -13.44606298594499, -7.582832923710905];
+  const INTERCEPT = 30.982622706184806;
+
+  /** Return P(benign) for a raw 30-feature vector in FEATURE_NAMES order. */
+  function predictProb(x) {
+    let z = INTERCEPT;
+    for (let i = 0; i < COEF.length; i++) z += COEF[i] * x[i];
+    if (z >= 0) return 1 / (1 + Math.exp(-z));
+    const ez = Math.exp(z);
+    return ez / (1 + ez);
+  }
+
+  const api = { MODEL_VERSION, FEATURE_NAMES, COEF, INTERCEPT, predictProb };
+  if (typeof module !== "undefined" && module.exports) module.exports = api;
+  else root.BreastCancerModel = api;
+})(this);
@@ -1,23 +1,64 @@
 """
 src package — modular components for the Breast Cancer Risk Prediction app.
+
+Modules with a command line (`batch`, `case_store`, `charts`, `client_bundle`,
+`cohort_report`, `ensemble`, `export`, `profiling`, `shared_ref`, `synthetic`,
+`triage`) are not re-exported here: importing them with the package would
+load them twice under `python -m src.<module>`.  Import them directly.
 """
 
-from .model import predict_prob, compute_model_metrics, W, FEAT_MEAN, FEAT_STD
+from .model import (
+    predict_prob, predict_batch, sigmoid, compute_model_metrics, load_reference,
+    W, FEAT_MEAN, FEAT_STD,
+)
 from .config import (
     FEATURES_RAW, SECTIONS, FEATURE_ORDER, MEAN_LABELS, FULL_LABELS,
     GLOSSARY, SAMPLE_BENIGN, SAMPLE_MALIGNANT,
 )
 from .translations import LANG, t
-from .charts import make_radar, make_contribution, make_confusion, make_roc
+from .chart_data import radar_scale, top_contributions
 from .pdf_report import generate_pdf
+from .pdf_charts import (
+    draw_radar, draw_contribution, draw_roc, draw_histogram, draw_class_split,
+)
+from .ood import ood_score
+from .percentiles import percentile_rank
+from .partial import predict_partial
+from .calibration import (
+    calibrate, calibration_report, calibration_table, fit_table,
+    DEFAULT_METHOD as CALIBRATION_METHOD,
+)
+from .uncertainty import measurement_uncertainty, N_DRAWS as MC_DRAWS
+from .features import extract_features, nucleus_measurements
+from .audit import AuditLog, audit_log
+from .history import CaseHistory
+from .drift import (
+    DriftSketch, DriftMonitor, drift_monitor, drift_stats, current_drift, record_run,
+    PSI_MODERATE, PSI_MAJOR,
+)
+from .memprof import MemoryProfiler, memory_profiler
 from .theme import THEMES, inject_css
 
 __all__ = [
-    "predict_prob", "compute_model_metrics", "W", "FEAT_MEAN", "FEAT_STD",
+    "predict_prob", "predict_batch", "sigmoid", "compute_model_metrics", "load_reference",
+    "W", "FEAT_MEAN", "FEAT_STD",
     "FEATURES_RAW", "SECTIONS", "FEATURE_ORDER", "MEAN_LABELS", "FULL_LABELS",
     "GLOSSARY", "SAMPLE_BENIGN", "SAMPLE_MALIGNANT",
     "LANG", "t",
-    "make_radar", "make_contribution", "make_confusion", "make_roc",
+    "radar_scale", "top_contributions",
     "generate_pdf",
+    "draw_radar", "draw_contribution", "draw_roc", "draw_histogram", "draw_class_split",
+    "ood_score",
+    "percentile_rank",
+    "predict_partial",
+    "calibrate", "calibration_report", "calibration_table", "fit_table",
+    "CALIBRATION_METHOD",
+    "measurement_uncertainty", "MC_DRAWS",
+    "extract_features", "nucleus_measurements",
+    "AuditLog", "audit_log",
+    "CaseHistory",
+    "DriftSketch", "DriftMonitor", "drift_monitor", "drift_stats", "current_drift", "record_run",
+    "PSI_MODERATE", "PSI_MAJOR",
+    "MemoryProfiler", "memory_profiler",
     "THEMES", "inject_css",
 ]
@@ -0,0 +1,197 @@
+"""
+Append-only prediction audit log.
+
+Every prediction is queued in memory and written by a background thread, so
+logging never adds latency to a Streamlit rerun.  Records are batch-appended
+into one SQLite file per UTC day (`audit-YYYYMMDD.sqlite`) with an index on
+the timestamp; a time-range query opens only the files that overlap the range
+and reads them through that index.  The files use WAL mode with a busy
+timeout, so several server processes can append to the same day.  A failed
+write is logged and the batch retried on the next flush interval; it is
+dropped only after `WRITE_ATTEMPTS` failures, so `flush` always returns.
+
+The log directory defaults to `./audit` and can be set with `BCR_AUDIT_DIR`.
+"""
+
+import atexit
+import contextlib
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+from .config import FEATURE_ORDER
+from .model import MODEL_VERSION
+
+log = logging.getLogger(__name__)
+
+BUSY_TIMEOUT = 30.0     # seconds to wait for another process's write lock
+WRITE_ATTEMPTS = 5      # tries per batch before it is dropped
+
+_COLUMNS = ["ts", "model_version", *FEATURE_ORDER, "p_malignant", "malignant",
+            "lang", "n_imputed"]
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS predictions ("
+    "ts REAL NOT NULL, model_version TEXT NOT NULL, "
+    + "".join(f"{k} REAL, " for k in FEATURE_ORDER)
+    + "p_malignant REAL NOT NULL, malignant INTEGER NOT NULL, lang TEXT, "
+    "n_imputed INTEGER NOT NULL DEFAULT 0)"
+)
+_INSERT = (f"INSERT INTO predictions ({', '.join(_COLUMNS)}) "
+           f"VALUES ({', '.join('?' * len(_COLUMNS))})")
+
+
+def _day(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y%m%d")
+
+
+class AuditLog:
+    """Queue-backed audit writer; call `submit` from any thread."""
+
+    def __init__(self, directory, batch_size: int = 256,
+                 flush_interval: float = 1.0):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue()
+        self._conns: dict[str, sqlite3.Connection] = {}
+        self._thread = threading.Thread(target=self._run, name="audit-writer",
+                                        daemon=True)
+        self._thread.start()
+
+    # ── Producer side ────────────────────────────────────────────────────────
+
+    def submit(self, features, p_malignant: float, malignant: bool,
+               lang: str, ts: float | None = None, n_imputed: int = 0) -> None:
+        """Queue one prediction record; returns immediately.
+
+        `n_imputed` counts features that were estimated rather than entered.
+        """
+        self._queue.put((
+            time.time() if ts is None else ts, MODEL_VERSION,
+            *map(float, features), float(p_malignant), int(malignant), lang,
+            int(n_imputed),
+        ))
+
+    def flush(self) -> None:
+        """Block until every queued record has been written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    # ── Writer thread ────────────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        batch: list[tuple] = []
+        deadline = time.monotonic() + self.flush_interval
+        stop = False
+        failures = 0
+        while not stop:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                if item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+                    if len(batch) < self.batch_size:
+                        continue
+            except queue.Empty:
+                pass
+            try:
+                self._write(batch)
+            except Exception:
+                failures += 1
+                self._close_connections()
+                if failures < WRITE_ATTEMPTS and not stop:
+                    log.warning("audit write of %d records failed (attempt %d of %d)",
+                                len(batch), failures, WRITE_ATTEMPTS, exc_info=True)
+                    deadline = time.monotonic() + self.flush_interval
+                    continue
+                log.exception("dropping %d audit records after %d failed writes",
+                              len(batch), failures)
+            failures = 0
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+        self._close_connections()
+
+    def _close_connections(self) -> None:
+        for conn in self._conns.values():
+            with contextlib.suppress(sqlite3.Error):
+                conn.close()
+        self._conns = {}
+
+    def _write(self, batch: list[tuple]) -> None:
+        by_day: dict[str, list[tuple]] = {}
+        for rec in batch:
+            by_day.setdefault(_day(rec[0]), []).append(rec)
+        for day, rows in by_day.items():
+            conn = self._conns.get(day)
+            if conn is None:
+                self._close_connections()           # rotation: only today stays open
+                self._conns = {day: self._connect(self.directory / f"audit-{day}.sqlite")}
+                conn = self._conns[day]
+            with conn:
+                conn.executemany(_INSERT, rows)
+
+    @staticmethod
+    def _connect(path: Path) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(_SCHEMA)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_ts ON predictions (ts)")
+        return conn
+
+    # ── Queries ──────────────────────────────────────────────────────────────
+
+    def query(self, start: float, end: float) -> dict:
+        """Return all records with start <= ts < end as column arrays.
+
+        `X` holds the (N, 30) feature matrix; other keys are per-record arrays.
+        """
+        rows: list[tuple] = []
+        day = datetime.fromtimestamp(start, timezone.utc).date()
+        last = datetime.fromtimestamp(end, timezone.utc).date()
+        while day <= last:
+            path = self.directory / f"audit-{day:%Y%m%d}.sqlite"
+            if path.exists():
+                with contextlib.closing(
+                        sqlite3.connect(f"file:{path}?mode=ro", uri=True,
+                                        timeout=BUSY_TIMEOUT)) as conn:
+                    rows += conn.execute(
+                        f"SELECT {', '.join(_COLUMNS)} FROM predictions "
+                        "WHERE ts >= ? AND ts < ? ORDER BY ts", (start, end),
+                    ).fetchall()
+            day += timedelta(days=1)
+
+        cols = list(zip(*rows)) if rows else [()] * len(_COLUMNS)
+        n = len(FEATURE_ORDER)
+        return dict(
+            ts=np.array(cols[0], dtype=float),
+            model_version=np.array(cols[1], dtype=str),
+            X=np.array(cols[2:2 + n], dtype=float).T.reshape(len(rows), n),
+            p_malignant=np.array(cols[2 + n], dtype=float),
+            malignant=np.array(cols[3 + n], dtype=int),
+            lang=np.array(cols[4 + n], dtype=str),
+            n_imputed=np.array(cols[5 + n], dtype=int),
+        )
+
+
+@st.cache_resource
+def audit_log() -> AuditLog:
+    """Process-wide audit log shared by every Streamlit session."""
+    log = AuditLog(os.environ.get("BCR_AUDIT_DIR", "audit"))
+    atexit.register(log.close)
+    return log
@@ -0,0 +1,142 @@
+"""
+Bulk scoring of many cases in one vectorised pass.
+
+Usage:
+    python -m src.batch cases.csv -o scored.csv
+
+Input files are CSV (optional header naming the 30 features, in any order;
+sklearn-style names with spaces are accepted) or `.npy` arrays of shape
+(N, 30) in `FEATURE_ORDER`.
+"""
+
+import argparse
+import csv
+import io
+import sys
+
+import numpy as np
+
+from .config import FEATURE_ORDER
+from .calibration import calibrate
+from .drift import record_run
+from .ensemble import ensemble_predict, interval_check
+from .model import predict_batch
+from .ood import ood_score
+
+
+# ── Input ────────────────────────────────────────────────────────────────────
+
+def read_cases(src, name: str = "") -> np.ndarray:
+    """Read an (N, 30) case matrix from a path or binary file-like object."""
+    name = name or str(getattr(src, "name", src))
+    if name.lower().endswith(".npy"):
+        X = np.load(src, allow_pickle=False)
+    else:
+        if isinstance(src, str) or hasattr(src, "__fspath__"):
+            text = open(src, encoding="utf-8-sig").read()
+        else:
+            text = src.read().decode("utf-8-sig")
+        rows = [r for r in csv.reader(io.StringIO(text)) if r]
+        if not rows:
+            raise ValueError(f"{name} holds no cases")
+        header = [c.strip().lower().replace(" ", "_") for c in rows[0]]
+        if set(FEATURE_ORDER) <= set(header):
+            cols = [header.index(k) for k in FEATURE_ORDER]
+            rows = rows[1:]
+            short = [i for i, r in enumerate(rows) if len(r) <= max(cols)]
+            problem = "fewer columns than the header"
+        else:               # no header: exactly one column per feature, in order
+            cols = list(range(len(FEATURE_ORDER)))
+            short = [i for i, r in enumerate(rows) if len(r) != len(cols)]
+            problem = f"a column count other than {len(cols)}"
+        if short:
+            _bad_rows(short, problem)
+        X = np.array([[float(r[c]) for c in cols] for r in rows], dtype=float)
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    check_cases(X)
+    return X
+
+
+def check_cases(X, first_row: int = 0) -> None:
+    """Raise `ValueError` unless X is (N, 30) with only finite values.
+
+    `first_row` offsets the reported row numbers when X is one chunk of a
+    larger file.
+    """
+    if X.ndim != 2 or X.shape[1] != len(FEATURE_ORDER):
+        raise ValueError(f"expected {len(FEATURE_ORDER)} features, got shape {X.shape}")
+    bad = ~np.isfinite(X).all(axis=1)
+    if bad.any():
+        _bad_rows(np.flatnonzero(bad) + first_row, "missing or non-finite values")
+
+
+def _bad_rows(rows, problem: str) -> None:
+    """Raise `ValueError` naming the first few (0-based) `rows` and the problem."""
+    shown = ", ".join(str(r + 1) for r in rows[:5]) + (", ..." if len(rows) > 5 else "")
+    raise ValueError(f"{len(rows)} row(s) with {problem} (rows {shown})")
+
+
+# ── Scoring ──────────────────────────────────────────────────────────────────
+
+def score_batch(X) -> dict:
+    """Score an (N, 30) matrix; returns one array per output column.
+
+    `p_calibrated` is the malignancy after probability calibration; `ens_*`
+    columns are the bootstrap ensemble's median malignancy and its credible
+    interval, left out when the ensemble fails its `interval_check`.
+    """
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    p_benign = predict_batch(X)
+    p_malignant = 1.0 - p_benign
+    ood = ood_score(X)
+    scores = dict(
+        p_malignant=p_malignant,
+        p_calibrated=1.0 - calibrate(p_benign),
+        malignant=(p_malignant >= 0.5).astype(int),
+    )
+    if interval_check()["ok"]:
+        ens = ensemble_predict(X)
+        scores.update(ens_median=1.0 - ens["p_benign"], ens_lo=1.0 - ens["p_hi"],
+                      ens_hi=1.0 - ens["p_lo"])
+    scores.update(ood_distance=ood["distance"], ood=ood["is_ood"].astype(int))
+    return scores
+
+
+def write_scores(out, scores: dict) -> None:
+    """Write scored columns as CSV to a text stream."""
+    writer = csv.writer(out)
+    cols = list(scores)
+    writer.writerow(["row"] + cols)
+    for i, row in enumerate(zip(*(scores[c] for c in cols))):
+        writer.writerow([i] + [f"{v:.6f}" if isinstance(v, float) else int(v)
+                               for v in map(_py, row)])
+
+
+def _py(v):
+    """Unwrap NumPy scalars so the CSV writer formats them consistently."""
+    return v.item() if hasattr(v, "item") else v
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Score a file of cases in bulk.")
+    ap.add_argument("input", help="CSV or .npy file with 30 feature columns")
+    ap.add_argument("-o", "--output", help="output CSV (default: stdout)")
+    ap.add_argument("--no-drift", action="store_true",
+                    help="leave these cases out of drift monitoring (test or synthetic data)")
+    args = ap.parse_args(argv)
+
+    X = read_cases(args.input)
+    scores = score_batch(X)
+    if not args.no_drift:
+        record_run(X, scores["p_malignant"])
+    if args.output:
+        with open(args.output, "w", newline="") as fh:
+            write_scores(fh, scores)
+    else:
+        write_scores(sys.stdout, scores)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Probability calibration for the model's P(benign) output.
+
+The reference data is split once (stratified, fixed seed) into a
+calibration half and an evaluation half.  Two calibrators are fitted on the
+calibration half:
+  - `platt`     logistic regression on the model logit, p' = sigmoid(a z + b)
+  - `isotonic`  monotone step fit (pool-adjacent-violators)
+and the evaluation half is used for the reliability diagram and Brier scores
+in the performance section.
+
+Neither half is truly held out: the reference data is the WDBC dataset the
+model itself was trained on, so both calibrators and the reported Brier
+scores see the model on the cases it learned from, where it is more
+confident and more often right than on new patients.  The split only keeps the calibrators from
+being scored on the cases they were fitted to; calibration on an independent
+cohort would be needed to correct real-world overconfidence.
+
+Each calibrator is compiled to a fixed `TABLE_SIZE` lookup table whose nodes
+are evenly spaced in logit space (dense near 0 and 1, where the scores
+cluster), so calibrating N scores is one `np.interp`.
+"""
+
+import numpy as np
+import streamlit as st
+from sklearn.isotonic import IsotonicRegression
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+
+from .model import load_reference, predict_batch, sigmoid
+
+METHODS = ("platt", "isotonic")
+DEFAULT_METHOD = "platt"    # smooth and never exactly 0 / 1, unlike the isotonic steps
+TABLE_SIZE = 1024
+LOGIT_SPAN = 16.0           # table nodes cover logits in [-LOGIT_SPAN, LOGIT_SPAN]
+HOLDOUT = 0.5               # share of the reference data kept for evaluation
+SEED = 0
+N_BINS = 10                 # reliability-diagram bins
+
+
+def _logit(p):
+    p = np.clip(p, 1e-15, 1 - 1e-15)
+    return np.log(p) - np.log1p(-p)
+
+
+@st.cache_resource
+def _split() -> dict:
+    """Model scores and labels for the calibration and evaluation halves.
+
+    Both halves come from the model's training dataset (see the module notes).
+    """
+    X, y = load_reference()
+    p = predict_batch(X)
+    cal, ev = train_test_split(np.arange(len(y)), test_size=HOLDOUT, stratify=y,
+                               random_state=SEED)
+    return dict(p_cal=p[cal], y_cal=y[cal], p_eval=p[ev], y_eval=y[ev])
+
+
+# ── Fitting ──────────────────────────────────────────────────────────────────
+
+def fit_table(p_benign, y, method: str = DEFAULT_METHOD) -> tuple[np.ndarray, np.ndarray]:
+    """Fit `method` on scores / labels (1 = benign) and compile it to (xp, fp)."""
+    if method not in METHODS:
+        raise ValueError(f"unknown calibration method {method!r} (use {', '.join(METHODS)})")
+    p_benign, y = np.asarray(p_benign, dtype=float), np.asarray(y)
+    xp = sigmoid(np.linspace(-LOGIT_SPAN, LOGIT_SPAN, TABLE_SIZE))
+    if method == "platt":
+        lr = LogisticRegression(C=1e6).fit(_logit(p_benign)[:, None], y)
+        fp = sigmoid(lr.coef_[0, 0] * _logit(xp) + lr.intercept_[0])
+    else:
+        iso = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds="clip")
+        fp = iso.fit(p_benign, y).predict(xp)
+    return xp, fp
+
+
+@st.cache_resource
+def calibration_table(method: str = DEFAULT_METHOD) -> tuple[np.ndarray, np.ndarray]:
+    """Process-wide lookup table for `method`, fitted on the calibration half."""
+    split = _split()
+    xp, fp = fit_table(split["p_cal"], split["y_cal"], method)
+    xp.flags.writeable = False
+    fp.flags.writeable = False
+    return xp, fp
+
+
+def calibrate(p_benign, method: str = DEFAULT_METHOD):
+    """Calibrated P(benign) for a score or an array of scores."""
+    return np.interp(p_benign, *calibration_table(method))
+
+
+# ── Evaluation ───────────────────────────────────────────────────────────────
+
+def reliability(p_malignant, is_malignant, n_bins: int = N_BINS) -> dict:
+    """Mean predicted vs observed malignancy per equal-width bin (empty bins dropped)."""
+    p_malignant = np.asarray(p_malignant, dtype=float)
+    bins = np.minimum((p_malignant * n_bins).astype(int), n_bins - 1)
+    count = np.bincount(bins, minlength=n_bins)
+    keep = count > 0
+    return dict(
+        predicted=(np.bincount(bins, p_malignant, n_bins)[keep] / count[keep]),
+        observed=(np.bincount(bins, is_malignant, n_bins)[keep] / count[keep]),
+        count=count[keep],
+    )
+
+
+@st.cache_data
+def calibration_report(n_bins: int = N_BINS) -> dict:
+    """Brier score and reliability curve on the evaluation half for the raw
+    model and each calibrator, all in terms of malignancy."""
+    split = _split()
+    is_malignant = (split["y_eval"] == 0).astype(float)
+    scores = {"raw": split["p_eval"]}
+    scores.update({m: calibrate(split["p_eval"], m) for m in METHODS})
+    report = {}
+    for name, p_benign in scores.items():
+        p_malignant = 1.0 - p_benign
+        report[name] = dict(brier=float(np.mean((p_malignant - is_malignant) ** 2)),
+                            **reliability(p_malignant, is_malignant, n_bins))
+    return dict(n=len(is_malignant), methods=report)
@@ -0,0 +1,187 @@
+"""
+Persistent case store backed by SQLite in WAL mode.
+
+Every case keeps its 30 features together with the probability, class and
+`MODEL_VERSION` it was scored with.  When the model changes, `rescore_stale`
+walks the stale rows in id-ordered chunks, scores each chunk in one
+vectorised pass and updates only those rows.
+
+The database path defaults to `./cases.sqlite` and can be set with
+`BCR_CASE_DB`.
+
+Usage:
+    python -m src.case_store rescore [--db cases.sqlite] [--chunk 5000]
+"""
+
+import argparse
+import contextlib
+import os
+import queue
+import sqlite3
+import sys
+import time
+
+import numpy as np
+import streamlit as st
+
+from .config import FEATURE_ORDER
+from .model import MODEL_VERSION, predict_batch
+
+_FEATS = ", ".join(FEATURE_ORDER)
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS cases ("
+    "id INTEGER PRIMARY KEY, created REAL NOT NULL, lang TEXT, "
+    + "".join(f"{k} REAL NOT NULL, " for k in FEATURE_ORDER)
+    + "p_malignant REAL NOT NULL, malignant INTEGER NOT NULL, "
+    "model_version TEXT NOT NULL)"
+)
+_INSERT = (f"INSERT INTO cases (created, lang, {_FEATS}, p_malignant, "
+           f"malignant, model_version) VALUES "
+           f"({', '.join('?' * (len(FEATURE_ORDER) + 5))})")
+
+
+class CaseStore:
+    """SQLite case store with a small pool of connections shared across threads."""
+
+    def __init__(self, path, pool_size: int = 4):
+        self.path = str(path)
+        self._pool: queue.Queue = queue.Queue()
+        for _ in range(pool_size):
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._pool.put(conn)
+        with self.connection() as conn, conn:
+            conn.execute(_SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cases_version "
+                         "ON cases (model_version)")
+
+    @contextlib.contextmanager
+    def connection(self):
+        """Borrow a pooled connection for the duration of the block."""
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    # ── Writes ───────────────────────────────────────────────────────────────
+
+    def add_cases(self, X, lang: str = "") -> np.ndarray:
+        """Score and insert an (N, 30) batch with one `executemany`; returns
+        the new ids."""
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        p_mal = 1.0 - predict_batch(X)
+        now = time.time()
+        rows = [(now, lang, *x, p, int(p >= 0.5), MODEL_VERSION)
+                for x, p in zip(X.tolist(), p_mal.tolist())]
+        with self.connection() as conn, conn:
+            # Holding the write lock, new rowids continue from the current maximum
+            conn.execute("BEGIN IMMEDIATE")
+            first = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM cases").fetchone()[0]
+            conn.executemany(_INSERT, rows)
+        return np.arange(first, first + len(rows))
+
+    def add_case(self, values, lang: str = "") -> int:
+        """Insert one case and return its id."""
+        x = [float(v) for v in values]
+        p = float(1.0 - predict_batch(x)[0])
+        with self.connection() as conn, conn:
+            cur = conn.execute(_INSERT, (time.time(), lang, *x, p, int(p >= 0.5),
+                                         MODEL_VERSION))
+        return int(cur.lastrowid)
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+
+    def get_case(self, case_id: int) -> np.ndarray | None:
+        """Return the 30 features of a case, or None if it does not exist."""
+        with self.connection() as conn:
+            row = conn.execute(f"SELECT {_FEATS} FROM cases WHERE id = ?",
+                               (case_id,)).fetchone()
+        return None if row is None else np.array(row, dtype=float)
+
+    def iter_scores(self, chunk_size: int = 50_000):
+        """Yield (ids, X, p_malignant) arrays for rows scored by this model,
+        in id-ordered chunks."""
+        last_id = 0
+        with self.connection() as conn:
+            while True:
+                rows = conn.execute(
+                    f"SELECT id, {_FEATS}, p_malignant FROM cases WHERE model_version = ? "
+                    "AND id > ? ORDER BY id LIMIT ?",
+                    (MODEL_VERSION, last_id, chunk_size),
+                ).fetchall()
+                if not rows:
+                    return
+                arr = np.array(rows, dtype=float)
+                last_id = int(arr[-1, 0])
+                yield arr[:, 0].astype(np.int64), arr[:, 1:-1], arr[:, -1]
+
+    def count_stale(self) -> int:
+        with self.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM cases WHERE model_version != ?",
+                                (MODEL_VERSION,)).fetchone()[0]
+
+    # ── Re-scoring ───────────────────────────────────────────────────────────
+
+    def rescore_stale(self, chunk_size: int = 5000, progress=None) -> dict:
+        """Re-score every row whose model version differs from `MODEL_VERSION`.
+
+        `progress(done, total)` is called after each chunk.  Returns the row
+        count, elapsed seconds and throughput.
+        """
+        total = self.count_stale()
+        done, last_id = 0, 0
+        t0 = time.perf_counter()
+        with self.connection() as conn:
+            while True:
+                rows = conn.execute(
+                    f"SELECT id, {_FEATS} FROM cases WHERE model_version != ? "
+                    "AND id > ? ORDER BY id LIMIT ?",
+                    (MODEL_VERSION, last_id, chunk_size),
+                ).fetchall()
+                if not rows:
+                    break
+                arr = np.array(rows, dtype=float)
+                ids = arr[:, 0].astype(int)
+                p_mal = 1.0 - predict_batch(arr[:, 1:])
+                with conn:
+                    conn.executemany(
+                        "UPDATE cases SET p_malignant = ?, malignant = ?, "
+                        "model_version = ? WHERE id = ?",
+                        zip(p_mal.tolist(), (p_mal >= 0.5).astype(int).tolist(),
+                            [MODEL_VERSION] * len(ids), ids.tolist()),
+                    )
+                done += len(ids)
+                last_id = int(ids[-1])
+                if progress is not None:
+                    progress(done, total)
+        elapsed = time.perf_counter() - t0
+        return dict(rows=done, seconds=elapsed,
+                    rows_per_s=done / elapsed if elapsed > 0 else 0.0)
+
+
+@st.cache_resource
+def case_store() -> CaseStore:
+    """Process-wide case store shared by every Streamlit session."""
+    return CaseStore(os.environ.get("BCR_CASE_DB", "cases.sqlite"))
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Maintain the persistent case store.")
+    ap.add_argument("command", choices=["rescore"])
+    ap.add_argument("--db", default=os.environ.get("BCR_CASE_DB", "cases.sqlite"))
+    ap.add_argument("--chunk", type=int, default=5000)
+    args = ap.parse_args(argv)
+
+    store = CaseStore(args.db, pool_size=1)
+    report = lambda done, total: print(f"\r  {done}/{total} rows", end="",
+                                       file=sys.stderr)
+    stats = store.rescore_stale(args.chunk, progress=report)
+    print(file=sys.stderr)
+    print(f"re-scored {stats['rows']} rows in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_s']:,.0f} rows/s) -> model {MODEL_VERSION}")
+
+
+if __name__ == "__main__":
+    main()
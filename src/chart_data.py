@@ -0,0 +1,40 @@
+"""
+Arrays behind the radar and contribution charts.
+
+Shared by the Plotly figures in `charts.py` and the PDF vector charts in
+`pdf_charts.py`, so the app and the reports plot the same numbers.
+"""
+
+import numpy as np
+
+from .config import FULL_LABELS
+from .model import W, FEAT_MEAN, FEAT_STD
+from .percentiles import percentile_rank
+
+
+def radar_scale(stk, mode: str) -> np.ndarray:
+    """Scale the first 10 features of stacked profiles to [0, 1] radii.
+
+    `mode="range"` uses the min/max over the stacked profiles;
+    `mode="percentile"` uses population percentile ranks instead.
+    """
+    stk = np.atleast_2d(stk)
+    if mode == "percentile":
+        return percentile_rank(stk)[:, :10] / 100
+    stk = stk[:, :10]
+    lo, hi = stk.min(axis=0), stk.max(axis=0)
+    return (stk - lo) / np.where(hi - lo == 0, 1, hi - lo)
+
+
+def mal_contributions(X) -> np.ndarray:
+    """Per-feature logit contributions; positive = pushes toward malignant."""
+    return -((np.atleast_2d(np.asarray(X, dtype=float)) - FEAT_MEAN) / FEAT_STD * W)
+
+
+def top_contributions(values, lang: str, k: int = 10) -> tuple[list[str], list[float]]:
+    """Labels and contributions of the `k` largest features, smallest first."""
+    contribs = mal_contributions(values)[0]
+    labels = FULL_LABELS[lang]
+    idx = np.argsort(np.abs(contribs))[::-1][:k]
+    return ([labels[i] for i in idx][::-1],
+            [float(contribs[i]) for i in idx][::-1])
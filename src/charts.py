@@ -1,15 +1,35 @@
 """
 Plotly chart builders for prediction visualisation.
+
+The single-case radar and contribution charts and the fixed confusion / ROC
+charts are themed once per (language, theme) and kept as serialized JSON;
+each call only rehydrates that JSON without re-validation and patches in the
+case data, which is a fraction of a millisecond instead of a full
+`go.Figure` build (`python -m src.charts` prints both).
+
+Usage:
+    python -m src.charts            # build time and payload per chart
 """
 
+import argparse
+import json
+import time
+from functools import lru_cache
+
 import numpy as np
 import plotly.graph_objects as go
+import plotly.io as pio
 
-from .config import MEAN_LABELS, FULL_LABELS
-from .model import W, FEAT_MEAN, FEAT_STD
+from .chart_data import mal_contributions, radar_scale, top_contributions
+from .config import MEAN_LABELS, FULL_LABELS, SAMPLE_MALIGNANT
+from .model import compute_model_metrics
+from .theme import THEMES
 from .translations import t
 
 
+CASE_COLORS = ["#6366f1", "#f59e0b", "#0ea5e9", "#db2777", "#14b8a6", "#8b5cf6"]
+
+
 def _chart_layout(fig: go.Figure, th: dict) -> go.Figure:
     """Apply shared theme to a Plotly figure."""
     fig.update_layout(
@@ -22,56 +42,88 @@ def _chart_layout(fig: go.Figure, th: dict) -> go.Figure:
     return fig
 
 
-def make_radar(patient_vals, benign_avg, malignant_avg, lang: str, th: dict):
-    """Radar chart comparing patient measurements to class averages."""
-    labels = MEAN_LABELS[lang]
-    p = patient_vals[:10]
-    b = benign_avg[:10]
-    m = malignant_avg[:10]
-    stk = np.vstack([p, b, m])
-    lo, hi = stk.min(axis=0), stk.max(axis=0)
-    rng = np.where(hi - lo == 0, 1, hi - lo)
-    norm = lambda v: list((v - lo) / rng) + [float((v[0] - lo[0]) / rng[0])]
-    theta = labels + [labels[0]]
+def _theme_key(th: dict) -> tuple:
+    return tuple(th.items())
 
-    fig = go.Figure()
-    fig.add_trace(go.Scatterpolar(
-        r=norm(b), theta=theta, name=t("avg_benign", lang),
-        fill="toself", fillcolor="rgba(52,211,153,0.10)",
-        line=dict(color="#059669", width=2)))
-    fig.add_trace(go.Scatterpolar(
-        r=norm(m), theta=theta, name=t("avg_malignant", lang),
-        fill="toself", fillcolor="rgba(248,113,113,0.10)",
-        line=dict(color="#dc2626", width=2)))
-    fig.add_trace(go.Scatterpolar(
-        r=norm(p), theta=theta, name=t("patient", lang),
-        fill="toself", fillcolor="rgba(99,102,241,0.15)",
-        line=dict(color="#6366f1", width=3)))
+
+def _from_json(spec: str, patch=None) -> go.Figure:
+    """Fresh figure from a cached spec; `patch(data)` edits the trace dicts first."""
+    fig = json.loads(spec)
+    if patch is not None:
+        patch(fig["data"])
+    return go.Figure(fig, _validate=False)
+
+
+def _radar_trace(r, theta, name, color, fill, width):
+    return go.Scatterpolar(
+        r=list(r) + [float(r[0])], theta=theta, name=name,
+        fill="toself", fillcolor=fill, line=dict(color=color, width=width))
+
+
+def _radar_figure(fig: go.Figure, th: dict, mode: str) -> go.Figure:
     fig.update_layout(polar=dict(
         bgcolor=th["card"],
-        radialaxis=dict(visible=True, range=[0, 1], showticklabels=False,
+        radialaxis=dict(visible=True, range=[0, 1],
+                        showticklabels=(mode == "percentile"),
+                        tickvals=[0.25, 0.5, 0.75], ticktext=["25", "50", "75"],
                         gridcolor=th["border"]),
         angularaxis=dict(gridcolor=th["border"]),
     ))
     return _chart_layout(fig, th)
 
 
-def make_contribution(values, lang: str, th: dict):
-    """Horizontal bar chart of top-10 feature contributions."""
-    x = np.array(values)
-    scaled = (x - FEAT_MEAN) / FEAT_STD
-    contribs = scaled * W
-    mal_contribs = -contribs  # positive = pushes toward malignant
+@lru_cache(maxsize=None)
+def _radar_base(lang: str, theme: tuple, mode: str) -> str:
+    """Themed single-case radar with placeholder radii."""
+    labels = MEAN_LABELS[lang]
+    theta = labels + [labels[0]]
+    zeros = np.zeros(len(labels))
+    fig = go.Figure()
+    fig.add_trace(_radar_trace(zeros, theta, t("avg_benign", lang), "#059669",
+                               "rgba(52,211,153,0.10)", 2))
+    fig.add_trace(_radar_trace(zeros, theta, t("avg_malignant", lang), "#dc2626",
+                               "rgba(248,113,113,0.10)", 2))
+    fig.add_trace(_radar_trace(zeros, theta, t("patient", lang), "#6366f1",
+                               "rgba(99,102,241,0.15)", 3))
+    return pio.to_json(_radar_figure(fig, dict(theme), mode), validate=False)
 
-    labels = FULL_LABELS[lang]
-    idx = np.argsort(np.abs(mal_contribs))[::-1][:10]
-    names = [labels[i] for i in idx][::-1]
-    vals = [float(mal_contribs[i]) for i in idx][::-1]
-    colors = ["#dc2626" if v > 0 else "#059669" for v in vals]
-
-    fig = go.Figure(go.Bar(
-        y=names, x=vals, orientation="h", marker_color=colors,
-        hovertemplate="%{y}: %{x:.3f}<extra></extra>"))
+
+def make_radar(patient_vals, benign_avg, malignant_avg, lang: str, th: dict,
+               mode: str = "range"):
+    """Radar chart comparing patient measurements to class averages.
+
+    In range mode the scale depends on the patient, so the class-average
+    radii are patched along with the patient's.
+    """
+    scaled = radar_scale(np.vstack([benign_avg, malignant_avg, patient_vals]), mode)
+
+    def patch(data):
+        for trace, r in zip(data, scaled.tolist()):
+            trace["r"] = r + r[:1]
+
+    return _from_json(_radar_base(lang, _theme_key(th), mode), patch)
+
+
+def make_radar_compare(cases, names: list[str], benign_avg, malignant_avg,
+                       lang: str, th: dict, mode: str = "range"):
+    """Radar chart overlaying several cases on the class averages."""
+    labels = MEAN_LABELS[lang]
+    theta = labels + [labels[0]]
+    cases = np.atleast_2d(cases)
+    scaled = radar_scale(np.vstack([cases, benign_avg, malignant_avg]), mode)
+
+    fig = go.Figure()
+    fig.add_trace(_radar_trace(scaled[-2], theta, t("avg_benign", lang),
+                               "#059669", "rgba(52,211,153,0.06)", 1.5))
+    fig.add_trace(_radar_trace(scaled[-1], theta, t("avg_malignant", lang),
+                               "#dc2626", "rgba(248,113,113,0.06)", 1.5))
+    for i, (r, name) in enumerate(zip(scaled[:-2], names)):
+        color = CASE_COLORS[i % len(CASE_COLORS)]
+        fig.add_trace(_radar_trace(r, theta, name, color, "rgba(0,0,0,0)", 2.5))
+    return _radar_figure(fig, th, mode)
+
+
+def _contribution_layout(fig: go.Figure, lang: str, th: dict) -> go.Figure:
     fig.update_layout(
         xaxis_title=(f"\u2190 {t('contribution_ben', lang)}    |    "
                      f"{t('contribution_mal', lang)} \u2192"),
@@ -83,8 +135,44 @@ def make_contribution(values, lang: str, th: dict):
     return _chart_layout(fig, th)
 
 
-def make_confusion(cm, lang: str, th: dict):
-    """Heatmap confusion matrix."""
+@lru_cache(maxsize=None)
+def _contribution_base(lang: str, theme: tuple) -> str:
+    """Themed single-case contribution chart with an empty bar trace."""
+    fig = go.Figure(go.Bar(orientation="h",
+                           hovertemplate="%{y}: %{x:.3f}<extra></extra>"))
+    return pio.to_json(_contribution_layout(fig, lang, dict(theme)), validate=False)
+
+
+def make_contribution(values, lang: str, th: dict):
+    """Horizontal bar chart of top-10 feature contributions."""
+    names, vals = top_contributions(values, lang)
+
+    def patch(data):
+        data[0].update(y=names, x=vals, marker=dict(
+            color=["#dc2626" if v > 0 else "#059669" for v in vals]))
+
+    return _from_json(_contribution_base(lang, _theme_key(th)), patch)
+
+
+def make_contribution_compare(cases, names: list[str], lang: str, th: dict):
+    """Grouped bar chart of the top-10 contributions across several cases."""
+    contribs = mal_contributions(cases)
+    labels = FULL_LABELS[lang]
+    idx = np.argsort(np.abs(contribs).max(axis=0))[::-1][:10][::-1]
+
+    fig = go.Figure()
+    for i, (row, name) in enumerate(zip(contribs, names)):
+        fig.add_trace(go.Bar(
+            y=[labels[j] for j in idx], x=row[idx], orientation="h", name=name,
+            marker_color=CASE_COLORS[i % len(CASE_COLORS)],
+            hovertemplate="%{y}: %{x:.3f}<extra></extra>"))
+    fig.update_layout(barmode="group")
+    return _contribution_layout(fig, lang, th)
+
+
+@lru_cache(maxsize=None)
+def _confusion_json(cm: tuple, lang: str, theme: tuple) -> str:
+    th, cm = dict(theme), np.array(cm)
     labels = [t("malignant", lang), t("benign", lang)]
     fig = go.Figure(go.Heatmap(
         z=cm, x=labels, y=labels,
@@ -97,14 +185,21 @@ def make_confusion(cm, lang: str, th: dict):
         yaxis=dict(autorange="reversed"),
         height=340, width=340,
     )
-    return _chart_layout(fig, th)
+    return pio.to_json(_chart_layout(fig, th), validate=False)
 
 
-def make_roc(fpr, tpr, roc_auc: float, th: dict):
-    """ROC curve with AUC annotation."""
+def make_confusion(cm, lang: str, th: dict):
+    """Heatmap confusion matrix."""
+    cm = tuple(map(tuple, np.asarray(cm).tolist()))
+    return _from_json(_confusion_json(cm, lang, _theme_key(th)))
+
+
+@lru_cache(maxsize=None)
+def _roc_json(fpr: tuple, tpr: tuple, roc_auc: float, theme: tuple) -> str:
+    th = dict(theme)
     fig = go.Figure()
     fig.add_trace(go.Scatter(
-        x=fpr, y=tpr, mode="lines",
+        x=np.array(fpr), y=np.array(tpr), mode="lines",
         name=f"AUC = {roc_auc:.3f}",
         line=dict(color="#6366f1", width=2.5)))
     fig.add_trace(go.Scatter(
@@ -118,4 +213,91 @@ def make_roc(fpr, tpr, roc_auc: float, th: dict):
         yaxis=dict(gridcolor=th["border"]),
         height=340,
     )
-    return _chart_layout(fig, th)
+    return pio.to_json(_chart_layout(fig, th), validate=False)
+
+
+def make_roc(fpr, tpr, roc_auc: float, th: dict):
+    """ROC curve with AUC annotation."""
+    return _from_json(_roc_json(tuple(np.asarray(fpr).tolist()),
+                                tuple(np.asarray(tpr).tolist()),
+                                float(roc_auc), _theme_key(th)))
+
+
+@lru_cache(maxsize=None)
+def _reliability_json(curves: tuple, lang: str, theme: tuple) -> str:
+    th = dict(theme)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=[0, 1], y=[0, 1], mode="lines", name=t("reliability_ideal", lang),
+        line=dict(color=th["text_muted"], dash="dash", width=1)))
+    for i, (method, brier, predicted, observed, count) in enumerate(curves):
+        fig.add_trace(go.Scatter(
+            x=np.array(predicted), y=np.array(observed), mode="lines+markers",
+            name=f"{t('calib_' + method, lang)} (Brier {brier:.4f})",
+            customdata=np.array(count),
+            hovertemplate="%{x:.2f} \u2192 %{y:.2f} (n=%{customdata})<extra></extra>",
+            line=dict(color=CASE_COLORS[i % len(CASE_COLORS)], width=2)))
+    fig.update_layout(
+        xaxis_title=t("reliability_pred", lang),
+        yaxis_title=t("reliability_obs", lang),
+        xaxis=dict(gridcolor=th["border"], range=[0, 1]),
+        yaxis=dict(gridcolor=th["border"], range=[0, 1]),
+        height=340,
+    )
+    return pio.to_json(_chart_layout(fig, th), validate=False)
+
+
+def make_reliability(report: dict, lang: str, th: dict):
+    """Reliability diagram of each method in a `calibration_report`."""
+    curves = tuple((method, r["brier"], tuple(np.asarray(r["predicted"]).tolist()),
+                    tuple(np.asarray(r["observed"]).tolist()),
+                    tuple(np.asarray(r["count"]).tolist()))
+                   for method, r in report["methods"].items())
+    return _from_json(_reliability_json(curves, lang, _theme_key(th)))
+
+
+# ── Benchmark ────────────────────────────────────────────────────────────────
+
+def benchmark(repeat: int = 20) -> list[dict]:
+    """Best-of-`repeat` build time per chart, with the theme cache cleared
+    (`cold_ms`) and warm (`ms`), plus the JSON payload sent to the browser."""
+    m = compute_model_metrics()
+    th = THEMES["light"]
+    charts = {
+        "radar": (_radar_base, lambda: make_radar(
+            SAMPLE_MALIGNANT, m["benign_avg"], m["malignant_avg"], "en", th)),
+        "contribution": (_contribution_base, lambda: make_contribution(SAMPLE_MALIGNANT, "en", th)),
+        "confusion": (_confusion_json, lambda: make_confusion(m["cm"], "en", th)),
+        "roc": (_roc_json, lambda: make_roc(m["fpr"], m["tpr"], m["roc_auc"], th)),
+    }
+    rows = []
+    for name, (cached, build) in charts.items():
+        cold = warm = float("inf")
+        for _ in range(repeat):
+            cached.cache_clear()
+            t0 = time.perf_counter()
+            build()
+            cold = min(cold, time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            fig = build()
+            warm = min(warm, time.perf_counter() - t0)
+        payload = pio.to_json(fig.to_dict(), validate=False)
+        template = json.dumps(fig.to_dict()["layout"].get("template", {}))
+        rows.append(dict(chart=name, cold_ms=cold * 1e3, ms=warm * 1e3,
+                         bytes=len(payload), template_bytes=len(template)))
+    return rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Benchmark chart build time and payload size.")
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    print(f"{'chart':<13} {'cold ms':>8} {'ms':>7} {'bytes':>7} {'template':>9}")
+    for r in benchmark(args.repeat):
+        print(f"{r['chart']:<13} {r['cold_ms']:>8.2f} {r['ms']:>7.2f} "
+              f"{r['bytes']:>7} {r['template_bytes']:>9}")
+
+
+if __name__ == "__main__":
+    main()
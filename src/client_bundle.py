@@ -0,0 +1,128 @@
+"""
+Generate the client-side scoring bundle used by the static `legacy/` page.
+
+The bundle is rendered from the live parameters in `src/model.py`, with the
+standardisation folded into the coefficients so that scoring in the browser
+is a single dot product.
+
+Usage:
+    python -m src.client_bundle            # write legacy/model.js
+    python -m src.client_bundle --check    # verify legacy/model.js is current and matches Python (needs node)
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from .config import FEATURE_ORDER
+from .model import MODEL_VERSION, folded_coefficients, load_reference, predict_batch
+
+BUNDLE_PATH = Path(__file__).resolve().parent.parent / "legacy" / "model.js"
+PARITY_TOL = 1e-12
+
+_TEMPLATE = """\
+// AUTO-GENERATED by `python -m src.client_bundle` -- do not edit by hand.
+// Model version: {version}
+(function (root) {{
+  "use strict";
+
+  const MODEL_VERSION = "{version}";
+
+  // Feature order MUST match training
+  const FEATURE_NAMES = {names};
+
+  // Standardisation folded into the weights: logit = x . COEF + INTERCEPT
+  const COEF = {coef};
+  const INTERCEPT = {intercept};
+
+  /** Return P(benign) for a raw 30-feature vector in FEATURE_NAMES order. */
+  function predictProb(x) {{
+    let z = INTERCEPT;
+    for (let i = 0; i < COEF.length; i++) z += COEF[i] * x[i];
+    if (z >= 0) return 1 / (1 + Math.exp(-z));
+    const ez = Math.exp(z);
+    return ez / (1 + ez);
+  }}
+
+  const api = {{ MODEL_VERSION, FEATURE_NAMES, COEF, INTERCEPT, predictProb }};
+  if (typeof module !== "undefined" && module.exports) module.exports = api;
+  else root.BreastCancerModel = api;
+}})(this);
+"""
+
+# Reads a JSON matrix on stdin and prints the bundle's probabilities as JSON.
+_PARITY_HARNESS = """\
+const model = require(process.argv[1]);
+let buf = "";
+process.stdin.on("data", (d) => (buf += d));
+process.stdin.on("end", () => {
+  const X = JSON.parse(buf);
+  process.stdout.write(JSON.stringify(X.map(model.predictProb)));
+});
+"""
+
+
+def render_bundle() -> str:
+    """Render the bundle source from the current model parameters."""
+    coef, intercept = folded_coefficients()
+    return _TEMPLATE.format(
+        version=MODEL_VERSION,
+        names=json.dumps(FEATURE_ORDER),
+        coef="[" + ", ".join(repr(float(c)) for c in coef) + "]",
+        intercept=repr(intercept),
+    )
+
+
+def build(path: Path = BUNDLE_PATH) -> Path:
+    """Write the bundle to `path` and return it."""
+    path.write_text(render_bundle(), encoding="utf-8")
+    return path
+
+
+def check_parity(path: Path = BUNDLE_PATH) -> float:
+    """Score the full reference dataset with the bundle under node and compare
+    with `predict_batch`.  Returns the max absolute deviation; raises if it
+    exceeds `PARITY_TOL` or the bundle is stale.  Never writes the bundle."""
+    if path.read_text(encoding="utf-8") != render_bundle():
+        raise RuntimeError(f"{path} is stale; rebuild it with `python -m src.client_bundle`")
+    node = shutil.which("node")
+    if node is None:
+        raise RuntimeError("node is required for the parity check")
+
+    X, _ = load_reference()
+    out = subprocess.run(
+        [node, "-e", _PARITY_HARNESS, str(path)],
+        input=json.dumps(X.tolist()), capture_output=True, text=True, check=True,
+    )
+    js = np.array(json.loads(out.stdout))
+    dev = float(np.abs(js - predict_batch(X)).max())
+    if dev > PARITY_TOL:
+        raise RuntimeError(f"bundle deviates from Python by {dev:.3e}")
+    return dev
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Build the client scoring bundle.")
+    ap.add_argument("--check", action="store_true",
+                    help="verify the bundle on disk is current and matches Python "
+                         "on the reference dataset, without rewriting it")
+    args = ap.parse_args(argv)
+
+    if args.check:
+        try:
+            dev = check_parity(BUNDLE_PATH)
+        except (OSError, RuntimeError, subprocess.CalledProcessError) as exc:
+            sys.exit(f"check failed: {exc}")
+        print(f"parity ok: max |dp| = {dev:.3e}")
+        return
+    path = build()
+    print(f"wrote {path} (model {MODEL_VERSION})")
+
+
+if __name__ == "__main__":
+    main()
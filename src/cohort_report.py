@@ -0,0 +1,407 @@
+"""
+Cohort summary report: one compact PDF for many scored cases.
+
+Usage:
+    python -m src.cohort_report cohort.npy -o cohort.pdf [--lang vi]
+
+The first page holds the aggregate metrics (and, when labels are available,
+accuracy, sensitivity, specificity and Brier score), the predicted / actual
+class split, a histogram of malignancy scores and the highest-risk cases.
+A dense per-case table follows, one row per case across as many pages as it
+takes.
+
+Cases are read twice in chunks of `CHUNK_SIZE`: the first pass accumulates
+counts, the histogram and a bounded top-k, the second scores each chunk
+again and writes its table rows straight into the document, so no more than
+one chunk of cases and scores is held at a time.  Each table row is written
+to the page as one content-stream operation from cached per-character widths
+and glyph codes, which keeps tens of thousands of rows to a few seconds.
+That writer uses fpdf2 internals and runs only on the pinned 2.8 series;
+other versions draw each cell with the public `text` call instead.
+"""
+
+import argparse
+import sys
+import time
+from collections.abc import Callable, Iterable
+from datetime import date
+
+import numpy as np
+
+from .batch import check_cases, read_cases, score_batch
+from .config import FULL_LABELS
+from .ensemble import INTERVAL
+from .pdf_charts import draw_class_split, draw_histogram
+from .pdf_report import FPDF_INTERNALS, ReportPDF, _safe, _section_heading, _sub_heading
+from .synthetic import labels_path
+from .translations import t
+
+CHUNK_SIZE = 10_000
+TOP_K = 25              # highest-risk cases listed on the summary page
+HIST_BINS = 20
+TABLE_FONT = 6.5        # pt
+ROW_H = 3.4             # mm
+HEADER_H = 8.6          # mm, up to three lines of column titles
+FEATURES = (0, 7, 23, 27)   # mean radius, mean concave points, worst area, worst concave points
+_INK = "0.216 0.255 0.318"      # table text, RGB (55, 65, 81)
+_STRIPE = "0.961 0.969 0.980"   # alternate-row fill, RGB (245, 247, 250)
+
+
+# ── Input ────────────────────────────────────────────────────────────────────
+
+def array_chunks(X, y=None, chunk_size: int = CHUNK_SIZE) -> Callable[[], Iterable]:
+    """Chunk factory over an (N, 30) array (or memmap) and optional labels."""
+    def chunks():
+        for start in range(0, len(X), chunk_size):
+            stop = start + chunk_size
+            yield (X[start:stop], None if y is None else y[start:stop])
+    return chunks
+
+
+def _chunks(cases) -> Iterable[tuple[int, np.ndarray, np.ndarray | None]]:
+    """(first row, X, y or None) per chunk; items may be X or (X, y)."""
+    start = 0
+    for item in cases():
+        X, y = item if isinstance(item, tuple) else (item, None)
+        X = np.asarray(X, dtype=float)
+        yield start, X, None if y is None else np.asarray(y)
+        start += len(X)
+
+
+def _score(start: int, X: np.ndarray, y) -> dict:
+    s = score_batch(X)
+    s["row"] = np.arange(start, start + len(X))
+    s["X"] = X[:, FEATURES]
+    if y is not None:
+        s["label"] = y
+    return s
+
+
+# ── Pass 1: aggregates ───────────────────────────────────────────────────────
+
+def _aggregate(cases, top_k: int) -> dict:
+    """Counts, histogram, label metrics and the `top_k` highest-risk rows."""
+    agg = dict(n=0, malignant=0, ood=0, uncertain=0, risk_sum=0.0,
+               hist=np.zeros(HIST_BINS, dtype=np.int64), labelled=True,
+               tp=0, fp=0, tn=0, fn=0, brier_sum=0.0)
+    top = None
+    for start, X, y in _chunks(cases):
+        s = _score(start, X, y)
+        p = s["p_malignant"]
+        agg["n"] += len(p)
+        agg["malignant"] += int(s["malignant"].sum())
+        agg["ood"] += int(s["ood"].sum())
+        if "ens_lo" in s:
+            agg["uncertain"] += int(((s["ens_lo"] < 0.5) & (s["ens_hi"] >= 0.5)).sum())
+        else:
+            agg["uncertain"] = None
+        agg["risk_sum"] += float(p.sum())
+        agg["hist"] += np.histogram(p, bins=HIST_BINS, range=(0.0, 1.0))[0]
+        if y is None:
+            agg["labelled"] = False
+        elif agg["labelled"]:
+            actual = y == 0                     # 0 = malignant
+            pred = s["malignant"].astype(bool)
+            agg["tp"] += int((pred & actual).sum())
+            agg["fp"] += int((pred & ~actual).sum())
+            agg["tn"] += int((~pred & ~actual).sum())
+            agg["fn"] += int((~pred & actual).sum())
+            agg["brier_sum"] += float(((p - actual) ** 2).sum())
+
+        # Bounded top-k: keep this chunk's best k, merge, cut back to k
+        keep = np.argpartition(-p, top_k - 1)[:top_k] if len(p) > top_k else slice(None)
+        cand = {k: v[keep] for k, v in s.items()}
+        if top is not None:
+            cand = {k: np.concatenate([top[k], cand[k]]) for k in top if k in cand}
+        order = np.argsort(-cand["p_malignant"], kind="stable")[:top_k]
+        top = {k: v[order] for k, v in cand.items()}
+    agg["top"] = top
+    agg["labelled"] = agg["labelled"] and agg["n"] > 0
+    return agg
+
+
+# ── Table ────────────────────────────────────────────────────────────────────
+
+def _columns(lang: str, labelled: bool) -> list[tuple[str, float, str]]:
+    """(title, width mm, align) per table column."""
+    cols = [
+        (t("batch_col_row", lang), 12, "R"),
+        (t("batch_col_risk", lang), 18, "R"),
+        (t("cohort_col_interval", lang, pct=round(INTERVAL * 100)), 24, "R"),
+        (t("cohort_col_calibrated", lang), 18, "R"),
+        (t("batch_col_class", lang), 20, "L"),
+        (t("batch_col_ood", lang), 18, "R"),
+    ] + [(FULL_LABELS[lang][i], 16, "R") for i in FEATURES]
+    if labelled:
+        cols.append((t("cohort_col_label", lang), 16, "L"))
+    return cols
+
+
+class CohortPDF(ReportPDF):
+    """Report document with a running footer and a streaming row writer."""
+
+    def __init__(self, lang: str, labelled: bool):
+        super().__init__()
+        self.lang = lang
+        self.columns = _columns(lang, labelled)
+        self.classes = (t("benign", lang), t("malignant", lang))
+        self._glyphs: dict[str, tuple[float, str]] = {}    # per character, in the table font
+        self._stripe = False
+        self._header: list[tuple[float, float, str]] | None = None
+        self._table_w = sum(w for _, w, _ in self.columns)
+        self.set_auto_page_break(auto=True, margin=15)
+
+    def footer(self) -> None:
+        self.set_y(-12)
+        self.set_font(self.text_font, "", 7)
+        self.set_text_color(150, 150, 150)
+        self.cell(0, 5, f"{t('cohort_title', self.lang)}  -  {date.today().isoformat()}")
+        self.set_x(self.l_margin)
+        self.cell(0, 5, t("cohort_page", self.lang, n=self.page_no()) + " / {nb}", align="R")
+
+    def _encode(self, text: str) -> tuple[float, str]:
+        """Width and content-stream text operator for `text` in the table font.
+
+        Both are built from per-character entries cached on first use; the
+        font encodes and escapes each character independently, so joining
+        the pieces gives the same bytes as `encode_text` on the whole string.
+        """
+        w, parts = 0.0, []
+        for ch in text:
+            glyph = self._glyphs.get(ch)
+            if glyph is None:
+                glyph = self._glyphs[ch] = (self.get_string_width(ch),
+                                            self.current_font.encode_text(ch)[1:-4])
+            w += glyph[0]
+            parts.append(glyph[1])
+        return w, f"({''.join(parts)}) Tj"
+
+    def table_header(self) -> None:
+        """Column titles at the current position; wrapped once, then reused."""
+        x, y = self.l_margin, self.get_y()
+        self.set_fill_color(230, 236, 242)
+        self.rect(x, y, self._table_w, HEADER_H, style="F")
+        self.set_font(self.text_font, "B", TABLE_FONT - 0.5)
+        self.set_text_color(30, 41, 59)
+        if self._header is None:
+            self._header, left = [], 0.0
+            for title, w, align in self.columns:
+                lines = self.multi_cell(w - 2, 2.6, _safe(title), dry_run=True, output="LINES")
+                for i, line in enumerate(lines[:3]):
+                    dx = w - 1 - self.get_string_width(line) if align == "R" else 1
+                    self._header.append((left + dx, 2.5 + 2.6 * i, line))
+                left += w
+        for dx, dy, line in self._header:
+            self.text(x + dx, y + dy, line)
+        self.set_xy(self.l_margin, y + HEADER_H)
+        self.set_font(self.text_font, "", TABLE_FONT)
+
+    def _row(self, y: float, cells: list[str], stripe: bool) -> None:
+        """Emit one table row as a single content-stream operation.
+
+        Equivalent to a filled `rect` plus one `text` call per cell, but
+        formats the row once instead of once per cell.  Expects the table
+        font to be set.
+        """
+        if not FPDF_INTERNALS:
+            self._row_cells(y, cells, stripe)
+            return
+        if not self.current_font_is_set_on_page:
+            self._out(self._set_font_for_page(self.current_font, self.font_size_pt))
+        k = self.k
+        top, base = (self.h - y) * k, (self.h - y - ROW_H + 0.9) * k
+        ops = ["q"]
+        if stripe:
+            ops.append(f"{_STRIPE} rg {self.l_margin * k:.2f} {top - ROW_H * k:.2f} "
+                       f"{self._table_w * k:.2f} {ROW_H * k:.2f} re f")
+        ops.append(f"{_INK} rg BT")
+        x = self.l_margin
+        for text, (_, w, align) in zip(cells, self.columns):
+            width, op = self._encode(text)
+            tx = x + w - 1 - width if align == "R" else x + 1
+            ops.append(f"1 0 0 1 {tx * k:.2f} {base:.2f} Tm {op}")
+            x += w
+        ops.append("ET Q")
+        self._out(" ".join(ops))
+
+    def _row_cells(self, y: float, cells: list[str], stripe: bool) -> None:
+        """`_row` through the public drawing calls, for other fpdf2 versions."""
+        if stripe:
+            self.set_fill_color(245, 247, 250)
+            self.rect(self.l_margin, y, self._table_w, ROW_H, style="F")
+        self.set_text_color(55, 65, 81)
+        x = self.l_margin
+        for text, (_, w, align) in zip(cells, self.columns):
+            tx = x + w - 1 - self.get_string_width(text) if align == "R" else x + 1
+            self.text(tx, y + ROW_H - 0.9, text)
+            x += w
+
+    def table_rows(self, s: dict) -> None:
+        """Write one table row per case in the scored chunk `s`, breaking
+        pages (and repeating the column titles) as needed."""
+        bottom = self.h - self.b_margin
+        y = self.get_y()
+        classes = self.classes
+        labels = s["label"].tolist() if "label" in s else None
+        # Intervals are missing when the ensemble failed its coverage check
+        if "ens_lo" in s:
+            lows, highs = s["ens_lo"].tolist(), s["ens_hi"].tolist()
+        else:
+            lows = highs = [None] * len(s["row"])
+        cols = zip(s["row"].tolist(), s["p_malignant"].tolist(), lows, highs,
+                   s["p_calibrated"].tolist(), s["malignant"].tolist(),
+                   s["ood_distance"].tolist(), s["ood"].tolist(), s["X"].tolist())
+        for i, (row, p, lo, hi, cal, mal, dist, ood, feats) in enumerate(cols):
+            if y + ROW_H > bottom:
+                self.add_page()
+                self.table_header()
+                y = self.get_y()
+            interval = "-" if lo is None else f"{lo * 100:.1f} - {hi * 100:.1f}"
+            cells = [f"{row + 1:,}", f"{p * 100:.2f}", interval,
+                     f"{cal * 100:.2f}", classes[mal], f"{dist:.2f}{' !' if ood else ''}"]
+            cells += [f"{v:.4g}" for v in feats]
+            if labels is not None:
+                cells.append(classes[labels[i] == 0])
+            self._stripe = not self._stripe
+            self._row(y, cells, self._stripe)
+            y += ROW_H
+        self.set_y(y)
+
+
+# ── Summary page ─────────────────────────────────────────────────────────────
+
+def _metric_rows(agg: dict, lang: str) -> list[tuple[str, str]]:
+    n = max(agg["n"], 1)
+    rows = [
+        (t("batch_cases", lang), f"{agg['n']:,}"),
+        (t("batch_malignant", lang), f"{agg['malignant']:,} ({agg['malignant'] / n:.1%})"),
+        (t("cohort_mean_risk", lang), f"{agg['risk_sum'] / n:.1%}"),
+        (t("cohort_uncertain", lang, pct=round(INTERVAL * 100)),
+         "-" if agg["uncertain"] is None else f"{agg['uncertain']:,} ({agg['uncertain'] / n:.1%})"),
+        (t("batch_ood", lang), f"{agg['ood']:,} ({agg['ood'] / n:.1%})"),
+    ]
+    if agg["labelled"]:
+        tp, fp, tn, fn = agg["tp"], agg["fp"], agg["tn"], agg["fn"]
+        rows += [
+            (t("cohort_accuracy", lang), f"{(tp + tn) / n:.1%}"),
+            (t("cohort_sensitivity", lang), f"{tp / max(tp + fn, 1):.1%}"),
+            (t("cohort_specificity", lang), f"{tn / max(tn + fp, 1):.1%}"),
+            (t("cohort_brier", lang), f"{agg['brier_sum'] / n:.4f}"),
+        ]
+    return rows
+
+
+def _summary(pdf: CohortPDF, agg: dict, lang: str) -> None:
+    pdf.set_font(pdf.text_font, "B", 18)
+    pdf.set_text_color(30, 41, 59)
+    pdf.cell(0, 11, t("cohort_title", lang), new_x="LMARGIN", new_y="NEXT", align="C")
+    pdf.set_font(pdf.text_font, "", 9)
+    pdf.set_text_color(120, 120, 120)
+    pdf.cell(0, 5, f"{t('pdf_date', lang)}: {date.today().isoformat()}",
+             new_x="LMARGIN", new_y="NEXT", align="C")
+    pdf.ln(4)
+
+    # Metrics in two columns
+    _section_heading(pdf, t("cohort_metrics", lang))
+    rows = _metric_rows(agg, lang)
+    half = (pdf.w - pdf.l_margin - pdf.r_margin) / 2
+    top = pdf.get_y()
+    per_col = -(-len(rows) // 2)
+    for i, (label, value) in enumerate(rows):
+        pdf.set_xy(pdf.l_margin + half * (i // per_col), top + 5.5 * (i % per_col))
+        pdf.set_font(pdf.text_font, "", 9)
+        pdf.set_text_color(55, 65, 81)
+        pdf.cell(half * 0.6, 5.5, label)
+        pdf.set_font(pdf.text_font, "B", 9)
+        pdf.set_text_color(30, 41, 59)
+        pdf.cell(half * 0.35, 5.5, value, align="R")
+    pdf.set_xy(pdf.l_margin, top + 5.5 * per_col + 4)
+
+    # Class distribution and score histogram side by side
+    top = pdf.get_y()
+    _sub_heading(pdf, t("cohort_distribution", lang))
+    split = [(t("predicted", lang), agg["n"] - agg["malignant"], agg["malignant"])]
+    if agg["labelled"]:
+        actual = agg["tp"] + agg["fn"]
+        split.append((t("actual", lang), agg["n"] - actual, actual))
+    draw_class_split(pdf, pdf.l_margin, top + 9, half - 8, split, lang)
+    pdf.set_xy(pdf.l_margin + half, top)
+    _sub_heading(pdf, t("cohort_histogram", lang))
+    draw_histogram(pdf, pdf.l_margin + half, top + 9, half - 10, 36, agg["hist"])
+    pdf.set_xy(pdf.l_margin, top + 50)
+
+    # Highest-risk cases
+    _section_heading(pdf, t("cohort_top", lang, k=len(agg["top"]["row"]) if agg["top"] else 0))
+    if agg["top"] is not None:
+        pdf.table_header()
+        pdf.table_rows(agg["top"])
+
+
+# ── Generator ────────────────────────────────────────────────────────────────
+
+def generate_cohort_pdf(lang: str, cases, labels=None, top_k: int = TOP_K,
+                        chunk_size: int = CHUNK_SIZE) -> bytes:
+    """Build the cohort report and return raw PDF bytes.
+
+    `cases` is an (N, 30) array (a memmap works) with optional `labels`
+    (0 = malignant, 1 = benign), or a zero-argument callable returning an
+    iterable of X or (X, y) chunks, such as
+    `lambda: synthetic.generate_cohort(n)`.  It is read twice.
+    """
+    if not callable(cases):
+        cases = array_chunks(cases, labels, chunk_size)
+    agg = _aggregate(cases, top_k)
+
+    pdf = CohortPDF(lang, agg["labelled"])
+    pdf.add_page()
+    _summary(pdf, agg, lang)
+
+    pdf.add_page()
+    _section_heading(pdf, t("cohort_table", lang))
+    pdf.table_header()
+    for start, X, y in _chunks(cases):
+        pdf.table_rows(_score(start, X, y if agg["labelled"] else None))
+
+    pdf.ln(4)
+    pdf.set_font(pdf.text_font, "I", 7)
+    pdf.set_text_color(120, 120, 120)
+    pdf.multi_cell(0, 4, _safe(t("disclaimer", lang)))
+    return bytes(pdf.output())
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Write a cohort summary PDF for a file of cases.")
+    ap.add_argument("input", help="CSV or .npy file with 30 feature columns "
+                                  "(labels are read from <name>.labels.npy if present)")
+    ap.add_argument("-o", "--output", required=True, help="output PDF")
+    ap.add_argument("--lang", choices=("en", "vi"), default="en")
+    ap.add_argument("--top", type=int, default=TOP_K, help="highest-risk cases to list")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    try:
+        if args.input.lower().endswith(".npy"):
+            X = np.load(args.input, mmap_mode="r")
+            if X.ndim != 2:
+                check_cases(X)                  # raises with the file's shape
+            for start in range(0, len(X), CHUNK_SIZE):    # never reads the memmap whole
+                check_cases(X[start:start + CHUNK_SIZE], start)
+        else:
+            X = read_cases(args.input)
+        labels = labels_path(args.input)
+        y = np.load(labels, mmap_mode="r") if labels.exists() else None
+        if y is not None and y.shape != (len(X),):
+            raise ValueError(f"{labels} holds {y.shape} labels for {len(X):,} cases")
+    except (OSError, ValueError) as exc:
+        sys.exit(str(exc))
+    data = generate_cohort_pdf(args.lang, X, y, top_k=args.top)
+    with open(args.output, "wb") as fh:
+        fh.write(data)
+    print(f"wrote {len(X):,} cases to {args.output} ({len(data) / 1e6:.1f} MB) "
+          f"in {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
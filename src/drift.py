@@ -0,0 +1,284 @@
+"""
+Streaming feature-drift monitor built from mergeable, constant-memory sketches.
+
+`DriftSketch` keeps, for every scored case:
+  - running count / mean / M2 per feature (Chan et al. parallel update)
+  - a binned quantile sketch per feature on edges taken from the reference
+    population's quantiles (every reference bin holds ~1/BINS of its mass)
+  - a fixed histogram of malignancy scores
+
+All parts merge by addition, so sketches from several processes combine
+exactly.  Drift statistics compare the sketch with the reference data:
+PSI and a binned Kolmogorov-Smirnov distance per feature, plus PSI of the
+score distribution.
+
+`DriftMonitor` wraps a sketch for one server process and periodically saves
+it as `drift-<pid>.npz` under `BCR_DRIFT_DIR` (default `./drift`), and once
+more at exit; readers merge the shared file and those of live servers,
+under the same lock that folding takes.  Finished runs are
+folded into the single `drift-shared.npz`: command-line runs add their cases
+to it directly, and a starting server folds in the files left by processes
+that have exited, so the directory holds one file per live server plus one.
+"""
+
+import atexit
+import contextlib
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+from .model import FEAT_MEAN, FEAT_STD, load_reference, predict_batch
+from .procs import pid_alive
+
+BINS = 20
+SCORE_BINS = 20
+PSI_MODERATE, PSI_MAJOR = 0.1, 0.25
+_EPS = 1e-4     # floor for empty bins in the PSI log-ratio
+SHARED = "drift-shared.npz"     # sketches of finished runs, folded together
+LOCK_TIMEOUT = 10.0             # seconds before a leftover lock file is broken
+
+
+@st.cache_resource
+def drift_reference() -> dict:
+    """Bin edges and reference bin proportions for features and scores."""
+    X, _ = load_reference()
+    qs = np.linspace(0, 1, BINS + 1)[1:-1]
+    edges = np.quantile(X, qs, axis=0).T                      # (30, BINS - 1)
+    score_edges = np.linspace(0, 1, SCORE_BINS + 1)[1:-1]
+    ref = DriftSketch(edges, score_edges)
+    ref.update(X, 1.0 - predict_batch(X))
+    return dict(edges=edges, score_edges=score_edges, sketch=ref)
+
+
+class DriftSketch:
+    """Mergeable per-feature moments, binned quantiles and score histogram."""
+
+    def __init__(self, edges: np.ndarray, score_edges: np.ndarray):
+        self.edges = edges
+        self.score_edges = score_edges
+        n_feat = edges.shape[0]
+        self.n = 0
+        self.mean = np.zeros(n_feat)
+        self.m2 = np.zeros(n_feat)
+        self.counts = np.zeros((n_feat, edges.shape[1] + 1), dtype=np.int64)
+        self.score_counts = np.zeros(len(score_edges) + 1, dtype=np.int64)
+
+    # ── Updates ──────────────────────────────────────────────────────────────
+
+    def update(self, X, p_malignant) -> None:
+        """Add an (N, 30) batch and its malignancy scores."""
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        n_feat, n_bins = self.counts.shape
+        bins = np.empty(X.shape, dtype=np.intp)                 # (N, 30)
+        for j, edges in enumerate(self.edges):
+            bins[:, j] = np.searchsorted(edges, X[:, j])        # edges strictly below x
+        flat = (bins + np.arange(n_feat) * n_bins).ravel()
+        self.counts += np.bincount(flat, minlength=n_feat * n_bins).reshape(n_feat, n_bins)
+        self.score_counts += np.bincount(
+            np.searchsorted(self.score_edges, np.atleast_1d(p_malignant)),
+            minlength=len(self.score_counts))
+        self._merge_moments(len(X), X.mean(axis=0),
+                            ((X - X.mean(axis=0)) ** 2).sum(axis=0))
+
+    def merge(self, other: "DriftSketch") -> "DriftSketch":
+        """Fold another sketch (same edges) into this one; returns self."""
+        self.counts += other.counts
+        self.score_counts += other.score_counts
+        self._merge_moments(other.n, other.mean, other.m2)
+        return self
+
+    def _merge_moments(self, n_b: int, mean_b, m2_b) -> None:
+        if n_b == 0:
+            return
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean = self.mean + delta * n_b / n
+        self.m2 = self.m2 + m2_b + delta ** 2 * self.n * n_b / n
+        self.n = n
+
+    # ── Persistence ──────────────────────────────────────────────────────────
+
+    def save(self, path) -> None:
+        tmp = Path(path).with_suffix(".tmp.npz")
+        np.savez(tmp, edges=self.edges, score_edges=self.score_edges,
+                 n=self.n, mean=self.mean, m2=self.m2, counts=self.counts,
+                 score_counts=self.score_counts)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path) -> "DriftSketch":
+        with np.load(path) as z:
+            sk = cls(z["edges"], z["score_edges"])
+            sk.n = int(z["n"])
+            sk.mean, sk.m2 = z["mean"], z["m2"]
+            sk.counts, sk.score_counts = z["counts"], z["score_counts"]
+        return sk
+
+    # ── Read-outs ────────────────────────────────────────────────────────────
+
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.m2 / max(self.n - 1, 1))
+
+    def quantile(self, q: float) -> np.ndarray:
+        """Approximate per-feature quantile by interpolating inside bins."""
+        cdf = np.cumsum(self.counts, axis=1) / max(self.n, 1)
+        lo = np.concatenate([self.edges[:, :1], self.edges], axis=1)
+        hi = np.concatenate([self.edges, self.edges[:, -1:]], axis=1)
+        b = (cdf < q).sum(axis=1).clip(max=self.counts.shape[1] - 1)
+        rows = np.arange(len(b))
+        prev = np.where(b > 0, cdf[rows, b - 1], 0.0)
+        frac = (q - prev) / np.maximum(cdf[rows, b] - prev, 1e-12)
+        return lo[rows, b] + frac.clip(0, 1) * (hi[rows, b] - lo[rows, b])
+
+
+def _psi(obs: np.ndarray, ref: np.ndarray) -> np.ndarray:
+    """Population stability index along the last axis of count arrays."""
+    po = np.maximum(obs / np.maximum(obs.sum(axis=-1, keepdims=True), 1), _EPS)
+    pr = np.maximum(ref / ref.sum(axis=-1, keepdims=True), _EPS)
+    return ((po - pr) * np.log(po / pr)).sum(axis=-1)
+
+
+def drift_stats(sketch: DriftSketch) -> dict:
+    """PSI / binned KS per feature and score PSI against the reference."""
+    ref = drift_reference()["sketch"]
+    cdf = lambda c: np.cumsum(c, axis=-1) / np.maximum(c.sum(axis=-1, keepdims=True), 1)
+    return dict(
+        n=sketch.n,
+        psi=_psi(sketch.counts, ref.counts),
+        ks=np.abs(cdf(sketch.counts) - cdf(ref.counts)).max(axis=1),
+        mean_shift=(sketch.mean - FEAT_MEAN) / FEAT_STD,
+        score_psi=float(_psi(sketch.score_counts, ref.score_counts)),
+    )
+
+
+@contextlib.contextmanager
+def _shared_lock(directory: Path):
+    """Exclusive lock for a read-merge-write of the shared sketch."""
+    lock = directory / f"{SHARED}.lock"
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while True:
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            if time.monotonic() < deadline:
+                time.sleep(0.05)
+                continue
+            lock.unlink(missing_ok=True)        # left by a process that died holding it
+            deadline = time.monotonic() + LOCK_TIMEOUT
+    try:
+        yield
+    finally:
+        os.close(fd)
+        lock.unlink(missing_ok=True)
+
+
+def fold_shared(directory, sketch: DriftSketch | None = None) -> None:
+    """Merge `sketch` and the files of exited processes into the shared sketch."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    shared = directory / SHARED
+    with _shared_lock(directory):
+        stale = [path for path in directory.glob("drift-*.npz")
+                 if path.stem.removeprefix("drift-").isdigit()
+                 and not pid_alive(int(path.stem.removeprefix("drift-")))]
+        if sketch is None and not stale:
+            return
+        if shared.exists():
+            total = DriftSketch.load(shared)
+        else:
+            ref = drift_reference()
+            total = DriftSketch(ref["edges"], ref["score_edges"])
+        for path in stale:
+            total.merge(DriftSketch.load(path))
+        if sketch is not None:
+            total.merge(sketch)
+        total.save(shared)
+        for path in stale:
+            path.unlink(missing_ok=True)
+
+
+def record_run(X, p_malignant, directory=None) -> None:
+    """Add the cases of a finished command-line run to the shared sketch."""
+    ref = drift_reference()
+    sketch = DriftSketch(ref["edges"], ref["score_edges"])
+    sketch.update(X, p_malignant)
+    fold_shared(directory or os.environ.get("BCR_DRIFT_DIR", "drift"), sketch)
+
+
+class DriftMonitor:
+    """Thread-safe per-process sketch that is saved for cross-process merging."""
+
+    def __init__(self, directory, save_every: float = 30.0):
+        ref = drift_reference()
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / f"drift-{os.getpid()}.npz"
+        self.save_every = save_every
+        fold_shared(self.directory)
+        self.sketch = (DriftSketch.load(self.path) if self.path.exists()
+                       else DriftSketch(ref["edges"], ref["score_edges"]))
+        self._lock = threading.Lock()
+        self._saved = time.monotonic()
+        self._dirty = False
+
+    def record(self, X, p_malignant) -> None:
+        """Add scored cases; persists the sketch at most every `save_every` s."""
+        with self._lock:
+            self.sketch.update(X, p_malignant)
+            self._dirty = True
+            if time.monotonic() - self._saved >= self.save_every:
+                self._save()
+
+    def flush(self) -> None:
+        """Save any cases recorded since the last save."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _save(self) -> None:
+        self.sketch.save(self.path)
+        self._saved = time.monotonic()
+        self._dirty = False
+
+    def combined(self) -> DriftSketch:
+        """This process's live sketch merged with the shared file and every
+        other live process's file.
+
+        Read under the shared lock, so a concurrent `fold_shared` cannot
+        remove a file mid-read or have its cases counted twice; files of
+        exited processes are left to `fold_shared`.
+        """
+        ref = drift_reference()
+        total = DriftSketch(ref["edges"], ref["score_edges"])
+        with _shared_lock(self.directory):
+            for path in self.directory.glob("drift-*.npz"):
+                if path == self.path or path.name.endswith(".tmp.npz"):
+                    continue
+                pid = path.stem.removeprefix("drift-")
+                if pid.isdigit() and not pid_alive(int(pid)):
+                    continue
+                try:
+                    total.merge(DriftSketch.load(path))
+                except FileNotFoundError:
+                    pass
+        with self._lock:
+            return total.merge(self.sketch)
+
+
+@st.cache_resource
+def drift_monitor() -> DriftMonitor:
+    """Process-wide drift monitor shared by every Streamlit session."""
+    monitor = DriftMonitor(os.environ.get("BCR_DRIFT_DIR", "drift"))
+    atexit.register(monitor.flush)
+    return monitor
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def current_drift() -> dict:
+    """Drift statistics over all processes, recomputed at most once a minute."""
+    return drift_stats(drift_monitor().combined())
@@ -0,0 +1,163 @@
+"""
+Bootstrap weight ensemble for model-uncertainty intervals.
+
+`K` logistic regressions are refitted on bootstrap resamples of the
+reference data, all K at once.  Each minimises the log-loss with the same
+ridge penalty as the shipped `W` / `BIAS` (the reference data is close to
+separable, so without it the weights never settle) and is run from the
+shipped weights with Newton steps until its gradient falls below `TOL`.
+The fitted models are folded into raw-feature space and stacked into a
+(30, K) coefficient matrix, so scoring N cases is a single (N, 30) x (30, K)
+product; the median and interval are taken on the logits and only those
+three columns pass through the sigmoid.
+
+`interval_check` scores the reference cases once and reports how many of
+them have the shipped model's estimate inside their own interval; the app
+and bulk scoring only show intervals when that share reaches
+`MIN_COVERAGE`.
+
+K = 64 keeps a single case well under a millisecond and 10 000 cases in the
+low tens of milliseconds (`python -m src.ensemble` prints the timings), while
+the 5% / 95% quantiles of 64 draws are stable to about a percentage point.
+
+Usage:
+    python -m src.ensemble          # interval check and latency benchmark for several K
+"""
+
+import argparse
+import time
+
+import numpy as np
+import streamlit as st
+
+from .model import BIAS, FEAT_MEAN, FEAT_STD, W, load_reference, predict_batch, sigmoid
+
+K = 64
+SEED = 0
+L2 = 2.0               # ridge strength on the summed log-loss, matching the shipped W
+TOL = 1e-8             # largest absolute gradient entry at convergence
+MAX_ITER = 50          # Newton steps; a warm start converges in under ten
+INTERVAL = 0.90        # central credible interval reported per case
+MIN_COVERAGE = 0.95    # share of reference estimates that must fall inside their interval
+
+
+def fit_ensemble(k: int = K, seed: int = SEED, l2: float = L2, tol: float = TOL,
+                 max_iter: int = MAX_ITER) -> tuple[np.ndarray, np.ndarray]:
+    """Refit `k` bootstrap models; returns folded (30, k) coefficients and (k,) intercepts.
+
+    Raises RuntimeError if a model has not converged after `max_iter` steps.
+    """
+    X, y = load_reference()
+    n = len(y)
+    Z = np.hstack([(X - FEAT_MEAN) / FEAT_STD, np.ones((n, 1))])    # (n, 31), bias last
+    rng = np.random.default_rng(seed)
+    # Bootstrap resamples as per-row multiplicity weights, one row per model
+    counts = rng.multinomial(n, np.full(n, 1.0 / n), size=k).T / n  # (n, k)
+    penalty = np.full(Z.shape[1], l2 / n)
+    penalty[-1] = 0.0                                               # intercept is not shrunk
+
+    def objective(theta):                                           # (k,) penalised loss
+        z = Z @ theta.T
+        return ((np.logaddexp(0.0, z) - y[:, None] * z) * counts).sum(axis=0) \
+            + 0.5 * (penalty * theta ** 2).sum(axis=1)
+
+    theta = np.tile(np.append(W, BIAS), (k, 1))                     # (k, 31)
+    loss = objective(theta)
+    for _ in range(max_iter):
+        p = sigmoid(Z @ theta.T)                                   # (n, k)
+        grad = ((p - y[:, None]) * counts).T @ Z + penalty * theta
+        if np.abs(grad).max() < tol:
+            break
+        hess = np.einsum("nk,ni,nj->kij", p * (1 - p) * counts, Z, Z) + np.diag(penalty)
+        step = np.linalg.solve(hess, grad[..., None])[..., 0]
+        # Halve the step for any model whose loss would go up
+        scale = np.ones(k)
+        for _ in range(30):
+            trial = theta - scale[:, None] * step
+            new_loss = objective(trial)
+            worse = new_loss > loss
+            if not worse.any():
+                break
+            scale[worse] /= 2
+        theta, loss = trial, new_loss
+    else:
+        raise RuntimeError(f"bootstrap refits did not converge in {max_iter} steps "
+                           f"(max gradient {np.abs(grad).max():.2e})")
+
+    coef = (theta[:, :-1] / FEAT_STD).T                             # (30, k)
+    intercept = theta[:, -1] - FEAT_MEAN @ coef
+    return coef, intercept
+
+
+@st.cache_resource
+def ensemble_weights() -> tuple[np.ndarray, np.ndarray]:
+    """Process-wide ensemble, fitted once with the fixed seed."""
+    coef, intercept = fit_ensemble()
+    coef.flags.writeable = False
+    intercept.flags.writeable = False
+    return coef, intercept
+
+
+def ensemble_predict(X, interval: float = INTERVAL) -> dict:
+    """Median P(benign) and a central `interval` band over the ensemble.
+
+    Returns arrays `p_benign`, `p_lo`, `p_hi` (all P(benign)) with one entry
+    per row of the (N, 30) input.
+    """
+    coef, intercept = ensemble_weights()
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    z = X @ coef + intercept                                        # (N, K)
+    tail = (1.0 - interval) / 2
+    lo, med, hi = np.quantile(z, [tail, 0.5, 1.0 - tail], axis=1)
+    return dict(p_benign=sigmoid(med), p_lo=sigmoid(lo), p_hi=sigmoid(hi))
+
+
+@st.cache_resource
+def interval_check(interval: float = INTERVAL) -> dict:
+    """Share of reference cases whose point estimate lies inside its own interval.
+
+    `ok` is True when that share reaches `MIN_COVERAGE`; callers show the
+    ensemble interval only then.
+    """
+    X, _ = load_reference()
+    p = predict_batch(X)
+    ens = ensemble_predict(X, interval)
+    inside = (p >= ens["p_lo"]) & (p <= ens["p_hi"])
+    coverage = float(inside.mean())
+    return dict(coverage=coverage, ok=coverage >= MIN_COVERAGE)
+
+
+def benchmark(ks=(16, 32, 64, 128, 256), sizes=(1, 10_000), repeat: int = 20) -> list[dict]:
+    """Best-of-`repeat` scoring latency for each ensemble size and batch size."""
+    X, _ = load_reference()
+    rng = np.random.default_rng(SEED)
+    rows = []
+    for k in ks:
+        coef, intercept = fit_ensemble(k)
+        for n in sizes:
+            Xn = X[rng.integers(0, len(X), n)]
+            best = float("inf")
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                z = Xn @ coef + intercept
+                sigmoid(np.quantile(z, [0.05, 0.5, 0.95], axis=1))
+                best = min(best, time.perf_counter() - t0)
+            rows.append(dict(k=k, n=n, ms=best * 1e3))
+    return rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Check ensemble intervals and benchmark scoring latency.")
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    check = interval_check()
+    print(f"reference estimates inside their {INTERVAL:.0%} interval: {check['coverage']:.1%} "
+          f"({'ok' if check['ok'] else f'below {MIN_COVERAGE:.0%}, intervals hidden'})\n")
+    print(f"{'K':>5} {'rows':>7} {'ms':>9}")
+    for r in benchmark(repeat=args.repeat):
+        print(f"{r['k']:>5} {r['n']:>7} {r['ms']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Compact model artifacts and a precision drift report.
+
+Formats:
+  - `.npz` in float64 / float32 / float16
+  - `.bin`: flat little-endian binary with a fixed header (layout below)
+
+Either format can store the raw parameters (weights, bias, mean, std) or the
+folded form (coef, intercept) where standardisation is absorbed so scoring
+is a single affine step.
+
+Binary layout (little-endian):
+    magic     4s   b"BCLR"
+    version   u16  format version (1)
+    dtype     u8   1=float16, 2=float32, 3=float64
+    flags     u8   bit 0: folded
+    n         u16  number of features
+    model     12s  MODEL_VERSION, ASCII
+    payload        folded: coef[n], intercept
+                   raw:    w[n], bias, mean[n], std[n]
+
+Usage:
+    python -m src.export out_dir       # write every format and print the drift report
+"""
+
+import argparse
+import io
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from .model import (
+    W, BIAS, FEAT_MEAN, FEAT_STD, MODEL_VERSION,
+    folded_coefficients, load_reference, predict_batch, sigmoid,
+)
+
+DTYPES = ("float64", "float32", "float16")
+
+_MAGIC = b"BCLR"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHBBH12s")
+_DTYPE_CODES = {"float16": 1, "float32": 2, "float64": 3}
+
+
+# ── Parameter sets ───────────────────────────────────────────────────────────
+
+def model_params(dtype: str = "float64", fold: bool = False) -> dict:
+    """Return the model parameters cast to `dtype`, optionally folded."""
+    if fold:
+        coef, intercept = folded_coefficients()
+        arrays = dict(coef=coef, intercept=np.array([intercept]))
+    else:
+        arrays = dict(w=W, bias=np.array([BIAS]), mean=FEAT_MEAN, std=FEAT_STD)
+    return {k: v.astype(dtype) for k, v in arrays.items()}
+
+
+def score(params: dict, X) -> np.ndarray:
+    """Return P(benign) for (N, 30) X, computed in the parameters' precision."""
+    dtype = next(iter(params.values())).dtype
+    X = np.atleast_2d(np.asarray(X)).astype(dtype)
+    if "coef" in params:
+        z = X @ params["coef"] + params["intercept"][0]
+    else:
+        z = ((X - params["mean"]) / params["std"]) @ params["w"] + params["bias"][0]
+    return sigmoid(z.astype(np.float64))
+
+
+# ── Writers / loaders ────────────────────────────────────────────────────────
+
+def save_npz(dest, dtype: str = "float64", fold: bool = False) -> None:
+    """Write an `.npz` artifact to a path or binary stream."""
+    np.savez(dest, model_version=np.array(MODEL_VERSION),
+             **model_params(dtype, fold))
+
+
+def save_bin(dest, dtype: str = "float64", fold: bool = False) -> None:
+    """Write a flat little-endian binary artifact to a path or binary stream."""
+    params = model_params(dtype, fold)
+    header = _HEADER.pack(_MAGIC, _FORMAT_VERSION, _DTYPE_CODES[dtype],
+                          int(fold), len(W), MODEL_VERSION.encode("ascii"))
+    payload = b"".join(a.astype(a.dtype.newbyteorder("<")).tobytes()
+                       for a in params.values())
+    if isinstance(dest, (str, Path)):
+        Path(dest).write_bytes(header + payload)
+    else:
+        dest.write(header + payload)
+
+
+def load_model(path) -> dict:
+    """Load either artifact format; returns a parameter dict usable by `score`."""
+    path = Path(path)
+    if path.suffix == ".npz":
+        with np.load(path) as z:
+            return {k: z[k] for k in z.files if k != "model_version"}
+
+    raw = path.read_bytes()
+    magic, version, code, flags, n, _model = _HEADER.unpack_from(raw)
+    if magic != _MAGIC or version != _FORMAT_VERSION:
+        raise ValueError(f"{path} is not a v{_FORMAT_VERSION} model artifact")
+    dtype = np.dtype({v: k for k, v in _DTYPE_CODES.items()}[code]).newbyteorder("<")
+    names = (("coef", n), ("intercept", 1)) if flags & 1 else \
+            (("w", n), ("bias", 1), ("mean", n), ("std", n))
+    params, offset = {}, _HEADER.size
+    for name, count in names:
+        params[name] = np.frombuffer(raw, dtype, count, offset).astype(dtype.newbyteorder("="))
+        offset += count * dtype.itemsize
+    return params
+
+
+# ── Drift report ─────────────────────────────────────────────────────────────
+
+def drift_report() -> list[dict]:
+    """Compare every precision / folding combination with the float64 model
+    over the reference data: artifact sizes, max |dP| and classification flips."""
+    X, _ = load_reference()
+    ref = predict_batch(X)
+    rows = []
+    for dtype in DTYPES:
+        for fold in (False, True):
+            npz, binf = io.BytesIO(), io.BytesIO()
+            save_npz(npz, dtype, fold)
+            save_bin(binf, dtype, fold)
+            p = score(model_params(dtype, fold), X)
+            rows.append(dict(
+                dtype=dtype, folded=fold,
+                npz_bytes=npz.getbuffer().nbytes, bin_bytes=binf.getbuffer().nbytes,
+                max_dev=float(np.abs(p - ref).max()),
+                flips=int(((p >= 0.5) != (ref >= 0.5)).sum()),
+            ))
+    return rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Export compact model artifacts.")
+    ap.add_argument("out_dir", type=Path)
+    args = ap.parse_args(argv)
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    for dtype in DTYPES:
+        for fold in (False, True):
+            stem = f"model_{dtype}{'_folded' if fold else ''}"
+            save_npz(args.out_dir / f"{stem}.npz", dtype, fold)
+            save_bin(args.out_dir / f"{stem}.bin", dtype, fold)
+
+    print(f"{'dtype':<8} {'folded':<7} {'npz':>6} {'bin':>5} {'max |dP|':>10} {'flips':>5}")
+    for r in drift_report():
+        print(f"{r['dtype']:<8} {str(r['folded']):<7} {r['npz_bytes']:>6} "
+              f"{r['bin_bytes']:>5} {r['max_dev']:>10.2e} {r['flips']:>5}")
+
+
+if __name__ == "__main__":
+    main()
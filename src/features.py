@@ -0,0 +1,208 @@
+"""
+Extraction of the 30 model features from segmented FNA images.
+
+Input is a labelled nucleus mask (H, W) of ints (0 = background, one positive
+id per nucleus) and the matching grayscale image.  Each nucleus boundary is
+sampled as a star-shaped contour: `N_ANGLES` rays are cast from the centroid
+for every nucleus at once and the boundary radius is the first step that
+leaves the nucleus.  All ten base measurements from the glossary are then
+array operations over the resulting (nuclei, angles) radius matrix:
+
+  radius             mean centroid-to-boundary distance
+  texture            std of gray values inside the nucleus
+  perimeter          length of the contour polygon
+  area               pixel count
+  smoothness         mean |r_i - mean(r_i-1, r_i+1)|, relative to the radius
+  compactness        perimeter^2 / (4 pi area) - 1 (0 for a circle)
+  concavity          mean indentation depth below local chords, relative to the radius
+  concave points     fraction of contour points lying in an indentation
+  symmetry           mean radius mismatch when mirrored about the major axis
+  fractal dimension  coastline slope of perimeter versus ruler length
+
+Nuclei are aggregated into mean / standard error / worst (mean of the three
+largest) in `FEATURE_ORDER`.  Large images are split into tiles, each nucleus
+belonging to the tile holding its centroid, and tiles are measured in a
+process pool.
+
+Absolute scales follow these definitions and the supplied `pixel_size`; they
+are not calibrated against the software that produced the reference dataset.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+N_ANGLES = 64
+RAY_STEP = 0.5            # pixels between samples along each ray
+CHORD_SPAN = N_ANGLES // 16
+CONCAVE_TOL = 0.01        # indentations shallower than this x radius are ignored
+RULERS = (1, 2, 4, 8)     # contour subsampling factors for the coastline fit
+
+
+# ── Per-nucleus measurements ─────────────────────────────────────────────────
+
+def _measure(labels: np.ndarray, image: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """Return a (len(ids), 10) array of base measurements in pixel units."""
+    flat = labels.ravel()
+    size = int(max(flat.max(), ids.max())) + 1
+    rr, cc = np.indices(labels.shape)
+    g = image.ravel().astype(float)
+
+    count = np.bincount(flat, minlength=size)[ids].astype(float)
+    sum_r = np.bincount(flat, rr.ravel(), size)[ids]
+    sum_c = np.bincount(flat, cc.ravel(), size)[ids]
+    cy, cx = sum_r / count, sum_c / count
+    g1 = np.bincount(flat, g, size)[ids] / count
+    g2 = np.bincount(flat, g * g, size)[ids] / count
+    texture = np.sqrt(np.maximum(g2 - g1 ** 2, 0.0))
+
+    # Second central moments -> major-axis orientation
+    cy_px, cx_px = np.zeros(size), np.zeros(size)
+    cy_px[ids], cx_px[ids] = cy, cx
+    dr, dc = rr.ravel() - cy_px[flat], cc.ravel() - cx_px[flat]
+    mrr = np.bincount(flat, dr * dr, size)[ids]
+    mcc = np.bincount(flat, dc * dc, size)[ids]
+    mrc = np.bincount(flat, dr * dc, size)[ids]
+    phi = 0.5 * np.arctan2(2 * mrc, mcc - mrr)
+
+    # Cast rays: (K, M, S) samples, radius = first sample outside the nucleus
+    theta = np.linspace(0, 2 * np.pi, N_ANGLES, endpoint=False)
+    r_max = 2.0 * np.sqrt(count.max() / np.pi) + 2
+    steps = np.arange(0, r_max, RAY_STEP)
+    # floor(v + 0.5) rather than rint: half-to-even would depend on the tile offset
+    ys = np.floor(cy[:, None, None] + np.sin(theta)[None, :, None] * steps + 0.5).astype(int)
+    xs = np.floor(cx[:, None, None] + np.cos(theta)[None, :, None] * steps + 0.5).astype(int)
+    valid = (ys >= 0) & (ys < labels.shape[0]) & (xs >= 0) & (xs < labels.shape[1])
+    hit = np.where(valid, labels[ys.clip(0, labels.shape[0] - 1),
+                                 xs.clip(0, labels.shape[1] - 1)], 0)
+    inside = hit == ids[:, None, None]
+    inside[:, :, 0] = True
+    first_out = np.where(inside.all(axis=2), len(steps), np.argmin(inside, axis=2))
+    r = np.maximum(first_out * RAY_STEP - RAY_STEP / 2, RAY_STEP / 2)   # (K, M)
+
+    px = cx[:, None] + r * np.cos(theta)
+    py = cy[:, None] + r * np.sin(theta)
+    seg = np.hypot(np.roll(px, -1, axis=1) - px, np.roll(py, -1, axis=1) - py)
+    perimeter = seg.sum(axis=1)
+    radius = r.mean(axis=1)
+
+    smooth = np.abs(r - (np.roll(r, 1, axis=1) + np.roll(r, -1, axis=1)) / 2)
+    smoothness = smooth.mean(axis=1) / radius
+    compactness = perimeter ** 2 / (4 * np.pi * count) - 1.0
+
+    # Indentation depth of each point below the chord joining its neighbours;
+    # a point is concave when it lies on the centroid's side of that chord.
+    ax, ay = np.roll(px, CHORD_SPAN, axis=1), np.roll(py, CHORD_SPAN, axis=1)
+    bx, by = np.roll(px, -CHORD_SPAN, axis=1), np.roll(py, -CHORD_SPAN, axis=1)
+    chord = np.maximum(np.hypot(bx - ax, by - ay), 1e-9)
+    cross_p = (bx - ax) * (py - ay) - (by - ay) * (px - ax)
+    cross_c = (bx - ax) * (cy[:, None] - ay) - (by - ay) * (cx[:, None] - ax)
+    depth = np.where(np.sign(cross_p) == np.sign(cross_c), np.abs(cross_p) / chord, 0.0)
+    concave = depth > CONCAVE_TOL * radius[:, None]
+    concavity = np.where(concave, depth, 0.0).mean(axis=1) / radius
+    concave_points = concave.mean(axis=1)
+
+    # Mirror radii about the major axis (angle 2*phi - theta), interpolated
+    mirror = (2 * phi[:, None] - theta[None]) % (2 * np.pi) / (2 * np.pi) * N_ANGLES
+    i0 = np.floor(mirror).astype(int) % N_ANGLES
+    frac = mirror - np.floor(mirror)
+    r_mirror = ((1 - frac) * np.take_along_axis(r, i0, axis=1)
+                + frac * np.take_along_axis(r, (i0 + 1) % N_ANGLES, axis=1))
+    symmetry = np.abs(r - r_mirror).sum(axis=1) / (r + r_mirror).sum(axis=1)
+
+    # Coastline: log perimeter against log ruler length, slope -> D - 1
+    log_p, log_l = [], []
+    for s in RULERS:
+        qx, qy = px[:, ::s], py[:, ::s]
+        sub = np.hypot(np.roll(qx, -1, axis=1) - qx, np.roll(qy, -1, axis=1) - qy)
+        log_p.append(np.log(sub.sum(axis=1)))
+        log_l.append(np.log(sub.mean(axis=1)))
+    log_p, log_l = np.array(log_p), np.array(log_l)
+    dl = log_l - log_l.mean(axis=0)
+    slope = (dl * (log_p - log_p.mean(axis=0))).sum(axis=0) / np.maximum((dl ** 2).sum(axis=0), 1e-12)
+    fractal_dimension = -slope
+
+    return np.column_stack([
+        radius, texture, perimeter, count, smoothness, compactness,
+        concavity, concave_points, symmetry, fractal_dimension,
+    ])
+
+
+def _measure_tile(job: tuple) -> np.ndarray:
+    labels, image, ids = job
+    return _measure(labels, image, ids)
+
+
+# ── Tiling ───────────────────────────────────────────────────────────────────
+
+def _tile_jobs(labels: np.ndarray, image: np.ndarray, tile: int) -> list[tuple]:
+    """Group nuclei by the tile holding their centroid and crop each group's
+    bounding box, so every nucleus is measured whole exactly once."""
+    flat = labels.ravel()
+    idx = np.flatnonzero(flat)
+    if idx.size == 0:
+        return []
+    lab = flat[idx]
+    order = np.argsort(lab, kind="stable")
+    idx, lab = idx[order], lab[order]
+    starts = np.flatnonzero(np.r_[True, lab[1:] != lab[:-1]])
+    ids = lab[starts]
+    rows, cols = np.divmod(idx, labels.shape[1])
+    r0, r1 = np.minimum.reduceat(rows, starts), np.maximum.reduceat(rows, starts) + 1
+    c0, c1 = np.minimum.reduceat(cols, starts), np.maximum.reduceat(cols, starts) + 1
+    n = np.diff(np.r_[starts, len(lab)])
+    cy = np.add.reduceat(rows, starts) / n
+    cx = np.add.reduceat(cols, starts) / n
+
+    tiles_x = -(-labels.shape[1] // tile)
+    tile_of = (cy // tile).astype(int) * tiles_x + (cx // tile).astype(int)
+    jobs = []
+    for tid in np.unique(tile_of):
+        sel = tile_of == tid
+        y0, y1 = r0[sel].min(), r1[sel].max()
+        x0, x1 = c0[sel].min(), c1[sel].max()
+        jobs.append((labels[y0:y1, x0:x1], image[y0:y1, x0:x1], ids[sel]))
+    return jobs
+
+
+def nucleus_measurements(labels, image, tile: int = 512, workers: int | None = None,
+                         pixel_size: float = 1.0) -> np.ndarray:
+    """Measure every nucleus; returns a (n_nuclei, 10) array.
+
+    `pixel_size` converts pixel lengths to physical units (areas are scaled by
+    its square).  `workers=1` measures tiles in-process.
+    """
+    labels = np.asarray(labels)
+    image = np.asarray(image, dtype=float)
+    if labels.shape != image.shape:
+        raise ValueError("mask and image must have the same shape")
+    jobs = _tile_jobs(labels, image, tile)
+    if not jobs:
+        return np.empty((0, 10))
+    if workers == 1 or len(jobs) == 1:
+        parts = [_measure_tile(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_measure_tile, jobs))
+    out = np.vstack(parts)
+    out[:, [0, 2]] *= pixel_size          # radius, perimeter
+    out[:, 3] *= pixel_size ** 2          # area
+    return out
+
+
+def aggregate(measurements: np.ndarray) -> np.ndarray:
+    """Collapse (n_nuclei, 10) measurements into the 30 features in
+    `FEATURE_ORDER`: means, standard errors, then worst (mean of 3 largest)."""
+    m = np.asarray(measurements, dtype=float)
+    if len(m) == 0:
+        raise ValueError("no nuclei to aggregate")
+    mean = m.mean(axis=0)
+    se = m.std(axis=0, ddof=1) / np.sqrt(len(m)) if len(m) > 1 else np.zeros(m.shape[1])
+    worst = np.sort(m, axis=0)[-3:].mean(axis=0)
+    return np.concatenate([mean, se, worst])
+
+
+def extract_features(labels, image, tile: int = 512, workers: int | None = None,
+                     pixel_size: float = 1.0) -> np.ndarray:
+    """Labelled mask + grayscale image -> the 30-feature model input."""
+    return aggregate(nucleus_measurements(labels, image, tile, workers, pixel_size))
@@ -0,0 +1,46 @@
+"""
+Bounded per-session case history.
+
+Cases live in a preallocated (capacity, 30) ring buffer with parallel
+probability / timestamp arrays, so memory stays fixed however many cases a
+session enters; the oldest case is overwritten once the buffer is full.
+"""
+
+import time
+
+import numpy as np
+
+
+class CaseHistory:
+    """Fixed-capacity ring buffer of scored cases."""
+
+    def __init__(self, capacity: int = 20, n_features: int = 30):
+        self.X = np.zeros((capacity, n_features))
+        self.p_malignant = np.zeros(capacity)
+        self.ts = np.zeros(capacity)
+        self.seq = np.zeros(capacity, dtype=int)   # 1-based entry numbers
+        self._count = 0                            # total cases ever pushed
+
+    def __len__(self) -> int:
+        return min(self._count, len(self.ts))
+
+    def push(self, values, p_malignant: float, ts: float | None = None) -> int:
+        """Store a case, overwriting the oldest when full; returns its number."""
+        i = self._count % len(self.ts)
+        self.X[i] = values
+        self.p_malignant[i] = p_malignant
+        self.ts[i] = time.time() if ts is None else ts
+        self._count += 1
+        self.seq[i] = self._count
+        return self._count
+
+    def latest(self, k: int | None = None) -> np.ndarray:
+        """Buffer slots of the `k` most recent cases, newest first."""
+        n = len(self) if k is None else min(k, len(self))
+        return (self._count - 1 - np.arange(n)) % len(self.ts)
+
+    def entries(self, slots) -> dict:
+        """Gather the given buffer slots into arrays (one row per case)."""
+        slots = np.asarray(slots, dtype=int)
+        return dict(X=self.X[slots], p_malignant=self.p_malignant[slots],
+                    ts=self.ts[slots], seq=self.seq[slots])
@@ -0,0 +1,190 @@
+"""
+Optional memory instrumentation for long-running servers.
+
+Enabled by setting `BCR_MEMPROFILE=1`; otherwise `stage()` is a no-op and
+`tracemalloc` is never started.  When enabled:
+
+  - every `stage(name)` block in `app.py` is bracketed by `tracemalloc`
+    snapshots; the bytes it leaves allocated are charged to the current
+    Streamlit session and stage, and its largest allocation sites are kept
+  - at the end of each rerun the session's `st.session_state` is sized by
+    object type (PDF bytes, figures, case history, ...)
+  - instrumented stages are serialised across sessions and each snapshot
+    costs time proportional to the traced heap, so the mode is meant for
+    diagnosis rather than production traffic
+  - every `REPORT_EVERY` seconds a JSON report is written to
+    `$BCR_MEMPROFILE_DIR/memprof-<pid>.json` (default `./memprof`), with
+    `growth` listing every series (process, session, stage, type) that rose
+    monotonically over the last `GROWTH_WINDOW` reports
+"""
+
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+ENABLED = os.environ.get("BCR_MEMPROFILE", "") not in ("", "0")
+REPORT_EVERY = 60.0     # seconds between JSON reports
+GROWTH_WINDOW = 5       # consecutive increasing reports that count as a leak
+TOP_SITES = 10          # allocation sites kept per stage
+SESSION_TTL = 3600.0    # sessions idle this long are dropped from the report
+
+
+_OWN_FRAMES = (tracemalloc.Filter(False, tracemalloc.__file__),
+               tracemalloc.Filter(False, __file__))
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(_OWN_FRAMES)
+
+
+def session_id() -> str:
+    """Id of the Streamlit session running this thread ("-" outside a rerun)."""
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "-"
+
+
+def _deep_size(obj, seen: set) -> int:
+    """Approximate retained size of `obj` and everything it holds."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + (obj.nbytes if obj.base is None else 0)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(_deep_size(v, seen) for v in obj)
+    elif hasattr(obj, "__dict__"):
+        size += _deep_size(vars(obj), seen)
+    return size
+
+
+class MemoryProfiler:
+    """Process-wide accumulator of per-session / per-stage allocation deltas."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / f"memprof-{os.getpid()}.json"
+        self._lock = threading.Lock()
+        self._stage_lock = threading.Lock()
+        self._stages: dict[str, dict] = defaultdict(lambda: dict(runs=0, bytes=0, sites={}))
+        self._sessions: dict[str, dict] = {}
+        self._history: dict[str, deque] = defaultdict(lambda: deque(maxlen=GROWTH_WINDOW))
+        self._reported = time.monotonic()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Charge the bytes a block leaves allocated to the session and stage.
+
+        Instrumented stages run one at a time so that concurrent sessions do
+        not show up in each other's snapshot diffs.
+        """
+        with self._stage_lock:
+            before = _snapshot()
+            try:
+                yield
+            finally:
+                after = _snapshot()
+                self._record(name, after.compare_to(before, "lineno"))
+
+    def _record(self, name: str, diff: list) -> None:
+        delta = sum(d.size_diff for d in diff)
+        sites = {str(d.traceback): d.size_diff for d in diff[:TOP_SITES]}
+        sid = session_id()
+        with self._lock:
+            acc = self._stages[name]
+            acc["runs"] += 1
+            acc["bytes"] += delta
+            acc["sites"] = sites
+            sess = self._sessions.setdefault(sid, dict(bytes=0, stages={}, types={}))
+            sess["bytes"] += delta
+            sess["stages"][name] = sess["stages"].get(name, 0) + delta
+            sess["seen"] = time.time()
+
+    def end_run(self) -> None:
+        """Size the session state by type; write the report when one is due."""
+        types: dict[str, int] = defaultdict(int)
+        seen: set = set()
+        for value in st.session_state.to_dict().values():
+            types[type(value).__name__] += _deep_size(value, seen)
+        with self._lock:
+            sess = self._sessions.setdefault(session_id(), dict(bytes=0, stages={}, types={}))
+            sess["types"] = dict(types)
+            sess["seen"] = time.time()
+            due = time.monotonic() - self._reported >= REPORT_EVERY
+            if due:
+                self._reported = time.monotonic()
+        if due:
+            self.write_report()
+
+    # ── Reporting ────────────────────────────────────────────────────────────
+
+    def report(self) -> dict:
+        """Current totals plus the series that grew over the last reports."""
+        current, peak = tracemalloc.get_traced_memory()
+        now = time.time()
+        with self._lock:
+            for sid in [s for s, v in self._sessions.items()
+                        if now - v.get("seen", now) > SESSION_TTL]:
+                del self._sessions[sid]
+                for key in [k for k in self._history
+                            if k == f"session:{sid}" or k.startswith(f"type:{sid}:")]:
+                    del self._history[key]
+            series = {"process": current}
+            series.update({f"stage:{k}": v["bytes"] for k, v in self._stages.items()})
+            for sid, sess in self._sessions.items():
+                series[f"session:{sid}"] = sess["bytes"]
+                series.update({f"type:{sid}:{k}": v for k, v in sess.get("types", {}).items()})
+            # Series that stopped reporting (expired sessions, types no longer
+            # held in session state) would otherwise keep their deques forever
+            for key in self._history.keys() - series.keys():
+                del self._history[key]
+            growth = []
+            for key, value in series.items():
+                hist = self._history[key]
+                hist.append(value)
+                if len(hist) == GROWTH_WINDOW and all(np.diff(hist) > 0):
+                    growth.append(dict(series=key, bytes=list(hist)))
+            return dict(
+                ts=now, pid=os.getpid(), traced_bytes=current, traced_peak=peak,
+                stages={k: dict(v) for k, v in self._stages.items()},
+                sessions={k: dict(v) for k, v in self._sessions.items()},
+                growth=growth,
+            )
+
+    def write_report(self) -> Path:
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.report(), indent=1))
+        os.replace(tmp, self.path)
+        return self.path
+
+
+@st.cache_resource
+def memory_profiler() -> MemoryProfiler:
+    """Process-wide profiler shared by every Streamlit session."""
+    return MemoryProfiler(os.environ.get("BCR_MEMPROFILE_DIR", "memprof"))
+
+
+def stage(name: str):
+    """Profile a block of the rerun when `BCR_MEMPROFILE` is set."""
+    return memory_profiler().stage(name) if ENABLED else contextlib.nullcontext()
+
+
+def end_run() -> None:
+    """Close out the rerun when `BCR_MEMPROFILE` is set."""
+    if ENABLED:
+        memory_profiler().end_run()
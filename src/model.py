@@ -6,6 +6,7 @@ dataset (569 samples, 30 features).  Weights, bias, and standardisation
 statistics are embedded so the app has zero external model files.
 """
 
+import hashlib
 import math
 import numpy as np
 import streamlit as st
@@ -15,6 +16,7 @@ from sklearn.metrics import (
     confusion_matrix, roc_curve, auc,
 )
 
+
 # ── Trained weights (30 features) ────────────────────────────────────────────
 
 W = np.array([
@@ -60,9 +62,26 @@ FEAT_STD = np.array([
     0.06525425828147159, 0.06308179580673515, 0.017828276003334045,
 ])
 
+# Short content hash of the parameters above; changes whenever the model does.
+MODEL_VERSION = hashlib.sha256(
+    b"".join(a.tobytes() for a in (W, np.array([BIAS]), FEAT_MEAN, FEAT_STD))
+).hexdigest()[:12]
+
+
+def folded_coefficients() -> tuple[np.ndarray, float]:
+    """Fold standardisation into the weights: logit = x @ coef + intercept."""
+    coef = W / FEAT_STD
+    intercept = float(BIAS - coef @ FEAT_MEAN)
+    return coef, intercept
+
 
 # ── Prediction ───────────────────────────────────────────────────────────────
 
+def sigmoid(z):
+    """Logistic function, overflow-free for logits of either sign."""
+    return np.exp(-np.logaddexp(0.0, -z))
+
+
 def predict_prob(values: list[float]) -> float:
     """Return P(benign).  The model outputs high probability for the benign class."""
     x = np.array(values)
@@ -73,12 +92,17 @@ def predict_prob(values: list[float]) -> float:
     return ez / (1.0 + ez)
 
 
-# ── Cached evaluation on the full dataset ────────────────────────────────────
+def predict_batch(X) -> np.ndarray:
+    """Vectorised `predict_prob` for an (N, 30) matrix; returns P(benign) per row."""
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    return sigmoid(((X - FEAT_MEAN) / FEAT_STD) @ W + BIAS)
 
-@st.cache_data
-def compute_model_metrics() -> dict:
-    """Compute accuracy, precision, recall, F1, AUC, confusion matrix, ROC
-    curve, and per-class average feature profiles."""
+
+# ── Reference data and evaluation ────────────────────────────────────────────
+
+def _build_reference() -> dict:
+    """Load the dataset and evaluate the model on it: accuracy, precision,
+    recall, F1, AUC, confusion matrix, ROC curve and per-class averages."""
     data = load_breast_cancer()
     X, y = data.data, data.target          # y: 0=malignant, 1=benign
 
@@ -97,11 +121,48 @@ def compute_model_metrics() -> dict:
     fpr, tpr, _ = roc_curve(y, mal_prob, pos_label=0)
     roc_auc = auc(fpr, tpr)
 
-    benign_avg    = X[y == 1].mean(axis=0)
-    malignant_avg = X[y == 0].mean(axis=0)
+    return dict(
+        X=X, y=y,
+        accuracy=float(acc), precision=float(prec), recall=float(rec), f1=float(f1),
+        cm=cm, fpr=fpr, tpr=tpr, roc_auc=float(roc_auc),
+        benign_avg=X[y == 1].mean(axis=0), malignant_avg=X[y == 0].mean(axis=0),
+    )
+
+
+@st.cache_resource
+def reference_block() -> dict:
+    """Read-only reference data and evaluation results for this model version.
+
+    With `BCR_SHARED_REF` set, one process per host publishes them to shared
+    memory and the others attach zero-copy (see `shared_ref.py`).
+    """
+    from . import shared_ref     # imported here so `python -m src.shared_ref` loads it once
+    if shared_ref.ENABLED:
+        return shared_ref.attach_or_publish(f"ref_{MODEL_VERSION}", _build_reference)
+    return shared_ref.read_only(_build_reference())
+
 
+def load_reference() -> tuple[np.ndarray, np.ndarray]:
+    """Return the read-only reference population (X, y); y: 0=malignant, 1=benign."""
+    ref = reference_block()
+    return ref["X"], ref["y"]
+
+
+@st.cache_resource
+def class_statistics() -> dict:
+    """Per-class mean feature profiles and covariance matrices of the reference data."""
+    ref = reference_block()
+    X, y = ref["X"], ref["y"]
     return dict(
-        accuracy=acc, precision=prec, recall=rec, f1=f1, cm=cm,
-        fpr=fpr, tpr=tpr, roc_auc=roc_auc,
-        benign_avg=benign_avg, malignant_avg=malignant_avg,
+        benign_avg=ref["benign_avg"], malignant_avg=ref["malignant_avg"],
+        benign_cov=np.cov(X[y == 1], rowvar=False),
+        malignant_cov=np.cov(X[y == 0], rowvar=False),
+        malignant_frac=float((y == 0).mean()),
     )
+
+
+def compute_model_metrics() -> dict:
+    """Accuracy, precision, recall, F1, AUC, confusion matrix, ROC curve, and
+    per-class average feature profiles on the full dataset (read-only)."""
+    ref = reference_block()
+    return {k: v for k, v in ref.items() if k not in ("X", "y")}
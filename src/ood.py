@@ -0,0 +1,53 @@
+"""
+Out-of-distribution detection against the training population.
+
+Inputs are compared with the reference population in standardised space:
+  - Mahalanobis distance to the population centre (whole-vector plausibility)
+  - Per-feature z-scores (which individual measurements are extreme)
+  - Negative values, which are physically impossible for every feature
+
+The covariance is factorised once per process; scoring a single case or an
+(N, 30) batch is then a single matrix product.
+"""
+
+import numpy as np
+import streamlit as st
+
+from .model import FEAT_MEAN, FEAT_STD, load_reference
+
+Z_LIMIT = 5.0          # |z| above this flags an individual feature
+DIST_QUANTILE = 0.995  # reference quantile used as the Mahalanobis cut-off
+RIDGE = 1e-6           # regularises the near-collinear radius/perimeter/area block
+
+
+@st.cache_resource
+def ood_reference() -> dict:
+    """Precompute the population centre, whitening matrix and distance cut-off."""
+    X, _ = load_reference()
+    Z = (X - FEAT_MEAN) / FEAT_STD
+    centre = Z.mean(axis=0)
+    cov = np.cov(Z, rowvar=False) + RIDGE * np.eye(Z.shape[1])
+    chol = np.linalg.cholesky(cov)
+    whiten = np.linalg.inv(chol)           # d = ||whiten @ (z - centre)||
+
+    ref_dist = np.linalg.norm((Z - centre) @ whiten.T, axis=1)
+    return dict(
+        centre=centre, cov=cov, whiten=whiten,
+        threshold=float(np.quantile(ref_dist, DIST_QUANTILE)),
+    )
+
+
+def ood_score(X) -> dict:
+    """Score one case (30,) or a batch (N, 30) against the reference population.
+
+    Returns arrays with a leading N axis: `distance` (Mahalanobis), `z`
+    (per-feature z-scores), `flags` (per-feature bool), `is_ood` (per case).
+    """
+    ref = ood_reference()
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    Z = (X - FEAT_MEAN) / FEAT_STD
+    distance = np.linalg.norm((Z - ref["centre"]) @ ref["whiten"].T, axis=1)
+    flags = (np.abs(Z) > Z_LIMIT) | (X < 0)
+    is_ood = (distance > ref["threshold"]) | flags.any(axis=1)
+    return dict(distance=distance, z=Z, flags=flags, is_ood=is_ood,
+                threshold=ref["threshold"])
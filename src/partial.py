@@ -0,0 +1,71 @@
+"""
+Predictions from partially filled inputs.
+
+Missing standardised features are replaced by their conditional expectation
+given the observed ones under a Gaussian fitted to the reference population:
+
+    E[z_m | z_o] = mu_m + S_mo S_oo^-1 (z_o - mu_o)
+
+Because the model is linear in z, this collapses into a sub-model on the
+observed features alone, plus a logit variance w_m' S_m|o w_m that gives an
+uncertainty band.  Sub-models are solved once per missing-feature pattern and
+kept in an LRU cache, so a repeated pattern costs a single dot product.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .model import BIAS, FEAT_MEAN, FEAT_STD, W, sigmoid
+from .ood import ood_reference
+
+Z_BAND = 1.96          # half-width of the band in logit standard deviations
+
+
+@lru_cache(maxsize=256)
+def _submodel(missing: tuple[int, ...]) -> tuple:
+    """Solve the raw-feature sub-model for one missing-feature pattern.
+
+    Returns (observed idx, coef, intercept, logit std, imputation matrix A,
+    imputation offset c) where E[z_m] = A @ z_o + c.
+    """
+    ref = ood_reference()
+    mu, cov = ref["centre"], ref["cov"]
+    m = np.array(missing, dtype=int)
+    o = np.setdiff1d(np.arange(len(W)), m)
+
+    A = np.linalg.solve(cov[np.ix_(o, o)], cov[np.ix_(o, m)]).T   # S_mo S_oo^-1
+    c = mu[m] - A @ mu[o]
+    coef_z = W[o] + A.T @ W[m]
+    cond_cov = cov[np.ix_(m, m)] - A @ cov[np.ix_(o, m)]
+    sd = float(np.sqrt(max(W[m] @ cond_cov @ W[m], 0.0)))
+
+    coef = coef_z / FEAT_STD[o]                        # fold standardisation
+    intercept = float(BIAS + W[m] @ c - coef @ FEAT_MEAN[o])
+    return o, coef, intercept, sd, A, c
+
+
+def predict_partial(values) -> dict:
+    """Predict from 30 values where missing entries are None or NaN.
+
+    Returns P(benign) with a band (`p_lo`, `p_hi`, both P(benign)), the
+    indices that were estimated, and the full vector with missing values
+    replaced by their conditional means (`imputed`, raw units).
+    """
+    x = np.array([np.nan if v is None else float(v) for v in values])
+    missing = tuple(int(i) for i in np.flatnonzero(np.isnan(x)))
+    if len(missing) == len(x):
+        raise ValueError("at least one feature must be observed")
+    o, coef, intercept, sd, A, c = _submodel(missing)
+
+    z = float(x[o] @ coef + intercept)
+    imputed = x.copy()
+    if missing:
+        z_o = (x[o] - FEAT_MEAN[o]) / FEAT_STD[o]
+        m = np.array(missing)
+        imputed[m] = (A @ z_o + c) * FEAT_STD[m] + FEAT_MEAN[m]
+    return dict(
+        p_benign=float(sigmoid(z)), p_lo=float(sigmoid(z - Z_BAND * sd)),
+        p_hi=float(sigmoid(z + Z_BAND * sd)),
+        missing=list(missing), imputed=imputed,
+    )
@@ -0,0 +1,232 @@
+"""
+Vector charts for the PDF reports, drawn with FPDF path primitives.
+
+The radar, contribution and ROC charts reuse the arrays behind the Plotly
+figures in `charts.py` (`chart_data.radar_scale`, `top_contributions`,
+the ROC curve from `compute_model_metrics`), so the PDF shows exactly what the app
+shows without rasterising anything.  The histogram and class-split bars
+serve the cohort report.  Positions and sizes are in mm.
+"""
+
+import math
+
+import numpy as np
+from fpdf import FPDF
+
+from .chart_data import radar_scale, top_contributions
+from .config import MEAN_LABELS
+from .translations import t
+
+BENIGN, MALIGNANT, PATIENT = "#059669", "#dc2626", "#6366f1"
+GRID, MUTED, TEXT = "#d1d5db", "#6b7280", "#1e293b"
+
+
+def _rgb(color: str) -> tuple[int, int, int]:
+    return tuple(int(color[i:i + 2], 16) for i in (1, 3, 5))
+
+
+def _font(pdf: FPDF, size: float, style: str = "") -> None:
+    pdf.set_font(getattr(pdf, "text_font", "Helvetica"), style, size)
+
+
+def _arrows(pdf: FPDF) -> tuple[str, str]:
+    """Left / right arrows, spelled in ASCII when only Helvetica is available."""
+    if getattr(pdf, "text_font", "Helvetica") == "Helvetica":
+        return "<-", "->"
+    return "\u2190", "\u2192"
+
+
+def _legend(pdf: FPDF, x: float, y: float, items: list[tuple[str, str]]) -> None:
+    """One row of colour swatches and labels starting at (x, y)."""
+    _font(pdf, 6.5)
+    pdf.set_text_color(*_rgb(TEXT))
+    for name, color in items:
+        pdf.set_fill_color(*_rgb(color))
+        pdf.rect(x, y + 0.8, 3, 2, style="F")
+        pdf.set_xy(x + 4, y)
+        pdf.cell(pdf.get_string_width(name) + 1, 3.6, name)
+        x += pdf.get_string_width(name) + 8
+
+
+# ── Radar ────────────────────────────────────────────────────────────────────
+
+def draw_radar(pdf: FPDF, x: float, y: float, size: float, patient_vals,
+               benign_avg, malignant_avg, lang: str, mode: str = "range") -> None:
+    """Radar of the 10 mean features against the class averages in a
+    `size` x `size` box with its top-left corner at (x, y)."""
+    p, b, m = radar_scale(np.vstack([patient_vals, benign_avg, malignant_avg]), mode)
+    labels = MEAN_LABELS[lang]
+    n = len(labels)
+    cx, cy = x + size / 2, y + size / 2 - 2
+    radius = size / 2 - 12
+    angles = [math.pi / 2 - 2 * math.pi * i / n for i in range(n)]   # clockwise from top
+
+    def points(r) -> list[tuple[float, float]]:
+        return [(cx + radius * float(v) * math.cos(a), cy - radius * float(v) * math.sin(a))
+                for v, a in zip(r, angles)]
+
+    pdf.set_line_width(0.15)
+    pdf.set_draw_color(*_rgb(GRID))
+    for level in (0.25, 0.5, 0.75, 1.0):
+        pdf.polygon(points([level] * n))
+    for px, py in points([1.0] * n):
+        pdf.line(cx, cy, px, py)
+
+    _font(pdf, 6)
+    pdf.set_text_color(*_rgb(MUTED))
+    for label, (px, py), a in zip(labels, points([1.13] * n), angles):
+        w = pdf.get_string_width(label)
+        shift = 0.5 * (1 - math.cos(a)) * w        # right of centre -> left-aligned
+        pdf.text(px - shift, py + 1.2, label)
+
+    for r, color, width, opacity in ((b, BENIGN, 0.4, 0.10), (m, MALIGNANT, 0.4, 0.10),
+                                     (p, PATIENT, 0.7, 0.18)):
+        pdf.set_draw_color(*_rgb(color))
+        pdf.set_fill_color(*_rgb(color))
+        pdf.set_line_width(width)
+        with pdf.local_context(fill_opacity=opacity):
+            pdf.polygon(points(r), style="F")
+        pdf.polygon(points(r), style="D")
+
+    _legend(pdf, x + 4, y + size - 3, [(t("patient", lang), PATIENT),
+                                       (t("avg_benign", lang), BENIGN),
+                                       (t("avg_malignant", lang), MALIGNANT)])
+    pdf.set_line_width(0.2)
+
+
+# ── Contributions ────────────────────────────────────────────────────────────
+
+def draw_contribution(pdf: FPDF, x: float, y: float, w: float, h: float,
+                      values, lang: str) -> None:
+    """Horizontal bars of the top-10 contributions in a `w` x `h` box."""
+    names, vals = top_contributions(values, lang)
+    names, vals = names[::-1], vals[::-1]                 # largest on top
+    label_w = 34
+    axis_h = 8
+    plot_x, plot_w = x + label_w, w - label_w - 2
+    row_h = (h - axis_h) / len(vals)
+    span = max(abs(v) for v in vals) or 1.0
+    zero = plot_x + plot_w / 2
+    scale = (plot_w / 2 - 8) / span
+
+    _font(pdf, 6.5)
+    for i, (name, v) in enumerate(zip(names, vals)):
+        top = y + i * row_h
+        pdf.set_text_color(*_rgb(TEXT))
+        pdf.set_xy(x, top)
+        pdf.cell(label_w - 1, row_h, name, align="R")
+        pdf.set_fill_color(*_rgb(MALIGNANT if v > 0 else BENIGN))
+        bar = v * scale
+        pdf.rect(min(zero, zero + bar), top + row_h * 0.2, abs(bar), row_h * 0.6, style="F")
+        pdf.set_text_color(*_rgb(MUTED))
+        text = f"{v:+.2f}"
+        tx = zero + bar + 1 if v > 0 else zero + bar - 1 - pdf.get_string_width(text)
+        pdf.text(tx, top + row_h / 2 + 1, text)
+
+    bottom = y + len(vals) * row_h
+    pdf.set_draw_color(*_rgb(MUTED))
+    pdf.set_line_width(0.2)
+    pdf.line(zero, y, zero, bottom)
+    pdf.set_text_color(*_rgb(MUTED))
+    left, right = _arrows(pdf)
+    pdf.set_xy(plot_x, bottom + 1)
+    pdf.cell(plot_w / 2, 4, f"{left} {t('contribution_ben', lang)}")
+    pdf.cell(plot_w / 2, 4, f"{t('contribution_mal', lang)} {right}", align="R")
+
+
+# ── ROC ──────────────────────────────────────────────────────────────────────
+
+def draw_roc(pdf: FPDF, x: float, y: float, size: float, fpr, tpr,
+             roc_auc: float) -> None:
+    """ROC curve with the chance diagonal in a `size` x `size` box."""
+    pad = 9
+    x0, y0, s = x + pad, y + size - pad, size - pad - 2
+
+    def to_page(u: float, v: float) -> tuple[float, float]:
+        return x0 + u * s, y0 - v * s
+
+    pdf.set_line_width(0.15)
+    pdf.set_draw_color(*_rgb(GRID))
+    _font(pdf, 6)
+    pdf.set_text_color(*_rgb(MUTED))
+    for tick in (0.0, 0.25, 0.5, 0.75, 1.0):
+        pdf.line(*to_page(tick, 0), *to_page(tick, 1))
+        pdf.line(*to_page(0, tick), *to_page(1, tick))
+        pdf.text(to_page(tick, 0)[0] - 1.5, y0 + 3, f"{tick:g}")
+        pdf.text(x0 - 5, to_page(0, tick)[1] + 1, f"{tick:g}")
+    pdf.text(x0 + s / 2 - 12, y0 + 7, "False Positive Rate")
+    with pdf.rotation(90, x + 2, y0 - s / 2 + 12):
+        pdf.text(x + 2, y0 - s / 2 + 12, "True Positive Rate")
+
+    pdf.set_draw_color(*_rgb(MUTED))
+    pdf.set_dash_pattern(dash=1, gap=1)
+    pdf.line(*to_page(0, 0), *to_page(1, 1))
+    pdf.set_dash_pattern()
+
+    pdf.set_draw_color(*_rgb(PATIENT))
+    pdf.set_line_width(0.6)
+    pdf.polyline([to_page(float(u), float(v)) for u, v in zip(fpr, tpr)])
+    pdf.set_line_width(0.2)
+    _font(pdf, 7, "B")
+    pdf.set_text_color(*_rgb(PATIENT))
+    pdf.text(*to_page(0.45, 0.12), f"AUC = {roc_auc:.3f}")
+
+
+# ── Cohort charts ────────────────────────────────────────────────────────────
+
+def draw_histogram(pdf: FPDF, x: float, y: float, w: float, h: float, counts,
+                   threshold: float = 0.5) -> None:
+    """Bars of a malignancy-score histogram over [0, 1]; bins at or above
+    `threshold` are drawn in the malignant colour."""
+    counts = np.asarray(counts)
+    axis_h = 7
+    plot_h = h - axis_h
+    top = max(int(counts.max()), 1)
+    bar_w = w / len(counts)
+
+    pdf.set_line_width(0.15)
+    pdf.set_draw_color(*_rgb(GRID))
+    _font(pdf, 6)
+    pdf.set_text_color(*_rgb(MUTED))
+    for frac in (0.5, 1.0):
+        gy = y + plot_h * (1 - frac)
+        pdf.line(x, gy, x + w, gy)
+        pdf.text(x + w + 1, gy + 1, f"{round(top * frac):,}")
+    for i, n in enumerate(counts):
+        centre = (i + 0.5) / len(counts)
+        pdf.set_fill_color(*_rgb(MALIGNANT if centre >= threshold else BENIGN))
+        bh = plot_h * n / top
+        pdf.rect(x + i * bar_w + 0.3, y + plot_h - bh, bar_w - 0.6, bh, style="F")
+    pdf.set_draw_color(*_rgb(MUTED))
+    pdf.line(x, y + plot_h, x + w, y + plot_h)
+    for tick in (0, 25, 50, 75, 100):
+        label = f"{tick}%"
+        pdf.text(x + w * tick / 100 - pdf.get_string_width(label) / 2, y + plot_h + 3.5, label)
+    pdf.set_line_width(0.2)
+
+
+def draw_class_split(pdf: FPDF, x: float, y: float, w: float, rows, lang: str) -> float:
+    """One stacked benign / malignant bar per (label, n_benign, n_malignant)
+    row; returns the y below the last bar."""
+    label_w, bar_h, gap = 26, 6, 3
+    bar_w = w - label_w
+    for label, n_ben, n_mal in rows:
+        total = max(n_ben + n_mal, 1)
+        _font(pdf, 7)
+        pdf.set_text_color(*_rgb(TEXT))
+        pdf.text(x, y + bar_h / 2 + 1.2, label)
+        split = bar_w * n_ben / total
+        for left, width, color, n in ((0, split, BENIGN, n_ben),
+                                      (split, bar_w - split, MALIGNANT, n_mal)):
+            if width <= 0:
+                continue
+            pdf.set_fill_color(*_rgb(color))
+            pdf.rect(x + label_w + left, y, width, bar_h, style="F")
+            text = f"{n:,} ({n / total:.0%})"
+            _font(pdf, 6.5, "B")
+            if pdf.get_string_width(text) + 2 < width:
+                pdf.set_text_color(255, 255, 255)
+                pdf.text(x + label_w + left + 1.2, y + bar_h / 2 + 1.1, text)
+        y += bar_h + gap
+    _legend(pdf, x + label_w, y, [(t("benign", lang), BENIGN), (t("malignant", lang), MALIGNANT)])
+    return y + 5
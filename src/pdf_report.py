@@ -6,34 +6,130 @@ Produces a professional multi-page clinical report with:
   - Clinical summary
   - Tumor characteristic analysis (size, shape, texture)
   - Measurements table
+  - Radar, contribution and ROC charts as vector graphics
   - Result interpretation & next steps
   - Empathetic patient note
   - Lifestyle & wellness advice
   - Model methodology note
   - Disclaimer
+
+Text is set in the bundled DejaVu Sans (`src/fonts/`), so diacritics and
+typographic punctuation print as written.  Each face is parsed and cut
+down to a working set once per process; every report gets a lightweight
+clone that shares the parsed glyph metrics and owns only its subset map, so
+just the glyphs a report uses are embedded.  Without the font files, reports fall back to Helvetica.
+
+The clones set fpdf2's `TTFFont` attributes directly, so they are used only
+on the fpdf2 2.8 series pinned in `requirements.txt`; any other version
+registers the faces with the public `add_font` instead (slower, same output).
 """
 
+import copy
+import io
 from datetime import date
-from fpdf import FPDF
-from .config import SECTIONS, FEATURES_RAW
-from .model import FEAT_MEAN
+from functools import lru_cache
+from pathlib import Path
+
+from fontTools import subset as ftsubset
+from fontTools import ttLib
+from fpdf import FPDF, FPDF_VERSION
+from fpdf.fonts import SubsetMap, TTFFont
+from .config import SECTIONS, FEATURES_RAW, FEATURE_ORDER, FULL_LABELS
+from .model import FEAT_MEAN, compute_model_metrics
+from .ood import ood_score
+from .pdf_charts import draw_contribution, draw_radar, draw_roc
+from .percentiles import percentile_rank
 from .translations import LANG, t
+from .uncertainty import N_DRAWS
+
+
+FONT_DIR = Path(__file__).parent / "fonts"
+FONT_FAMILY = "DejaVu"
+_FONT_FILES = {"": "DejaVuSans.ttf", "B": "DejaVuSans-Bold.ttf",
+               "I": "DejaVuSans-Oblique.ttf"}
+_WORKING_SET = [                 # Unicode ranges kept in the cached faces
+    (0x0020, 0x007E), (0x00A0, 0x024F),    # Latin, Latin-1, Latin Extended-A/B
+    (0x0300, 0x036F),                      # combining diacritics
+    (0x1E00, 0x1EFF),                      # Latin Extended Additional (Vietnamese)
+    (0x2000, 0x206F), (0x20A0, 0x20CF),    # punctuation, currency
+    (0x2190, 0x21FF), (0x2200, 0x22FF),    # arrows, mathematical operators
+    (0x25A0, 0x25FF),                      # geometric shapes
+]
+UNICODE_FONT = all((FONT_DIR / f).exists() for f in _FONT_FILES.values())
+FPDF_INTERNALS = FPDF_VERSION.startswith("2.8.")  # font and page internals are known
+
+
+# ── Fonts ────────────────────────────────────────────────────────────────────
+
+@lru_cache(maxsize=None)
+def _font_face(style: str) -> tuple:
+    """Load one bundled face once per process; returns (font, file bytes).
+
+    The face is first cut down to the Latin, Vietnamese and punctuation
+    ranges the reports can contain, which keeps per-report subsetting cheap.
+    """
+    tt = ttLib.TTFont(FONT_DIR / _FONT_FILES[style], recalcTimestamp=False)
+    options = ftsubset.Options(notdef_outline=True, recommended_glyphs=True)
+    options.drop_tables += ["FFTM"]
+    subsetter = ftsubset.Subsetter(options)
+    subsetter.populate(unicodes=[c for lo, hi in _WORKING_SET for c in range(lo, hi + 1)])
+    subsetter.subset(tt)
+    buf = io.BytesIO()
+    tt.save(buf)
+    data = buf.getvalue()
+    font = TTFFont(FPDF(), io.BytesIO(data), f"{FONT_FAMILY.lower()}{style}", style)
+    return font, data
+
+
+def _register_fonts(pdf: FPDF) -> None:
+    """Attach per-report clones of the cached faces to `pdf`.
+
+    Subsetting at output time rewrites the font's table in place, so each
+    clone gets its own lazily loaded copy of the file alongside a fresh
+    subset map; metrics and the character map stay shared.
+    """
+    if not FPDF_INTERNALS:
+        for style, name in _FONT_FILES.items():
+            pdf.add_font(FONT_FAMILY, style, FONT_DIR / name)
+        return
+    for style in _FONT_FILES:
+        face, data = _font_face(style)
+        font = copy.copy(face)
+        font.i = len(pdf.fonts) + 1
+        font.ttfont = ttLib.TTFont(io.BytesIO(data), recalcTimestamp=False, lazy=True)
+        font.missing_glyphs = []
+        font.biggest_size_pt = 0
+        font.subset = SubsetMap(font)
+        pdf.fonts[face.fontkey] = font
+
+
+class ReportPDF(FPDF):
+    """FPDF document with the report font family registered."""
+
+    def __init__(self):
+        super().__init__()
+        self.text_font = FONT_FAMILY if UNICODE_FONT else "Helvetica"
+        if UNICODE_FONT:
+            _register_fonts(self)
 
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
 def _safe(text: str) -> str:
-    """Strip HTML tags and replace Unicode chars unsupported by Helvetica."""
+    """Strip HTML tags; without the Unicode font, also replace characters
+    Helvetica cannot render."""
+    text = text.replace("<strong>", "").replace("</strong>", "")
+    if UNICODE_FONT:
+        return text
     return (text
-            .replace("<strong>", "").replace("</strong>", "")
             .replace("\u2014", "--").replace("\u2013", "-")
             .replace("\u2018", "'").replace("\u2019", "'")
             .replace("\u201c", '"').replace("\u201d", '"'))
 
 
-def _section_heading(pdf: FPDF, title: str) -> None:
+def _section_heading(pdf: ReportPDF, title: str) -> None:
     """Render a coloured section heading bar."""
-    pdf.set_font("Helvetica", "B", 12)
+    pdf.set_font(pdf.text_font, "B", 12)
     pdf.set_fill_color(240, 244, 248)
     pdf.set_text_color(30, 41, 59)
     pdf.cell(0, 9, f"  {title}", new_x="LMARGIN", new_y="NEXT", fill=True)
@@ -41,23 +137,36 @@ def _section_heading(pdf: FPDF, title: str) -> None:
     pdf.set_text_color(0, 0, 0)
 
 
-def _body_text(pdf: FPDF, text: str, size: int = 10) -> None:
-    pdf.set_font("Helvetica", "", size)
+def _body_text(pdf: ReportPDF, text: str, size: int = 10) -> None:
+    pdf.set_font(pdf.text_font, "", size)
     pdf.set_text_color(55, 65, 81)
     pdf.multi_cell(0, 5.5, _safe(text))
     pdf.ln(2)
 
 
-def _sub_heading(pdf: FPDF, title: str) -> None:
-    pdf.set_font("Helvetica", "B", 10)
+def _sub_heading(pdf: ReportPDF, title: str) -> None:
+    pdf.set_font(pdf.text_font, "B", 10)
     pdf.set_text_color(30, 41, 59)
     pdf.cell(0, 7, title, new_x="LMARGIN", new_y="NEXT")
 
 
 # ── Main generator ───────────────────────────────────────────────────────────
 
-def generate_pdf(lang: str, inputs_dict: dict, cls_name: str, mal_pct: float) -> bytes:
-    """Build a comprehensive clinical PDF report and return raw bytes."""
+def generate_pdf(lang: str, inputs_dict: dict, cls_name: str, mal_pct: float,
+                 estimated=(), band: tuple[float, float] | None = None,
+                 spread: tuple[float, float, float] | None = None,
+                 metrics: dict | None = None, radar_mode: str = "range") -> bytes:
+    """Build a comprehensive clinical PDF report and return raw bytes.
+
+    `estimated` lists feature keys that were imputed rather than measured and
+    `band` is the matching (low, high) malignancy percentage range.
+    `spread` is the (low, high, SD) malignancy percentage from resampling
+    the mean measurements within their standard errors.
+    `metrics` (from `compute_model_metrics`, computed if omitted) supplies
+    the class averages and ROC curve for the charts.
+    """
+    if metrics is None:
+        metrics = compute_model_metrics()
     is_malignant = mal_pct >= 50
     ben_pct = 100 - mal_pct
 
@@ -77,7 +186,7 @@ def generate_pdf(lang: str, inputs_dict: dict, cls_name: str, mal_pct: float) ->
     avg_texture   = float(FEAT_MEAN[1])
     avg_symmetry  = float(FEAT_MEAN[8])
 
-    pdf = FPDF()
+    pdf = ReportPDF()
     pdf.set_auto_page_break(auto=True, margin=20)
 
     # ═════════════════════════════════════════════════════════════════════════
@@ -87,12 +196,12 @@ def generate_pdf(lang: str, inputs_dict: dict, cls_name: str, mal_pct: float) ->
     pdf.add_page()
 
     # Title block
-    pdf.set_font("Helvetica", "B", 20)
+    pdf.set_font(pdf.text_font, "B", 20)
     pdf.set_text_color(30, 41, 59)
     pdf.cell(0, 12, t("pdf_clinical_report", lang),
              new_x="LMARGIN", new_y="NEXT", align="C")
 
-    pdf.set_font("Helvetica", "", 9)
+    pdf.set_font(pdf.text_font, "", 9)
     pdf.set_text_color(120, 120, 120)
     pdf.cell(0, 6, f"{t('pdf_date', lang)}: {date.today().isoformat()}",
              new_x="LMARGIN", new_y="NEXT", align="C")
@@ -106,7 +215,7 @@ def generate_pdf(lang: str, inputs_dict: dict, cls_name: str, mal_pct: float) ->
     pdf.ln(6)
 
     # Classification result
-    pdf.set_font("Helvetica", "B", 16)
+    pdf.set_font(pdf.text_font, "B", 16)
     if is_malignant:
         pdf.set_text_color(220, 38, 38)
     else:
@@ -129,7 +238,7 @@ def generate_pdf(lang: str, inputs_dict: dict, cls_name: str, mal_pct: float) ->
     pdf.ln(bar_h + 2)
 
     # Labels under bar
-    pdf.set_font("Helvetica", "", 8)
+    pdf.set_font(pdf.text_font, "", 8)
     pdf.set_text_color(120, 120, 120)
     pdf.cell(bar_w / 2, 5, f"{t('benign', lang)}: {ben_pct:.1f}%",
              align="L")
@@ -137,6 +246,37 @@ def generate_pdf(lang: str, inputs_dict: dict, cls_name: str, mal_pct: float) ->
              new_x="LMARGIN", new_y="NEXT", align="R")
     pdf.ln(6)
 
+    # Partial-input note
+    if band is not None:
+        pdf.set_font(pdf.text_font, "I", 9)
+        pdf.set_text_color(55, 65, 81)
+        pdf.multi_cell(0, 5, _safe(t("partial_info", lang, n=len(estimated),
+                                     lo=band[0], hi=band[1])))
+        pdf.ln(3)
+
+    # Measurement-error note
+    if spread is not None:
+        pdf.set_font(pdf.text_font, "I", 9)
+        pdf.set_text_color(55, 65, 81)
+        pdf.multi_cell(0, 5, _safe(t("mc_info", lang, n=N_DRAWS, lo=spread[0],
+                                     hi=spread[1], sd=spread[2])))
+        pdf.ln(3)
+
+    # Out-of-distribution warning
+    ood = ood_score([float(inputs_dict.get(k) or 0) for k in FEATURE_ORDER])
+    if ood["is_ood"][0]:
+        warn = t("ood_warning", lang, dist=ood["distance"][0],
+                 limit=ood["threshold"])
+        flagged = [FULL_LABELS[lang][i] for i in ood["flags"][0].nonzero()[0]]
+        if flagged:
+            warn += "\n" + t("ood_features", lang, fields=", ".join(flagged))
+        pdf.set_font(pdf.text_font, "B", 9)
+        pdf.set_fill_color(254, 243, 199)
+        pdf.set_text_color(146, 64, 14)
+        pdf.multi_cell(0, 5, _safe(warn), fill=True)
+        pdf.set_text_color(0, 0, 0)
+        pdf.ln(4)
+
     # Clinical summary
     _section_heading(pdf, t("pdf_summary_title", lang))
     summary_key = "pdf_summary_malignant" if is_malignant else "pdf_summary_benign"
@@ -178,20 +318,54 @@ def generate_pdf(lang: str, inputs_dict: dict, cls_name: str, mal_pct: float) ->
     pdf.ln(2)
     _section_heading(pdf, t("sidebar_title", lang))
 
+    pct = percentile_rank([float(inputs_dict.get(k) or 0) for k in FEATURE_ORDER])
+    pct_by_key = dict(zip(FEATURE_ORDER, pct))
+
+    pdf.set_font(pdf.text_font, "B", 8)
+    pdf.set_text_color(120, 120, 120)
+    pdf.cell(50, 5, "")
+    pdf.cell(40, 5, t("pdf_value", lang))
+    pdf.cell(30, 5, t("pdf_percentile", lang), new_x="LMARGIN", new_y="NEXT")
+
     for _sid, feat_list, sec_key, _ in SECTIONS:
-        pdf.set_font("Helvetica", "B", 9)
+        pdf.set_font(pdf.text_font, "B", 9)
         pdf.set_fill_color(230, 236, 242)
         pdf.set_text_color(30, 41, 59)
         pdf.cell(0, 6, f"  {t(sec_key, lang)}", new_x="LMARGIN",
                  new_y="NEXT", fill=True)
-        pdf.set_font("Helvetica", "", 9)
+        pdf.set_font(pdf.text_font, "", 9)
         pdf.set_text_color(55, 65, 81)
         for key, en_label, vi_label, *_ in feat_list:
             lbl = en_label if lang == "en" else vi_label
             val = inputs_dict.get(key, 0)
             pdf.cell(50, 5.5, f"    {lbl}")
-            pdf.cell(40, 5.5, f"{val:.6f}", new_x="LMARGIN", new_y="NEXT")
+            pdf.cell(40, 5.5, f"{val:.6f}{' *' if key in estimated else ''}")
+            pdf.cell(30, 5.5, f"{pct_by_key[key]:.0f}", new_x="LMARGIN",
+                     new_y="NEXT")
         pdf.ln(1)
+    if estimated:
+        pdf.set_font(pdf.text_font, "I", 8)
+        pdf.set_text_color(120, 120, 120)
+        pdf.cell(0, 5, f"* {t('pdf_estimated', lang)}", new_x="LMARGIN", new_y="NEXT")
+
+    # ═════════════════════════════════════════════════════════════════════════
+    #  Charts
+    # ═════════════════════════════════════════════════════════════════════════
+
+    values = [float(inputs_dict.get(k) or 0) for k in FEATURE_ORDER]
+    half = (pdf.w - pdf.l_margin - pdf.r_margin) / 2
+    if pdf.get_y() + half + 16 > pdf.h - pdf.b_margin:
+        pdf.add_page()
+    else:
+        pdf.ln(6)
+    top = pdf.get_y()
+    _sub_heading(pdf, t("radar_title", lang))
+    draw_radar(pdf, pdf.l_margin, top + 8, half - 4, values,
+               metrics["benign_avg"], metrics["malignant_avg"], lang, radar_mode)
+    pdf.set_xy(pdf.l_margin + half, top)
+    _sub_heading(pdf, t("contribution_title", lang))
+    draw_contribution(pdf, pdf.l_margin + half, top + 12, half, half - 12, values, lang)
+    pdf.set_xy(pdf.l_margin, top + half + 8)
 
     # ═════════════════════════════════════════════════════════════════════════
     #  PAGE 3 — Interpretation, Next Steps, Patient Note
@@ -207,7 +381,7 @@ def generate_pdf(lang: str, inputs_dict: dict, cls_name: str, mal_pct: float) ->
     # Next steps
     _section_heading(pdf, t("next_steps_title", lang))
     skey = "next_steps_malignant" if is_malignant else "next_steps_benign"
-    pdf.set_font("Helvetica", "", 10)
+    pdf.set_font(pdf.text_font, "", 10)
     pdf.set_text_color(55, 65, 81)
     for i, step in enumerate(LANG[skey][lang], 1):
         pdf.multi_cell(0, 5.5, _safe(f"  {i}. {step}"))
@@ -217,7 +391,7 @@ def generate_pdf(lang: str, inputs_dict: dict, cls_name: str, mal_pct: float) ->
     # Empathetic patient note
     _section_heading(pdf, t("pdf_reassurance_title", lang))
     rkey = "pdf_reassurance_malignant" if is_malignant else "pdf_reassurance_benign"
-    pdf.set_font("Helvetica", "I", 10)
+    pdf.set_font(pdf.text_font, "I", 10)
     pdf.set_text_color(55, 65, 81)
     pdf.multi_cell(0, 5.5, _safe(t(rkey, lang)))
     pdf.ln(4)
@@ -230,7 +404,7 @@ def generate_pdf(lang: str, inputs_dict: dict, cls_name: str, mal_pct: float) ->
 
     # Lifestyle advice
     _section_heading(pdf, t("pdf_lifestyle_title", lang))
-    pdf.set_font("Helvetica", "", 10)
+    pdf.set_font(pdf.text_font, "", 10)
     pdf.set_text_color(55, 65, 81)
     for i, advice in enumerate(LANG["pdf_lifestyle"][lang], 1):
         pdf.multi_cell(0, 5.5, _safe(f"  {i}. {advice}"))
@@ -240,13 +414,21 @@ def generate_pdf(lang: str, inputs_dict: dict, cls_name: str, mal_pct: float) ->
     # Model methodology note
     _section_heading(pdf, t("pdf_model_note_title", lang))
     _body_text(pdf, t("pdf_model_note", lang), size=9)
+    roc_size = 62
+    if pdf.get_y() + roc_size + 8 > pdf.h - pdf.b_margin:
+        pdf.add_page()
+    _sub_heading(pdf, t("roc_curve", lang))
+    top = pdf.get_y()
+    draw_roc(pdf, pdf.l_margin, top, roc_size, metrics["fpr"], metrics["tpr"],
+             metrics["roc_auc"])
+    pdf.set_xy(pdf.l_margin, top + roc_size)
     pdf.ln(4)
 
     # Disclaimer
     pdf.set_draw_color(200, 200, 200)
     pdf.line(pdf.l_margin, pdf.get_y(), pdf.w - pdf.r_margin, pdf.get_y())
     pdf.ln(4)
-    pdf.set_font("Helvetica", "I", 8)
+    pdf.set_font(pdf.text_font, "I", 8)
     pdf.set_text_color(120, 120, 120)
     pdf.multi_cell(0, 4.5, _safe(t("disclaimer", lang)))
 
@@ -0,0 +1,38 @@
+"""
+Population percentile ranks for the 30 features.
+
+A sorted per-feature value table is built once from the reference
+population; ranking one or many cases is then a `searchsorted` per feature
+column.
+"""
+
+import numpy as np
+import streamlit as st
+
+from .model import load_reference
+
+
+@st.cache_resource
+def percentile_table() -> np.ndarray:
+    """Return the column-sorted (n, 30) reference table."""
+    X, _ = load_reference()
+    tbl = np.sort(X, axis=0)
+    tbl.flags.writeable = False
+    return tbl
+
+
+def percentile_rank(X) -> np.ndarray:
+    """Mid-rank percentile (0-100) of each value against the reference population.
+
+    Accepts one case (30,) or a batch (N, 30); the output has the same shape.
+    """
+    tbl = percentile_table()
+    X = np.asarray(X, dtype=float)
+    Xb = np.atleast_2d(X)
+    ranks = np.empty_like(Xb)
+    for j in range(tbl.shape[1]):
+        col = tbl[:, j]
+        lo = np.searchsorted(col, Xb[:, j], side="left")
+        hi = np.searchsorted(col, Xb[:, j], side="right")
+        ranks[:, j] = (lo + hi) * (50.0 / len(col))
+    return ranks.reshape(X.shape)
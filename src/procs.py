@@ -0,0 +1,19 @@
+"""
+Process checks shared by the modules that keep one file per server process
+(`drift.py`, `triage.py`).
+"""
+
+import os
+
+
+def pid_alive(pid: int) -> bool:
+    """Whether process `pid` still exists; always True off POSIX."""
+    if os.name != "posix":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:     # exists, but belongs to another user
+        pass
+    return True
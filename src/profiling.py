@@ -0,0 +1,192 @@
+"""
+On-demand sampling profiler for individual sessions.
+
+A rerun is profiled when `BCR_PROFILE=1` is set (every session) or when
+the page is opened with `?profile=<token>` and `BCR_PROFILE_TOKEN` holds the
+same token (one session, e.g. a clinician reporting a slow app).  Nothing is
+sampled otherwise and `stage()` is a no-op.
+
+While a rerun is profiled, a daemon thread samples the script thread's stack
+every `INTERVAL` seconds; the script itself is not traced, so the overhead
+is a few percent at most.  Each sample is rooted at the `app.py` frame and
+prefixed with the active stage(s), e.g. `[charts];render_case (app.py:164);...`.
+At the end of the rerun -- or, after an exception, `st.stop` or `st.rerun`,
+as soon as the sampler finds the script's frame gone -- the counts are
+written in collapsed-stack format, which `flamegraph.pl`, speedscope and
+inferno read directly, to
+`$BCR_PROFILE_DIR/<session>/<time>-<run>-<ms>ms.folded` (default `./profiles`).
+
+Usage:
+    python -m src.profiling profiles/<session>/*.folded   # time per stage, hottest frames
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import streamlit as st
+
+from .memprof import session_id
+
+ENABLED = os.environ.get("BCR_PROFILE", "") not in ("", "0")
+TOKEN = os.environ.get("BCR_PROFILE_TOKEN", "")
+QUERY_PARAM = "profile"
+INTERVAL = 0.005        # seconds between samples (200 Hz)
+TOP_FRAMES = 15         # frames listed by the summary CLI
+
+
+def _label(code) -> str:
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class _Run(threading.Thread):
+    """Samples one thread's stack until stopped; one instance per rerun."""
+
+    def __init__(self, sid: str, thread_id: int, root):
+        super().__init__(name="bcr-profiler", daemon=True)
+        self.sid = sid
+        self.thread_id = thread_id
+        self.root = root                  # the app script's frame for this rerun
+        self.root_file = root.f_code.co_filename
+        self.stages: list[str] = []
+        self.counts: Counter = Counter()
+        self.started = time.perf_counter()
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        while not self._done.wait(INTERVAL):
+            frame = sys._current_frames().get(self.thread_id)
+            if not self._in_rerun(frame):
+                # The script left without end_run (exception, st.stop, st.rerun)
+                with _lock:
+                    if _runs.get(self.sid) is not self:
+                        return
+                    del _runs[self.sid]
+                self._write(time.perf_counter() - self.started)
+                return
+            self.counts[self._collapse(frame)] += 1
+
+    def _in_rerun(self, frame) -> bool:
+        while frame is not None:
+            if frame is self.root:
+                return True
+            frame = frame.f_back
+        return False
+
+    def _collapse(self, frame) -> str:
+        codes = []
+        while frame is not None:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        codes.reverse()
+        # Drop Streamlit's script-runner frames above the app script
+        root = next((i for i, c in enumerate(codes) if c.co_filename == self.root_file), 0)
+        tags = [f"[{s}]" for s in (self.stages or ["other"])]
+        return ";".join(tags + [_label(c) for c in codes[root:]])
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        self.stages.append(name)
+        try:
+            yield
+        finally:
+            self.stages.pop()
+
+    def finish(self) -> Path:
+        """Stop sampling and write the collapsed stacks."""
+        self._done.set()
+        self.join()
+        return self._write(time.perf_counter() - self.started)
+
+    def _write(self, elapsed: float) -> Path:
+        self.root = None
+        with _lock:
+            _seq[self.sid] += 1
+            seq = _seq[self.sid]
+        directory = Path(os.environ.get("BCR_PROFILE_DIR", "profiles")) / self.sid
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / (f"{time.strftime('%Y%m%d-%H%M%S')}-{seq:04d}"
+                            f"-{elapsed * 1e3:.0f}ms.folded")
+        path.write_text("".join(f"{stack} {n}\n" for stack, n in self.counts.most_common()))
+        return path
+
+
+_runs: dict[str, _Run] = {}       # session id -> rerun being profiled
+_seq: Counter = Counter()         # reruns written per session
+_lock = threading.Lock()          # guards both; samplers also close their own runs
+
+
+def requested() -> bool:
+    """Whether this session asked to be profiled."""
+    if ENABLED:
+        return True
+    return bool(TOKEN) and st.query_params.get(QUERY_PARAM) == TOKEN
+
+
+def start_run() -> None:
+    """Start sampling the calling script's rerun if profiling is requested.
+
+    A rerun that ends without reaching `end_run` is closed by its sampler,
+    which stops once the script's frame is gone from the thread's stack.
+    """
+    sid = session_id()
+    if sid in _runs:                 # previous rerun not closed yet
+        end_run()
+    if not requested():
+        return
+    run = _Run(sid, threading.get_ident(), sys._getframe(1))
+    _runs[sid] = run
+    run.start()
+
+
+def stage(name: str):
+    """Tag samples taken inside the block with `name`."""
+    run = _runs.get(session_id()) if _runs else None
+    return run.stage(name) if run is not None else contextlib.nullcontext()
+
+
+def end_run() -> Path | None:
+    """Stop sampling and write this rerun's collapsed stacks."""
+    with _lock:
+        run = _runs.pop(session_id(), None)
+    return run.finish() if run is not None else None
+
+
+# ── Summary ──────────────────────────────────────────────────────────────────
+
+def summarize(paths) -> dict:
+    """Sample counts per stage and per leaf frame over collapsed-stack files."""
+    stages, leaves = Counter(), Counter()
+    for path in paths:
+        for line in Path(path).read_text().splitlines():
+            stack, _, n = line.rpartition(" ")
+            frames = stack.split(";")
+            stage_tags = [f for f in frames if f.startswith("[")]
+            stages["/".join(f.strip("[]") for f in stage_tags)] += int(n)
+            leaves[frames[-1]] += int(n)
+    return dict(total=sum(stages.values()), stages=stages, leaves=leaves)
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Summarise collapsed-stack profiles.")
+    ap.add_argument("files", nargs="+", type=Path, help=".folded files written by the app")
+    args = ap.parse_args(argv)
+
+    s = summarize(args.files)
+    total = s["total"] or 1
+    print(f"{s['total']} samples ({s['total'] * INTERVAL * 1e3:.0f} ms) in {len(args.files)} reruns\n")
+    print(f"{'stage':<28} {'samples':>8} {'share':>7}")
+    for name, n in s["stages"].most_common():
+        print(f"{name:<28} {n:>8} {n / total:>7.1%}")
+    print(f"\n{'self time (leaf frame)':<60} {'samples':>8} {'share':>7}")
+    for name, n in s["leaves"].most_common(TOP_FRAMES):
+        print(f"{name[:60]:<60} {n:>8} {n / total:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
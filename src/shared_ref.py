@@ -0,0 +1,227 @@
+"""
+Host-wide sharing of read-only arrays through `multiprocessing.shared_memory`.
+
+Enabled by setting `BCR_SHARED_REF=1`.  The first Streamlit process on a host
+to need the reference data builds it and publishes it into one named block;
+every other process attaches and gets zero-copy, read-only NumPy views.
+
+Block layout (`bcr_<key>_s<SCHEMA>`):
+  - 16-byte header: state (0 = being written, 1 = ready), manifest length
+  - JSON manifest: dtype / shape / offset of each array, plus scalar values
+  - array data, each array 64-byte aligned
+
+The key carries the model version, so a model swap publishes a new block
+instead of touching the one older workers are reading.  The next publisher
+unlinks the blocks it supersedes -- same key with another version, or an
+older layout SCHEMA -- and leaves every other block alone (mappings of
+unlinked blocks stay valid until the old workers exit).  Blocks are deliberately left out of `resource_tracker`, so
+a worker exiting does not destroy a block the others still use.
+
+Usage:
+    python -m src.shared_ref            # list published blocks
+    python -m src.shared_ref --unlink   # remove the stale ones (e.g. after a deploy)
+"""
+
+import argparse
+import json
+import os
+import time
+from collections.abc import Callable
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+
+import numpy as np
+
+ENABLED = os.environ.get("BCR_SHARED_REF", "") not in ("", "0")
+PREFIX = "bcr_"
+SCHEMA = 1               # bump when the block layout changes
+ATTACH_TIMEOUT = 30.0    # seconds to wait for another process to finish publishing
+HEADER = 16
+ALIGN = 64
+WRITING, READY = 0, 1
+
+_segments: dict[str, SharedMemory] = {}   # kept open for the life of the process
+
+
+def block_name(key: str) -> str:
+    return f"{PREFIX}{key}_s{SCHEMA}"
+
+
+def _split(name: str) -> tuple[str, str]:
+    """(key without its trailing `_<version>`, schema) of a block name."""
+    key, _, schema = name.removeprefix(PREFIX).rpartition("_s")
+    return key.rpartition("_")[0], schema
+
+
+def _align(n: int) -> int:
+    return -(-n // ALIGN) * ALIGN
+
+
+def _open(name: str, create: bool = False, size: int = 0) -> SharedMemory:
+    shm = SharedMemory(name, create=create, size=size)
+    if os.name == "posix":
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def read_only(arrays: dict) -> dict:
+    """Mark every array in `arrays` read-only; returns the same dict."""
+    for v in arrays.values():
+        if isinstance(v, np.ndarray):
+            v.flags.writeable = False
+    return arrays
+
+
+# ── Publish / attach ─────────────────────────────────────────────────────────
+
+def publish(name: str, values: dict) -> dict:
+    """Create block `name` holding `values` (arrays and JSON scalars).
+
+    Raises `FileExistsError` when another process got there first.
+    """
+    arrays = {k: np.ascontiguousarray(v) for k, v in values.items()
+              if isinstance(v, np.ndarray)}
+    entries, offset = {}, 0
+    for k, a in arrays.items():
+        entries[k] = dict(dtype=a.dtype.str, shape=list(a.shape), offset=offset)
+        offset += _align(a.nbytes)
+    scalars = {k: v for k, v in values.items() if k not in arrays}
+    manifest = json.dumps(dict(arrays=entries, scalars=scalars)).encode()
+    start = _align(HEADER + len(manifest))
+
+    shm = _open(name, create=True, size=start + max(offset, 1))
+    header = np.ndarray((2,), np.uint64, buffer=shm.buf)
+    header[:] = (WRITING, len(manifest))
+    shm.buf[HEADER:HEADER + len(manifest)] = manifest
+    for k, a in arrays.items():
+        np.ndarray(a.shape, a.dtype, buffer=shm.buf, offset=start + entries[k]["offset"])[...] = a
+    header[0] = READY
+    _segments[name] = shm
+    unlink_stale(keep=name)
+    return _views(shm)
+
+
+def _views(shm: SharedMemory) -> dict:
+    length = int(np.ndarray((2,), np.uint64, buffer=shm.buf)[1])
+    manifest = json.loads(bytes(shm.buf[HEADER:HEADER + length]))
+    start = _align(HEADER + length)
+    out = {k: np.ndarray(tuple(e["shape"]), np.dtype(e["dtype"]), buffer=shm.buf,
+                         offset=start + e["offset"])
+           for k, e in manifest["arrays"].items()}
+    out.update(manifest["scalars"])
+    return read_only(out)
+
+
+def attach(name: str, timeout: float = ATTACH_TIMEOUT) -> dict | None:
+    """Views onto block `name`, or None if nobody has published it.
+
+    Waits up to `timeout` for a publisher that is still writing; raises
+    `TimeoutError` if it never finishes.
+    """
+    deadline = time.monotonic() + timeout
+    shm = _segments.get(name)
+    while True:
+        if shm is None:
+            try:
+                shm = _open(name)
+            except FileNotFoundError:
+                return None
+            except ValueError:          # created but not yet sized
+                pass
+        if shm is not None and int(np.ndarray((1,), np.uint64, buffer=shm.buf)[0]) == READY:
+            _segments[name] = shm
+            return _views(shm)
+        if time.monotonic() > deadline:
+            if shm is not None and name not in _segments:
+                shm.close()
+            raise TimeoutError(f"shared block {name} was never completed")
+        time.sleep(0.05)                # keep polling the same handle
+
+
+def attach_or_publish(key: str, build: Callable[[], dict]) -> dict:
+    """Attach to the block for `key`, publishing `build()` if it is missing.
+
+    Falls back to a private copy when shared memory is unavailable.
+    """
+    name = block_name(key)
+    try:
+        for _ in range(2):
+            try:
+                found = attach(name)
+            except TimeoutError:        # publisher died half-way: start over
+                unlink(name)
+                continue
+            if found is not None:
+                return found
+            try:
+                return publish(name, build())
+            except FileExistsError:     # lost the race; attach to the winner's block
+                continue
+    except OSError:
+        pass
+    return read_only(build())
+
+
+# ── Housekeeping ─────────────────────────────────────────────────────────────
+
+def segments() -> list[str]:
+    """Names of published blocks (Linux only: read from /dev/shm)."""
+    shm_dir = Path("/dev/shm")
+    if not shm_dir.is_dir():
+        return []
+    return sorted(p.name for p in shm_dir.glob(f"{PREFIX}*"))
+
+
+def unlink(name: str) -> None:
+    """Remove block `name`; processes already attached keep their mapping."""
+    try:
+        shm = _open(name)
+    except (FileNotFoundError, ValueError):
+        return
+    shm.close()
+    if os.name == "posix":      # unlink() unregisters the block again
+        resource_tracker.register(shm._name, "shared_memory")
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def unlink_stale(keep: str) -> list[str]:
+    """Unlink the blocks `keep` supersedes: the same key with another version,
+    or any block written with another SCHEMA.  Blocks of other keys (and
+    other deployments publishing them) are left alone."""
+    stem = _split(keep)[0]
+    stale = [n for n in segments() if n != keep
+             and (_split(n)[1] != str(SCHEMA) or _split(n)[0] == stem)]
+    for name in stale:
+        unlink(name)
+    return stale
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="List or remove shared reference blocks.")
+    ap.add_argument("--unlink", action="store_true",
+                    help="remove blocks of an older model version or layout schema")
+    args = ap.parse_args(argv)
+
+    if args.unlink:
+        from .model import MODEL_VERSION     # only needed to tell which blocks are current
+        for name in unlink_stale(keep=block_name(f"ref_{MODEL_VERSION}")):
+            print(f"unlinked {name}")
+        return
+    for name in segments():
+        try:
+            views = attach(name, timeout=0)
+        except TimeoutError:
+            print(f"{name}  (incomplete)")
+            continue
+        arrays = {k: v for k, v in views.items() if isinstance(v, np.ndarray)}
+        size = sum(a.nbytes for a in arrays.values())
+        print(f"{name}  {size:,} bytes  " +
+              ", ".join(f"{k}{list(a.shape)}" for k, a in arrays.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Synthetic cohorts for load and scale testing.
+
+Cases are drawn from one multivariate normal per class, fitted to the
+reference data (`class_statistics`: the per-class means shown on the radar
+chart plus per-class covariances), and clipped at zero because every
+measurement is non-negative.  Labels follow the reference convention
+(0 = malignant, 1 = benign) with a controllable malignant fraction.
+
+Output is produced in chunks, each from its own child of one
+`SeedSequence`, so a given (seed, chunk size) always yields the same cohort
+whatever the output format.  Writers stream chunk by chunk:
+  - `.csv`  header with the 30 feature names plus `target`
+  - `.npy`  (N, 30) float64 via `open_memmap`, labels in `<stem>.labels.npy`
+  - `.dat`  raw C-order float64 `np.memmap` (N, 30), labels as above
+
+Usage:
+    python -m src.synthetic cohort.csv -n 1000000 [--malignant 0.5] [--seed 0]
+"""
+
+import argparse
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+
+from .config import FEATURE_ORDER
+from .model import class_statistics
+
+CHUNK_SIZE = 100_000
+FORMATS = (".csv", ".npy", ".dat")
+
+
+# ── Sampling ─────────────────────────────────────────────────────────────────
+
+def generate_cohort(n: int, malignant_frac: float | None = None, seed: int = 0,
+                    chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Yield (X, y) chunks totalling `n` synthetic cases.
+
+    `malignant_frac` defaults to the reference population's share.
+    """
+    stats = class_statistics()
+    frac = stats["malignant_frac"] if malignant_frac is None else malignant_frac
+    if not 0.0 <= frac <= 1.0:
+        raise ValueError("malignant_frac must be between 0 and 1")
+    classes = [  # indexed by label
+        (stats["malignant_avg"], np.linalg.cholesky(stats["malignant_cov"])),
+        (stats["benign_avg"], np.linalg.cholesky(stats["benign_cov"])),
+    ]
+    n_chunks = -(-n // chunk_size)
+    for i, ss in enumerate(np.random.SeedSequence(seed).spawn(n_chunks)):
+        rng = np.random.default_rng(ss)
+        m = min(chunk_size, n - i * chunk_size)
+        y = (rng.random(m) >= frac).astype(np.int8)
+        X = np.empty((m, len(FEATURE_ORDER)))
+        for label, (mean, chol) in enumerate(classes):
+            rows = y == label
+            X[rows] = mean + rng.standard_normal((int(rows.sum()), len(mean))) @ chol.T
+        np.maximum(X, 0.0, out=X)
+        yield X, y
+
+
+# ── Writers ──────────────────────────────────────────────────────────────────
+
+def labels_path(path) -> Path:
+    path = Path(path)
+    return path.with_name(f"{path.stem}.labels.npy")
+
+
+def write_cohort(path, n: int, malignant_frac: float | None = None, seed: int = 0,
+                 chunk_size: int = CHUNK_SIZE) -> Path:
+    """Stream a synthetic cohort to `path`; the format follows its suffix."""
+    path = Path(path)
+    fmt = path.suffix.lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"unsupported output format {fmt!r} (use {', '.join(FORMATS)})")
+    chunks = generate_cohort(n, malignant_frac, seed, chunk_size)
+    shape = (n, len(FEATURE_ORDER))
+
+    if fmt == ".csv":
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(",".join([*FEATURE_ORDER, "target"]) + "\n")
+            for X, y in chunks:
+                np.savetxt(f, np.column_stack([X, y]), delimiter=",",
+                           fmt=["%.8g"] * shape[1] + ["%d"])
+        return path
+
+    if fmt == ".npy":
+        X_out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=shape)
+    else:
+        X_out = np.memmap(path, mode="w+", dtype=np.float64, shape=shape)
+    y_out = np.lib.format.open_memmap(labels_path(path), mode="w+", dtype=np.int8,
+                                      shape=(n,))
+    start = 0
+    for X, y in chunks:
+        X_out[start:start + len(X)] = X
+        y_out[start:start + len(y)] = y
+        start += len(X)
+    X_out.flush()
+    y_out.flush()
+    del X_out, y_out
+    return path
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Generate a synthetic cohort.")
+    ap.add_argument("output", type=Path, help=f"output file ({', '.join(FORMATS)})")
+    ap.add_argument("-n", "--rows", type=int, required=True)
+    ap.add_argument("--malignant", type=float, default=None,
+                    help="fraction of malignant cases (default: as in the reference data)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--chunk", type=int, default=CHUNK_SIZE)
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    try:
+        write_cohort(args.output, args.rows, args.malignant, args.seed, args.chunk)
+    except ValueError as exc:
+        sys.exit(str(exc))
+    elapsed = time.perf_counter() - t0
+    print(f"wrote {args.rows:,} rows to {args.output} in {elapsed:.2f}s "
+          f"({args.rows / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
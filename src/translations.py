@@ -14,6 +14,7 @@ LANG = {
         "vi": "Nhap <strong>30 chi so do nhan te bao khoi u</strong> tu sinh thiet choc hut kim nho (FNA) o thanh ben, sau do nhan <strong>Du Doan Nguy Co</strong>.",
     },
     "waiting_title":    {"en": "Awaiting Input",                                          "vi": "Dang Cho Du Lieu"},
+    "result_stale":     {"en": "The inputs changed since the last prediction. Press Predict Risk to score and record them.", "vi": "Du lieu da thay doi tu lan du doan truoc. Nhan Du Doan Nguy Co de cham diem va ghi lai."},
     "waiting_text":     {"en": "Fill in the measurements in the sidebar and click Predict Risk", "vi": "Dien cac so do o thanh ben va nhan Du Doan Nguy Co"},
     "sec_mean":         {"en": "Mean Features",       "vi": "Chi So Trung Binh"},
     "sec_se":           {"en": "Std Error Features",   "vi": "Sai So Chuan"},
@@ -28,9 +29,61 @@ LANG = {
     "stat_classification": {"en": "Classification",    "vi": "Phan Loai"},
     "stat_malignancy":  {"en": "Malignancy",           "vi": "Ac Tinh"},
     "stat_benign":      {"en": "Benign",               "vi": "Lanh Tinh"},
+    "waiting_text_batch": {"en": "Upload a CSV or NPY file of cases in the sidebar", "vi": "Tai len tep CSV hoac NPY chua cac ca o thanh ben"},
+    "mode_label":       {"en": "Input mode",          "vi": "Che do nhap"},
+    "mode_single":      {"en": "Single case",         "vi": "Mot ca"},
+    "mode_batch":       {"en": "Batch upload",        "vi": "Tai len hang loat"},
+    "batch_help":       {"en": "One case per row: 30 features in the standard order, or a CSV header naming them.", "vi": "Moi dong mot ca: 30 dac trung theo thu tu chuan, hoac dong tieu de CSV ghi ten chung."},
+    "batch_upload":     {"en": "Cases file (CSV / NPY)", "vi": "Tep ca (CSV / NPY)"},
+    "batch_error":      {"en": "Could not read the file: {err}", "vi": "Khong doc duoc tep: {err}"},
+    "batch_cases":      {"en": "Cases",               "vi": "So ca"},
+    "batch_malignant":  {"en": "Predicted malignant", "vi": "Du doan ac tinh"},
+    "batch_ood":        {"en": "Outside training range", "vi": "Ngoai pham vi huan luyen"},
+    "batch_sort":       {"en": "Sort by",             "vi": "Sap xep theo"},
+    "batch_desc":       {"en": "Descending",          "vi": "Giam dan"},
+    "batch_page":       {"en": "Page (of {pages})",   "vi": "Trang (tren {pages})"},
+    "batch_col_row":    {"en": "Row",                 "vi": "Dong"},
+    "batch_col_risk":   {"en": "Malignancy %",        "vi": "Ac tinh %"},
+    "batch_col_class":  {"en": "Classification",      "vi": "Phan loai"},
+    "batch_col_ood":    {"en": "Atypicality",         "vi": "Do bat thuong"},
+    "batch_download":   {"en": "Download scores (CSV)", "vi": "Tai diem so (CSV)"},
+    "batch_case":       {"en": "Row {n}",             "vi": "Dong {n}"},
+    "batch_select_hint": {"en": "Select a row to see its charts and PDF report.", "vi": "Chon mot dong de xem bieu do va bao cao PDF."},
+    "cohort_build":     {"en": "Build cohort report (PDF)", "vi": "Tao bao cao nhom (PDF)"},
+    "cohort_download":  {"en": "Download cohort report (PDF)", "vi": "Tai bao cao nhom (PDF)"},
+    "cohort_title":     {"en": "Cohort Report",       "vi": "Bao Cao Nhom Ca"},
+    "cohort_metrics":   {"en": "Summary",             "vi": "Tom Tat"},
+    "cohort_mean_risk": {"en": "Mean malignancy",     "vi": "Ac tinh trung binh"},
+    "cohort_uncertain": {"en": "{pct}% interval spans 50%", "vi": "Khoang {pct}% chua nguong 50%"},
+    "cohort_accuracy":  {"en": "Accuracy",            "vi": "Do chinh xac"},
+    "cohort_sensitivity": {"en": "Sensitivity",       "vi": "Do nhay"},
+    "cohort_specificity": {"en": "Specificity",       "vi": "Do dac hieu"},
+    "cohort_brier":     {"en": "Brier score",         "vi": "Diem Brier"},
+    "cohort_distribution": {"en": "Class distribution", "vi": "Phan bo lop"},
+    "cohort_histogram": {"en": "Malignancy scores",   "vi": "Phan bo diem ac tinh"},
+    "cohort_top":       {"en": "Highest-risk cases (top {k})", "vi": "Ca nguy co cao nhat (top {k})"},
+    "cohort_table":     {"en": "All cases",           "vi": "Tat ca cac ca"},
+    "cohort_col_interval": {"en": "{pct}% interval",  "vi": "Khoang {pct}%"},
+    "cohort_col_calibrated": {"en": "Calibrated %",   "vi": "Hieu chinh %"},
+    "cohort_col_label": {"en": "Actual",              "vi": "Thuc te"},
+    "cohort_page":      {"en": "Page {n}",            "vi": "Trang {n}"},
+    "triage_title":     {"en": "Review Worklist",     "vi": "Danh Sach Can Xem"},
+    "triage_desc":      {"en": "highest-risk and borderline cases", "vi": "ca nguy co cao nhat va ca can nguong"},
+    "triage_empty":     {"en": "No cases scored yet.", "vi": "Chua co ca nao duoc cham diem."},
+    "triage_caption":   {"en": "Ranked from {n:,} stored cases, up to {k} per list; open a case to see its charts and PDF.", "vi": "Xep hang tu {n:,} ca da luu, toi da {k} ca moi danh sach; mo mot ca de xem bieu do va PDF."},
+    "triage_malignant": {"en": "Highest risk",        "vi": "Nguy co cao nhat"},
+    "triage_uncertain": {"en": "Borderline (near 50%)", "vi": "Can nguong (gan 50%)"},
+    "triage_col_case":  {"en": "Case",                "vi": "Ca"},
+    "triage_col_margin": {"en": "Distance from 50%",  "vi": "Cach nguong 50%"},
+    "triage_case":      {"en": "Case #{id}",          "vi": "Ca #{id}"},
+    "triage_close":     {"en": "Close",               "vi": "Dong"},
+    "triage_missing":   {"en": "Case #{id} was not found in the case store.", "vi": "Khong tim thay ca #{id} trong kho ca."},
     "error_missing":    {"en": "Please fill in all {n} remaining fields.", "vi": "Vui long dien day du {n} truong con thieu."},
     "error_missing_list": {"en": "Missing: {fields}",  "vi": "Con thieu: {fields}"},
     "error_and_more":   {"en": " and {n} more...",     "vi": " va {n} truong khac..."},
+    "ood_warning":      {"en": "These measurements are unusual compared with the training population (distance {dist:.1f}, typical limit {limit:.1f}). The prediction may be unreliable -- please double-check the inputs.",
+                         "vi": "Cac so do nay bat thuong so voi quan the huan luyen (khoang cach {dist:.1f}, gioi han thong thuong {limit:.1f}). Du doan co the khong dang tin cay -- vui long kiem tra lai du lieu nhap."},
+    "ood_features":     {"en": "Out-of-range fields: {fields}", "vi": "Truong ngoai pham vi: {fields}"},
     "interpret_title":  {"en": "What Does This Mean?", "vi": "Ket Qua Nay Co Y Nghia Gi?"},
     "interpret_benign": {
         "en": "The model predicts the tumor is <strong>likely benign</strong> (non-cancerous). Benign tumors do not spread to other parts of the body and are generally not life-threatening. However, they should still be monitored.",
@@ -80,17 +133,55 @@ LANG = {
     "sample_benign":     {"en": "Benign Example",      "vi": "Vi du Lanh Tinh"},
     "sample_malignant":  {"en": "Malignant Example",   "vi": "Vi du Ac Tinh"},
     "progress_text":     {"en": "{n}/30 fields filled", "vi": "Da dien {n}/30 truong"},
+    "ensemble_interval": {"en": "Model uncertainty: {lo:.1f}% to {hi:.1f}% (90% interval of {med:.1f}% median over bootstrap refits)", "vi": "Do bat dinh cua mo hinh: {lo:.1f}% den {hi:.1f}% (khoang 90% quanh trung vi {med:.1f}% qua cac lan huan luyen lai bootstrap)"},
+    "calibrated_prob":   {"en": "Calibrated malignancy probability: {pct:.1f}% ({method} scaling fitted on part of the model's training dataset)",
+                          "vi": "Xac suat ac tinh da hieu chinh: {pct:.1f}% (hieu chinh {method} tren mot phan tap du lieu huan luyen cua mo hinh)"},
+    "mc_mode":           {"en": "Measurement uncertainty", "vi": "Do bat dinh do luong"},
+    "mc_help":           {"en": "Resample the 10 mean measurements from their standard errors (the SE inputs) and show how far the malignancy probability moves.",
+                          "vi": "Lay mau lai 10 so do trung binh tu sai so chuan cua chung (cac truong SE) va cho biet xac suat ac tinh thay doi bao nhieu."},
+    "mc_info":           {"en": "Measurement uncertainty: resampling the mean measurements from their standard errors ({n:,} draws) gives a malignancy probability of {lo:.1f}% to {hi:.1f}% (90% interval, SD {sd:.1f} points).",
+                          "vi": "Do bat dinh do luong: lay mau lai cac so do trung binh tu sai so chuan ({n:,} lan) cho xac suat ac tinh tu {lo:.1f}% den {hi:.1f}% (khoang 90%, do lech chuan {sd:.1f} diem)."},
+    "partial_mode":      {"en": "Allow incomplete input", "vi": "Cho phep nhap thieu"},
+    "partial_help":      {"en": "Estimate missing fields from the ones entered, using correlations in the training population.",
+                          "vi": "Uoc tinh cac truong con thieu tu cac truong da nhap, dua tren tuong quan trong quan the huan luyen."},
+    "partial_info":      {"en": "{n} missing fields were estimated from the entered ones. Malignancy probability range: {lo:.1f}% - {hi:.1f}% (95% band).",
+                          "vi": "{n} truong con thieu duoc uoc tinh tu cac truong da nhap. Khoang xac suat ac tinh: {lo:.1f}% - {hi:.1f}% (dai 95%)."},
     "radar_title":       {"en": "Feature Profile Comparison", "vi": "So Sanh Ho So Chi So"},
+    "radar_mode_range":  {"en": "Relative scale",      "vi": "Thang tuong doi"},
+    "radar_mode_pct":    {"en": "Population percentile", "vi": "Bach phan vi quan the"},
     "contribution_title":{"en": "Top Feature Contributions",  "vi": "Dong Gop Cua Cac Chi So Chinh"},
     "contribution_mal":  {"en": "Toward Malignant",    "vi": "Huong Ac Tinh"},
     "contribution_ben":  {"en": "Toward Benign",       "vi": "Huong Lanh Tinh"},
     "patient":           {"en": "Patient",             "vi": "Benh Nhan"},
+    "compare_title":     {"en": "Compare With Previous Cases", "vi": "So Sanh Voi Cac Ca Truoc"},
+    "compare_select":    {"en": "Cases to compare",    "vi": "Cac ca can so sanh"},
+    "compare_case":      {"en": "Case #{n} ({time}) - {pct:.1f}%", "vi": "Ca #{n} ({time}) - {pct:.1f}%"},
     "avg_benign":        {"en": "Avg Benign",          "vi": "TB Lanh Tinh"},
     "avg_malignant":     {"en": "Avg Malignant",       "vi": "TB Ac Tinh"},
     "model_perf_title":  {"en": "Model Performance",   "vi": "Hieu Suat Mo Hinh"},
     "model_perf_desc":   {"en": "Evaluated on the full Wisconsin dataset (569 samples)", "vi": "Danh gia tren toan bo du lieu Wisconsin (569 mau)"},
     "confusion_matrix":  {"en": "Confusion Matrix",    "vi": "Ma Tran Nham Lan"},
+    "drift_title":       {"en": "Input Drift Monitoring", "vi": "Giam Sat Troi Du Lieu"},
+    "drift_desc":        {"en": "Scored cases compared with the training population", "vi": "So sanh cac ca da du doan voi quan the huan luyen"},
+    "drift_cases":       {"en": "Cases monitored",     "vi": "So ca theo doi"},
+    "drift_score_psi":   {"en": "Score PSI",           "vi": "PSI diem du doan"},
+    "drift_status":      {"en": "Status",              "vi": "Trang thai"},
+    "drift_stable":      {"en": "Stable",              "vi": "On dinh"},
+    "drift_moderate":    {"en": "Moderate drift",      "vi": "Troi vua"},
+    "drift_major":       {"en": "Major drift",         "vi": "Troi lon"},
+    "drift_feature":     {"en": "Feature",             "vi": "Chi so"},
+    "drift_shift":       {"en": "Mean shift (SD)",     "vi": "Lech trung binh (SD)"},
+    "drift_empty":       {"en": "No cases scored yet.", "vi": "Chua co ca nao duoc du doan."},
     "roc_curve":         {"en": "ROC Curve",           "vi": "Duong Cong ROC"},
+    "reliability_title": {"en": "Calibration (Reliability Diagram)", "vi": "Hieu Chinh (Bieu Do Do Tin Cay)"},
+    "reliability_pred":  {"en": "Predicted malignancy", "vi": "Xac suat ac tinh du doan"},
+    "reliability_obs":   {"en": "Observed malignant fraction", "vi": "Ty le ac tinh thuc te"},
+    "reliability_ideal": {"en": "Perfectly calibrated", "vi": "Hieu chinh hoan hao"},
+    "calib_raw":         {"en": "Uncalibrated",        "vi": "Chua hieu chinh"},
+    "calib_platt":       {"en": "Platt",               "vi": "Platt"},
+    "calib_isotonic":    {"en": "Isotonic",            "vi": "Isotonic"},
+    "calib_caption":     {"en": "Brier score (lower is better) and reliability on one half of the reference data ({n} cases); calibrators are fitted on the other half. Both halves come from the dataset the model was trained on, so these figures are likely more optimistic than on new patients.",
+                          "vi": "Diem Brier (cang thap cang tot) va do tin cay tren mot nua du lieu tham chieu ({n} ca); bo hieu chinh duoc khop tren nua con lai. Ca hai nua deu lay tu tap du lieu da dung de huan luyen mo hinh, nen cac so lieu nay co the lac quan hon so voi benh nhan moi."},
     "pdf_download":      {"en": "Download PDF Report", "vi": "Tai Bao Cao PDF"},
     "pdf_generating":    {"en": "Generating report...", "vi": "Dang tao bao cao..."},
     "actual":            {"en": "Actual",              "vi": "Thuc Te"},
@@ -100,6 +191,9 @@ LANG = {
     "pdf_clinical_report":  {"en": "Clinical Prediction Report", "vi": "Bao Cao Du Doan Lam Sang"},
     "pdf_patient_id":       {"en": "Patient ID",          "vi": "Ma Benh Nhan"},
     "pdf_date":             {"en": "Report Date",          "vi": "Ngay Bao Cao"},
+    "pdf_value":            {"en": "Value",                "vi": "Gia Tri"},
+    "pdf_percentile":       {"en": "Percentile",           "vi": "Bach Phan Vi"},
+    "pdf_estimated":        {"en": "Estimated from the other measurements (not entered)", "vi": "Uoc tinh tu cac so do khac (khong duoc nhap)"},
     "pdf_method":           {"en": "Analysis Method",      "vi": "Phuong Phap Phan Tich"},
     "pdf_method_desc":      {"en": "Fine Needle Aspirate (FNA) biopsy - 30 morphometric features analyzed by logistic regression model",
                              "vi": "Sinh thiet choc hut kim nho (FNA) - 30 chi so hinh thai hoc duoc phan tich boi mo hinh hoi quy logistic"},
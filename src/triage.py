@@ -0,0 +1,268 @@
+"""
+Streaming triage queue: the highest-risk and most borderline cases first.
+
+`TriageQueue` keeps two bounded min-heaps of at most `K` cases each:
+  - malignant: the largest P(malignant)
+  - uncertain: P(malignant) closest to 0.5
+
+Scored chunks from any path (single predictions, batch uploads, a case-store
+scan) are pushed as (case ids, malignancy) arrays.  A vectorised prefilter
+drops every row that cannot beat the current heap minimum and keeps at most
+the chunk's own best `K`, so only a handful of rows per chunk reach the heap:
+O(N) array work plus O(K log K) heap work per chunk, never a full sort.
+Both heaps merge exactly, so queues from several processes combine.
+
+`Worklist` wraps a queue for one process and saves it after every update as
+`triage-<pid>.json` under `BCR_TRIAGE_DIR` (default `./triage`); readers
+merge every file in that directory.  Entries scored by an older model
+version are dropped on load.  `rebuild` replaces every queue with one built
+from the case store; it is safe to run while the servers are up.
+
+Usage:
+    python -m src.triage                  # print the combined worklist
+    python -m src.triage rebuild [--db cases.sqlite] [--chunk 50000]
+"""
+
+import argparse
+import heapq
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+from .case_store import CaseStore
+from .model import MODEL_VERSION
+from .ood import ood_score
+from .procs import pid_alive
+
+K = 50                  # cases kept per list
+SCHEMA = 1
+QUERY_PARAM = "case"    # ?case=<id> opens a stored case in the app
+GENERATION = "generation"   # marker file written by `rebuild`
+
+
+class TriageQueue:
+    """Bounded top-k heaps of malignant and borderline cases."""
+
+    def __init__(self, k: int = K):
+        self.k = k
+        self.seen = 0
+        # (key, case id, p_malignant, ood); heap[0] holds the weakest entry
+        self.heaps: dict[str, list[tuple]] = {"malignant": [], "uncertain": []}
+        self._ids: dict[str, set[int]] = {"malignant": set(), "uncertain": set()}
+
+    # ── Updates ──────────────────────────────────────────────────────────────
+
+    def push(self, ids, p_malignant, ood=None) -> None:
+        """Offer a scored chunk: case ids, P(malignant) and optional OOD flags.
+
+        Rows with a non-finite score are skipped."""
+        self.seen += self._offer(ids, p_malignant, ood)
+
+    def _offer(self, ids, p_malignant, ood=None) -> int:
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        p = np.atleast_1d(np.asarray(p_malignant, dtype=float))
+        ood = np.zeros(len(p), bool) if ood is None else np.atleast_1d(np.asarray(ood, bool))
+        # A NaN key at heap[0] would fail every comparison and freeze the heap
+        finite = np.isfinite(p)
+        if not finite.all():
+            ids, p, ood = ids[finite], p[finite], ood[finite]
+        for name, key in (("malignant", p), ("uncertain", -np.abs(p - 0.5))):
+            heap, members = self.heaps[name], self._ids[name]
+            rows = np.arange(len(p))
+            if len(heap) == self.k:
+                rows = rows[key > heap[0][0]]
+            if len(rows) > self.k:
+                rows = rows[np.argpartition(-key[rows], self.k - 1)[:self.k]]
+            for i in rows.tolist():
+                case = int(ids[i])
+                if case in members:
+                    continue
+                item = (float(key[i]), case, float(p[i]), bool(ood[i]))
+                if len(heap) < self.k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    members.discard(heapq.heapreplace(heap, item)[1])
+                else:
+                    continue
+                members.add(case)
+        return len(p)
+
+    def merge(self, other: "TriageQueue") -> "TriageQueue":
+        """Fold another queue into this one; returns self."""
+        for name in self.heaps:
+            entries = other.heaps[name]
+            if entries:
+                self._offer([e[1] for e in entries], [e[2] for e in entries],
+                            [e[3] for e in entries])
+        self.seen += other.seen
+        return self
+
+    # ── Read-outs ────────────────────────────────────────────────────────────
+
+    def ranked(self, name: str) -> list[dict]:
+        """Entries of list `name` ("malignant" or "uncertain"), best first."""
+        return [dict(id=case, p_malignant=p, ood=ood)
+                for _key, case, p, ood in sorted(self.heaps[name], reverse=True)]
+
+    # ── Persistence ──────────────────────────────────────────────────────────
+
+    def save(self, path) -> None:
+        path = Path(path)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(dict(
+            schema=SCHEMA, model_version=MODEL_VERSION, k=self.k, seen=self.seen,
+            **{name: [[e[1], e[2], e[3]] for e in heap] for name, heap in self.heaps.items()},
+        )))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, k: int = K) -> "TriageQueue":
+        """Queue saved at `path`; empty if it is unreadable or from another model."""
+        q = cls(k)
+        try:
+            data = json.loads(Path(path).read_text())
+        except (OSError, ValueError):
+            return q
+        if data.get("schema") != SCHEMA or data.get("model_version") != MODEL_VERSION:
+            return q
+        for name in q.heaps:
+            entries = data.get(name, [])
+            if entries:
+                q._offer(*zip(*entries))
+        q.seen = int(data.get("seen", 0))
+        return q
+
+
+def _generation(directory: Path) -> int:
+    """Time (ns) of the last rebuild; queue files saved before it are superseded."""
+    try:
+        return int((directory / GENERATION).read_text())
+    except (OSError, ValueError):
+        return 0
+
+
+def _current_files(directory: Path, generation: int) -> list[Path]:
+    """Queue files saved since the last rebuild."""
+    files = []
+    for path in directory.glob("triage-*.json"):
+        try:
+            if path.stat().st_mtime_ns >= generation:
+                files.append(path)
+        except FileNotFoundError:
+            pass
+    return files
+
+
+class Worklist:
+    """Thread-safe per-process queue, saved for cross-process merging.
+
+    On start, queues left by processes that have exited are folded into this
+    one and their files removed.  After `rebuild`, the in-memory queue is
+    dropped on the next access and files saved before the rebuild are
+    ignored, so live processes cannot write superseded entries back.
+    """
+
+    def __init__(self, directory, k: int = K):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / f"triage-{os.getpid()}.json"
+        self.k = k
+        self._lock = threading.Lock()
+        self._generation = _generation(self.directory)
+        self.queue = TriageQueue(k)
+        for path in _current_files(self.directory, self._generation):
+            pid = path.stem.removeprefix("triage-")
+            if path == self.path or (pid.isdigit() and not pid_alive(int(pid))):
+                self.queue.merge(TriageQueue.load(path, k))
+                if path != self.path:
+                    path.unlink(missing_ok=True)
+        self.queue.save(self.path)
+
+    def _sync(self) -> int:
+        """Drop the in-memory queue if a rebuild happened; returns the generation."""
+        generation = _generation(self.directory)
+        if generation != self._generation:
+            self.queue = TriageQueue(self.k)
+            self._generation = generation
+        return generation
+
+    def record(self, ids, p_malignant, ood=None) -> None:
+        """Offer scored cases and persist the queue."""
+        with self._lock:
+            self._sync()
+            self.queue.push(ids, p_malignant, ood)
+            self.queue.save(self.path)
+
+    def combined(self) -> TriageQueue:
+        """This process's queue merged with every other current queue file."""
+        with self._lock:
+            generation = self._sync()
+        total = TriageQueue(self.k)
+        for path in _current_files(self.directory, generation):
+            if path != self.path:
+                total.merge(TriageQueue.load(path, self.k))
+        with self._lock:
+            return total.merge(self.queue)
+
+
+@st.cache_resource
+def worklist() -> Worklist:
+    """Process-wide worklist shared by every Streamlit session."""
+    return Worklist(os.environ.get("BCR_TRIAGE_DIR", "triage"))
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+
+def rebuild(store, directory, chunk_size: int = 50_000, k: int = K) -> TriageQueue:
+    """Rebuild the worklist from every case in `store` scored by this model.
+
+    Safe while servers run: the generation marker makes them drop their
+    queues, and the older per-process files are removed.
+    """
+    q = TriageQueue(k)
+    for ids, X, p in store.iter_scores(chunk_size):
+        q.push(ids, p, ood_score(X)["is_ood"])
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    generation = time.time_ns()
+    tmp = directory / f"{GENERATION}.tmp"
+    tmp.write_text(str(generation))
+    os.replace(tmp, directory / GENERATION)
+    q.save(directory / "triage-rebuild.json")
+    for path in directory.glob("triage-*.json"):
+        if path.stat().st_mtime_ns < generation:
+            path.unlink(missing_ok=True)
+    return q
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Show or rebuild the triage worklist.")
+    ap.add_argument("command", nargs="?", choices=["show", "rebuild"], default="show")
+    ap.add_argument("--dir", default=os.environ.get("BCR_TRIAGE_DIR", "triage"))
+    ap.add_argument("--db", default=os.environ.get("BCR_CASE_DB", "cases.sqlite"))
+    ap.add_argument("--chunk", type=int, default=50_000)
+    ap.add_argument("-k", type=int, default=K)
+    args = ap.parse_args(argv)
+
+    if args.command == "rebuild":
+        t0 = time.perf_counter()
+        q = rebuild(CaseStore(args.db, pool_size=1), args.dir, args.chunk, args.k)
+        print(f"rebuilt from {q.seen:,} cases in {time.perf_counter() - t0:.2f}s")
+    else:
+        q = TriageQueue(args.k)
+        directory = Path(args.dir)
+        for path in _current_files(directory, _generation(directory)):
+            q.merge(TriageQueue.load(path, args.k))
+    for name in q.heaps:
+        print(f"\n{name} ({len(q.heaps[name])} of {q.seen:,} cases)")
+        for e in q.ranked(name):
+            print(f"  case {e['id']:>8}  {e['p_malignant'] * 100:6.2f}%{'  OOD' if e['ood'] else ''}")
+
+
+if __name__ == "__main__":
+    main()